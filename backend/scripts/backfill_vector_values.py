@@ -0,0 +1,65 @@
+"""Convert stored list and binary embeddings to Firestore vector values for native search."""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.config import settings
+from src.services.firebase_connection import FirebaseConnection
+from src.services.embedding_codec import decode_embedding, is_encoded, EmbeddingCodecError
+from src.services.firestore_vector_search import Vector
+import structlog
+
+logger = structlog.get_logger()
+
+# Firestore allows at most 500 writes per batch
+BATCH_SIZE = 500
+
+
+def backfill_vector_values():
+    """Rewrite every list or EMB1 blob embedding field as a vector value."""
+    if Vector is None:
+        logger.error("google-cloud-firestore has no vector support; upgrade the client")
+        return
+
+    firebase = FirebaseConnection()
+    collection = firebase.get_collection(settings.firebase_collection_name)
+    field = settings.firestore_vector_field
+
+    batch = firebase.db.batch()
+    pending = converted = skipped = 0
+
+    for doc in collection.select([field]).stream():
+        value = (doc.to_dict() or {}).get(field)
+        if is_encoded(value):
+            try:
+                value = decode_embedding(value)[0].tolist()
+            except EmbeddingCodecError as e:
+                logger.warning(f"Skipping {doc.id}: malformed embedding blob ({e})")
+                skipped += 1
+                continue
+        if not isinstance(value, list) or not value:
+            continue
+
+        batch.update(doc.reference, {field: Vector([float(v) for v in value])})
+        pending += 1
+
+        if pending == BATCH_SIZE:
+            batch.commit()
+            converted += pending
+            logger.info(f"Converted {converted} embeddings...")
+            batch = firebase.db.batch()
+            pending = 0
+
+    if pending:
+        batch.commit()
+        converted += pending
+
+    logger.info(
+        f"Backfill completed: {converted} embeddings converted to vector values, "
+        f"{skipped} malformed blobs skipped"
+    )
+
+
+if __name__ == "__main__":
+    backfill_vector_values()
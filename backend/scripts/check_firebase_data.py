@@ -21,6 +21,7 @@ async def check_firebase_collections():
         import firebase_admin
         from firebase_admin import credentials, firestore
         from src.config import settings
+        from src.services.document_processor import DocumentProcessor
         
         # Initialize Firebase
         if not firebase_admin._apps:
@@ -54,7 +55,7 @@ async def check_firebase_collections():
                 if 'text' in sample_doc:
                     print(f"  Text preview: {sample_doc['text'][:100]}...")
                 if 'embedding' in sample_doc:
-                    print(f"  Has embedding: Yes (length: {len(sample_doc['embedding'])})")
+                    print(f"  Has embedding: Yes (length: {len(DocumentProcessor.extract_embedding(sample_doc))})")
         
         print(f"\n📌 Current configured collection: {settings.firebase_collection_name}")
         
@@ -83,7 +84,7 @@ async def check_firebase_collections():
                 if 'text' in doc_data:
                     print(f"  Text: {doc_data['text'][:150]}...")
                 if 'embedding' in doc_data:
-                    print(f"  Embedding: {len(doc_data['embedding'])} dimensions")
+                    print(f"  Embedding: {len(DocumentProcessor.extract_embedding(doc_data))} dimensions")
                 else:
                     print(f"  ⚠️  No embedding field found!")
                 
@@ -105,6 +106,7 @@ async def test_direct_search():
     
     try:
         from src.services import FirebaseVectorStore, EmbeddingService
+        from src.services.document_processor import DocumentProcessor
         from src.config import settings
         import firebase_admin
         from firebase_admin import firestore
@@ -138,8 +140,8 @@ async def test_direct_search():
                 embedding_field = 'vector'
             
             if embedding_field and doc_data[embedding_field]:
-                # Calculate similarity
-                doc_embedding = doc_data[embedding_field]
+                # Calculate similarity (decodes binary-encoded embeddings)
+                doc_embedding = DocumentProcessor.extract_embedding(doc_data)
                 similarity = embedding_service.calculate_similarity(query_embedding, doc_embedding)
                 
                 # Get text content
@@ -0,0 +1,83 @@
+"""Bulk-load documents into the knowledge base.
+
+Input is a JSON Lines file with one ``{"text": ..., "metadata": {...},
+"document_id": ...}`` object per line (or a JSON array of them). Completed
+input positions are appended to a progress file after every batch, so an
+interrupted or partially failed run picks up where it left off:
+
+    python scripts/ingest_documents.py corpus.jsonl --batch-size 100 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.services.ingestion import IngestionPipeline
+import structlog
+
+logger = structlog.get_logger()
+
+
+def load_documents(path: Path) -> list:
+    """Read documents from a JSON array or a JSON Lines file."""
+    content = path.read_text(encoding="utf-8").strip()
+    if content.startswith("["):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+def load_progress(path: Path) -> set:
+    """Input positions stored by previous runs."""
+    if not path.exists():
+        return set()
+    done = set()
+    for line in path.read_text().splitlines():
+        if line.strip():
+            done.update(json.loads(line))
+    return done
+
+
+async def ingest_documents(args):
+    """Run the ingestion pipeline with an append-only progress log."""
+    documents = load_documents(args.input)
+    progress_path = args.progress or args.input.with_suffix(args.input.suffix + ".progress")
+
+    if args.restart and progress_path.exists():
+        progress_path.unlink()
+    done = load_progress(progress_path)
+
+    logger.info(f"Ingesting {len(documents) - len(done)} of {len(documents)} documents from {args.input}...")
+
+    async def record(result):
+        if result.succeeded:
+            with progress_path.open("a") as progress:
+                progress.write(json.dumps(result.positions) + "\n")
+            logger.info(f"Stored batch of {len(result.positions)} documents")
+
+    pipeline = IngestionPipeline(batch_size=args.batch_size, concurrency=args.concurrency)
+    report = await pipeline.ingest(documents, skip=done, on_batch=record)
+
+    for failure in report.failures:
+        logger.error(f"Failed document {failure['index']} ({failure['document_id']}): {failure['error']}")
+
+    logger.info(
+        f"Ingestion finished: {report.succeeded} stored, {len(report.failures)} failed, "
+        f"{len(done)} already done"
+    )
+    if report.failures:
+        logger.info("Run the same command again to retry the failed documents")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", type=Path, help="JSON Lines or JSON array of documents")
+    parser.add_argument("--batch-size", type=int, default=None, help="Texts per embedding call and write batch (max 500)")
+    parser.add_argument("--concurrency", type=int, default=None, help="Batches in flight at once")
+    parser.add_argument("--progress", type=Path, default=None, help="Progress file (default: <input>.progress)")
+    parser.add_argument("--restart", action="store_true", help="Ignore previous progress")
+    args = parser.parse_args()
+
+    asyncio.run(ingest_documents(args))
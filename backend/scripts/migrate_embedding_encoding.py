@@ -0,0 +1,103 @@
+"""Re-encode stored list embeddings as compact float32 blobs.
+
+Documents are visited in id order, one batched write per page. After each
+committed page the last id is saved to a checkpoint file, so an
+interrupted run resumes where it stopped:
+
+    python scripts/migrate_embedding_encoding.py --batch-size 200
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.config import settings
+from src.services.document_processor import DocumentProcessor
+from src.services.embedding_codec import encode_embedding, is_encoded
+from src.services.firebase_connection import FirebaseConnection
+import structlog
+
+logger = structlog.get_logger()
+
+# Firestore allows at most 500 writes per batch
+MAX_BATCH_SIZE = 500
+DEFAULT_CHECKPOINT = Path(__file__).parent / ".embedding_migration_checkpoint.json"
+
+
+def load_checkpoint(path: Path) -> dict:
+    """Read progress from a previous run, if any."""
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"last_id": None, "migrated": 0, "scanned": 0}
+
+
+def save_checkpoint(path: Path, checkpoint: dict) -> None:
+    """Persist progress atomically so a crash never leaves a torn file."""
+    staging = path.with_suffix(".tmp")
+    staging.write_text(json.dumps(checkpoint))
+    staging.replace(path)
+
+
+def migrate_embedding_encoding(batch_size: int, checkpoint_path: Path, restart: bool = False):
+    """Convert every list embedding in the collection to the binary encoding."""
+    if settings.firestore_vector_search:
+        logger.error("FIRESTORE_VECTOR_SEARCH is on; embeddings must stay vector values")
+        return
+
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    checkpoint = {"last_id": None, "migrated": 0, "scanned": 0} if restart else load_checkpoint(checkpoint_path)
+
+    firebase = FirebaseConnection()
+    collection = firebase.get_collection(settings.firebase_collection_name)
+
+    if checkpoint["last_id"]:
+        logger.info(f"Resuming after document {checkpoint['last_id']} ({checkpoint['migrated']} migrated so far)")
+
+    while True:
+        # Only the embedding fields are transferred
+        query = collection.select(DocumentProcessor.EMBEDDING_FIELDS).order_by("__name__").limit(batch_size)
+        if checkpoint["last_id"]:
+            query = query.start_after({"__name__": collection.document(checkpoint["last_id"])})
+
+        docs = list(query.stream())
+        if not docs:
+            break
+
+        batch = firebase.db.batch()
+        pending = 0
+        for doc in docs:
+            doc_data = doc.to_dict() or {}
+            updates = {
+                field: encode_embedding(value, settings.embedding_model)
+                for field, value in doc_data.items()
+                if isinstance(value, list) and value and not is_encoded(value)
+            }
+            if updates:
+                batch.update(doc.reference, updates)
+                pending += 1
+
+        if pending:
+            batch.commit()
+
+        checkpoint["last_id"] = docs[-1].id
+        checkpoint["migrated"] += pending
+        checkpoint["scanned"] += len(docs)
+        save_checkpoint(checkpoint_path, checkpoint)
+
+        logger.info(f"Scanned {checkpoint['scanned']} documents, migrated {checkpoint['migrated']}...")
+
+    logger.info(
+        f"Migration completed: {checkpoint['migrated']} of {checkpoint['scanned']} documents re-encoded"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=200, help="Documents per batched write (max 500)")
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT, help="Progress file for resuming")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over")
+    args = parser.parse_args()
+
+    migrate_embedding_encoding(args.batch_size, args.checkpoint, args.restart)
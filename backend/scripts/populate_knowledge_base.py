@@ -6,6 +6,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from src.services.firebase_vector_store import FirebaseVectorStore
+from src.services.ingestion import IngestionPipeline
 import structlog
 
 logger = structlog.get_logger()
@@ -61,15 +62,12 @@ async def populate_knowledge_base():
     
     logger.info(f"Adding {len(documents)} documents to knowledge base...")
     
-    for i, doc in enumerate(documents):
-        try:
-            doc_id = await store.add_document(
-                text=doc["text"],
-                metadata=doc["metadata"]
-            )
-            logger.info(f"Added document {i+1}/{len(documents)}: {doc_id}")
-        except Exception as e:
-            logger.error(f"Failed to add document {i+1}: {e}")
+    # One embedding call and one batched write; content-derived ids make re-runs idempotent
+    report = await IngestionPipeline(store).ingest(documents)
+    
+    for failure in report.failures:
+        logger.error(f"Failed to add document {failure['index'] + 1}: {failure['error']}")
+    logger.info(f"Added {report.succeeded}/{len(documents)} documents")
     
     logger.info("Knowledge base population completed!")
 
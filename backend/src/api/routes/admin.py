@@ -1,9 +1,11 @@
 """Admin endpoints for monitoring and cache management."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 import structlog
 from src.utils.cache import get_cache_stats, clear_cache, cleanup_expired
-from src.services.cached_vector_store import CachedVectorStore
+from src.services.cached_vector_store import get_cached_vector_store
+from src.services.embedding_cache import get_embedding_cache
+from src.core.restaurant_agent import get_restaurant_agent
 from src.middleware.auth import require_admin
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -60,7 +62,7 @@ async def cleanup_expired_cache():
 async def get_vector_cache_info():
     """Get vector store cache information."""
     try:
-        vector_store = CachedVectorStore()
+        vector_store = get_cached_vector_store()
         cache_info = vector_store.get_cache_info()
         logger.info("vector_cache_info_requested", cache_info=cache_info)
         return {
@@ -69,4 +71,53 @@ async def get_vector_cache_info():
         }
     except Exception as e:
         logger.error("vector_cache_info_error", error=str(e))
-        return {"error": str(e), "status": "error"}
\ No newline at end of file
+        return {"error": str(e), "status": "error"}
+
+
+@router.get("/embedding-cache/stats", dependencies=[Depends(require_admin)])
+async def get_embedding_cache_statistics():
+    """Get embedding cache hit/miss statistics for this worker."""
+    try:
+        stats = get_embedding_cache().stats()
+        logger.info("embedding_cache_stats_requested", stats=stats)
+        return {
+            "embedding_cache_stats": stats,
+            "status": "success"
+        }
+    except Exception as e:
+        logger.error("embedding_cache_stats_error", error=str(e))
+        return {"error": str(e), "status": "error"}
+
+
+@router.get("/menu-context/info", dependencies=[Depends(require_admin)])
+async def get_menu_context_info():
+    """Get the version and freshness of the cached menu prompt."""
+    try:
+        info = get_restaurant_agent().menu_context.get_info()
+        logger.info("menu_context_info_requested", info=info)
+        return {
+            "menu_context_info": info,
+            "status": "success"
+        }
+    except Exception as e:
+        logger.error("menu_context_info_error", error=str(e))
+        return {"error": str(e), "status": "error"}
+
+
+@router.get("/vector-cache/recall", dependencies=[Depends(require_admin)])
+async def get_vector_cache_recall(
+    top_k: int = Query(default=10, ge=1, le=100),
+    sample_size: int = Query(default=50, ge=1, le=200)
+):
+    """Measure recall of the quantized vector scan against exact search."""
+    try:
+        vector_store = get_cached_vector_store()
+        recall = await vector_store.measure_quantization_recall(top_k=top_k, sample_size=sample_size)
+        logger.info("vector_cache_recall_measured", recall=recall)
+        return {
+            "vector_cache_recall": recall,
+            "status": "success"
+        }
+    except Exception as e:
+        logger.error("vector_cache_recall_error", error=str(e))
+        return {"error": str(e), "status": "error"}
@@ -1,24 +1,57 @@
 """Document management endpoints."""
 
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
 
 import structlog
-from src.models import DocumentRequest, DocumentResponse
+from src.models import (
+    DocumentRequest,
+    DocumentResponse,
+    BulkDocumentRequest,
+    BulkDocumentResponse,
+    BulkDocumentFailure,
+    IngestionJobResponse
+)
 from src.services import FirebaseVectorStore
+from src.services.cached_vector_store import get_cached_vector_store
+from src.services.ingestion_jobs import get_ingestion_job_queue
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 logger = structlog.get_logger()
 
 
-@router.post("/", response_model=DocumentResponse)
-async def create_document(request: DocumentRequest) -> DocumentResponse:
+def _job_accepted(job) -> JSONResponse:
+    """202 response pointing at the job's status endpoint."""
+    body = IngestionJobResponse(**job).model_dump(mode="json")
+    return JSONResponse(
+        status_code=202,
+        content=body,
+        headers={"Location": f"{router.prefix}/jobs/{job['job_id']}"}
+    )
+
+
+@router.post(
+    "/",
+    response_model=DocumentResponse,
+    responses={202: {"model": IngestionJobResponse}}
+)
+async def create_document(
+    request: DocumentRequest,
+    job: bool = Query(default=False, description="Queue the write and return a job immediately")
+):
     """
     Add a new document to the knowledge base.
     
     This will create embeddings and store the document in Firebase.
+    With ``job=true`` the work runs on a background worker and the
+    response is 202 with a job to poll at ``/documents/jobs/{job_id}``.
     """
     try:
-        vector_store = FirebaseVectorStore()
+        if job:
+            return _job_accepted(await get_ingestion_job_queue().submit("create", request.model_dump()))
+        
+        vector_store = get_cached_vector_store()
         
         document_id = await vector_store.add_document(
             text=request.text,
@@ -47,6 +80,59 @@ async def create_document(request: DocumentRequest) -> DocumentResponse:
         )
 
 
+@router.post("/bulk", response_model=BulkDocumentResponse)
+async def create_documents(request: BulkDocumentRequest) -> BulkDocumentResponse:
+    """
+    Add many documents in batches.
+    
+    Texts are embedded in batches and stored with batched writes. Documents
+    without an ID get one derived from their content, so resubmitting the
+    failed entries (or the whole request) never creates duplicates.
+    """
+    try:
+        vector_store = get_cached_vector_store()
+        
+        report = await vector_store.add_documents(
+            [document.model_dump() for document in request.documents]
+        )
+        
+        logger.info(
+            "documents_bulk_created",
+            requested=len(request.documents),
+            succeeded=report.succeeded,
+            failed=len(report.failures)
+        )
+        
+        return BulkDocumentResponse(
+            document_ids=report.document_ids,
+            succeeded=report.succeeded,
+            failed=[BulkDocumentFailure(**failure) for failure in report.failures],
+            success=not report.failures,
+            message=f"Stored {report.succeeded} of {len(request.documents)} documents"
+        )
+        
+    except Exception as e:
+        logger.error("document_bulk_create_error", error=str(e))
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to create documents: {str(e)}"
+        )
+
+
+@router.get("/jobs/{job_id}", response_model=IngestionJobResponse)
+async def get_ingestion_job(job_id: str) -> IngestionJobResponse:
+    """Get the status of a queued document write."""
+    job = await get_ingestion_job_queue().get(job_id)
+    
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job {job_id} not found"
+        )
+    
+    return IngestionJobResponse(**job)
+
+
 @router.get("/{document_id}")
 async def get_document(document_id: str):
     """Get a specific document by ID."""
@@ -72,14 +158,26 @@ async def get_document(document_id: str):
         )
 
 
-@router.put("/{document_id}", response_model=DocumentResponse)
+@router.put(
+    "/{document_id}",
+    response_model=DocumentResponse,
+    responses={202: {"model": IngestionJobResponse}}
+)
 async def update_document(
     document_id: str,
-    request: DocumentRequest
-) -> DocumentResponse:
-    """Update an existing document."""
+    request: DocumentRequest,
+    job: bool = Query(default=False, description="Queue the write and return a job immediately")
+):
+    """Update an existing document, optionally as a background job."""
     try:
-        vector_store = FirebaseVectorStore()
+        if job:
+            return _job_accepted(await get_ingestion_job_queue().submit("update", {
+                "document_id": document_id,
+                "text": request.text,
+                "metadata": request.metadata
+            }))
+        
+        vector_store = get_cached_vector_store()
         
         success = await vector_store.update_document(
             document_id=document_id,
@@ -115,7 +213,7 @@ async def update_document(
 async def delete_document(document_id: str) -> DocumentResponse:
     """Delete a document from the knowledge base."""
     try:
-        vector_store = FirebaseVectorStore()
+        vector_store = get_cached_vector_store()
         
         success = await vector_store.delete_document(document_id)
         
@@ -146,24 +244,35 @@ async def delete_document(document_id: str) -> DocumentResponse:
 @router.get("/")
 async def list_documents(
     limit: int = Query(default=100, ge=1, le=1000),
-    offset: int = Query(default=0, ge=0)
+    offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page")
 ):
-    """List documents with pagination."""
+    """
+    List documents with pagination.
+    
+    Pass ``next_cursor`` from a response as ``cursor`` to fetch the next
+    page; it is null on the last page. ``offset`` still works but reads
+    every skipped document.
+    """
     try:
         vector_store = FirebaseVectorStore()
         
-        documents, total_count = await vector_store.list_documents(
+        documents, total_count, next_cursor = await vector_store.list_documents(
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
         
         return {
             "documents": documents,
             "total_count": total_count,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         }
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error("document_list_error", error=str(e))
         raise HTTPException(
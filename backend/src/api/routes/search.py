@@ -2,8 +2,15 @@
 
 from fastapi import APIRouter, HTTPException
 import structlog
-from src.models import SearchRequest, SearchResponse, SearchResult
+from src.models import (
+    SearchRequest,
+    SearchResponse,
+    SearchResult,
+    BatchSearchRequest,
+    BatchSearchResponse
+)
 from src.services import FirebaseVectorStore
+from src.services.cached_vector_store import get_cached_vector_store
 
 router = APIRouter(prefix="/search", tags=["search"])
 logger = structlog.get_logger()
@@ -22,7 +29,8 @@ async def search(request: SearchRequest) -> SearchResponse:
             "search_request_received",
             query=request.query[:100],
             top_k=request.top_k,
-            threshold=request.threshold
+            threshold=request.threshold,
+            filters=request.filters
         )
         
         vector_store = FirebaseVectorStore()
@@ -30,7 +38,8 @@ async def search(request: SearchRequest) -> SearchResponse:
         results = await vector_store.search(
             query=request.query,
             top_k=request.top_k,
-            threshold=request.threshold
+            threshold=request.threshold,
+            filters=request.filters
         )
         
         search_results = [
@@ -63,4 +72,63 @@ async def search(request: SearchRequest) -> SearchResponse:
         raise HTTPException(
             status_code=500,
             detail=f"Search error: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/batch", response_model=BatchSearchResponse)
+async def search_batch(request: BatchSearchRequest) -> BatchSearchResponse:
+    """
+    Search the knowledge base for many queries in one request.
+    
+    All queries are embedded with a single embedding call and scored
+    together against the cached index.
+    """
+    try:
+        logger.info(
+            "batch_search_request_received",
+            query_count=len(request.queries),
+            top_k=request.top_k,
+            threshold=request.threshold
+        )
+        
+        vector_store = get_cached_vector_store()
+        
+        batch_results = await vector_store.search_batch(
+            queries=request.queries,
+            top_k=request.top_k,
+            threshold=request.threshold,
+            filters=request.filters
+        )
+        
+        responses = []
+        for query, results in zip(request.queries, batch_results):
+            search_results = [
+                SearchResult(
+                    id=result["id"],
+                    text=result["text"],
+                    similarity=result["similarity"],
+                    metadata=result.get("metadata", {}),
+                    created_at=result.get("created_at")
+                )
+                for result in results
+            ]
+            responses.append(SearchResponse(
+                results=search_results,
+                query=query,
+                total_results=len(search_results)
+            ))
+        
+        logger.info(
+            "batch_search_completed",
+            query_count=len(responses),
+            results_count=sum(r.total_results for r in responses)
+        )
+        
+        return BatchSearchResponse(results=responses, total_queries=len(responses))
+        
+    except Exception as e:
+        logger.error("batch_search_endpoint_error", error=str(e))
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch search error: {str(e)}"
+        )
@@ -46,11 +46,75 @@ class Settings(BaseSettings):
     request_timeout: int = Field(default=60, env="REQUEST_TIMEOUT")
     
     # Vector Store Settings
+    embedding_provider: str = Field(default="openai", env="EMBEDDING_PROVIDER")  # openai | local
     embedding_model: str = Field(default="text-embedding-ada-002", env="EMBEDDING_MODEL")
     vector_dimension: int = Field(default=1536, env="VECTOR_DIMENSION")
+    embedding_storage_format: str = Field(default="binary", env="EMBEDDING_STORAGE_FORMAT")  # binary | list
     max_search_results: int = Field(default=5, env="MAX_SEARCH_RESULTS")
     similarity_threshold: float = Field(default=0.7, env="SIMILARITY_THRESHOLD")
     firebase_collection_name: str = Field(default="knowledge_base", env="FIREBASE_COLLECTION_NAME")
+    vector_cache_sync_mode: str = Field(default="ttl", env="VECTOR_CACHE_SYNC_MODE")  # ttl | listener
+    vector_cache_listener_timeout: int = Field(default=30, env="VECTOR_CACHE_LISTENER_TIMEOUT")
+    vector_cache_retry_seconds: int = Field(default=30, env="VECTOR_CACHE_RETRY_SECONDS")
+    vector_search_fallback: str = Field(default="none", env="VECTOR_SEARCH_FALLBACK")  # none | firebase
+    vector_snapshot_dir: str = Field(default="", env="VECTOR_SNAPSHOT_DIR")  # empty = per-worker heap index
+    vector_snapshot_wait_seconds: int = Field(default=2, env="VECTOR_SNAPSHOT_WAIT_SECONDS")  # recheck while another worker publishes
+    vector_quantization: str = Field(default="none", env="VECTOR_QUANTIZATION")  # none | float16 | int8; needs VECTOR_SNAPSHOT_DIR
+    vector_rerank_factor: int = Field(default=4, env="VECTOR_RERANK_FACTOR")
+    vector_cache_payloads: str = Field(default="lazy", env="VECTOR_CACHE_PAYLOADS")  # lazy | resident
+    payload_cache_size: int = Field(default=2000, env="PAYLOAD_CACHE_SIZE")
+    
+    # Native Firestore Vector Search Settings
+    firestore_vector_search: bool = Field(default=False, env="FIRESTORE_VECTOR_SEARCH")
+    firestore_vector_field: str = Field(default="embedding", env="FIRESTORE_VECTOR_FIELD")
+    firestore_vector_overfetch: int = Field(default=4, env="FIRESTORE_VECTOR_OVERFETCH")
+    
+    # Hybrid Retrieval Settings
+    retrieval_mode: str = Field(default="vector", env="RETRIEVAL_MODE")  # vector | hybrid
+    hybrid_candidate_depth: int = Field(default=20, env="HYBRID_CANDIDATE_DEPTH")
+    rrf_k: int = Field(default=60, env="RRF_K")
+    lexical_shortcut: bool = Field(default=False, env="LEXICAL_SHORTCUT")
+    lexical_shortcut_coverage: float = Field(default=1.0, env="LEXICAL_SHORTCUT_COVERAGE")
+    lexical_shortcut_margin: float = Field(default=1.5, env="LEXICAL_SHORTCUT_MARGIN")
+    
+    # Approximate Nearest Neighbour Settings
+    vector_search_backend: str = Field(default="exact", env="VECTOR_SEARCH_BACKEND")  # exact | ivf
+    ann_nlist: int = Field(default=0, env="ANN_NLIST")  # 0 = sqrt(corpus size)
+    ann_nprobe: int = Field(default=8, env="ANN_NPROBE")
+    ann_min_corpus_size: int = Field(default=5000, env="ANN_MIN_CORPUS_SIZE")
+    ann_retrain_changed_fraction: float = Field(default=0.2, env="ANN_RETRAIN_CHANGED_FRACTION")  # of trained rows
+    ann_retrain_drift: float = Field(default=0.05, env="ANN_RETRAIN_DRIFT")  # drop in mean centroid similarity
+    
+    # Ingestion Settings
+    ingest_batch_size: int = Field(default=100, env="INGEST_BATCH_SIZE")  # texts per embed call and write batch (max 500)
+    ingest_concurrency: int = Field(default=4, env="INGEST_CONCURRENCY")
+    ingest_max_retries: int = Field(default=2, env="INGEST_MAX_RETRIES")
+    ingest_job_dir: str = Field(default="data/ingest-jobs", env="INGEST_JOB_DIR")
+    ingest_job_workers: int = Field(default=2, env="INGEST_JOB_WORKERS")
+    ingest_job_max_attempts: int = Field(default=3, env="INGEST_JOB_MAX_ATTEMPTS")
+    ingest_job_retention_seconds: int = Field(default=86400, env="INGEST_JOB_RETENTION_SECONDS")
+    
+    # Embedding Cache and Batching Settings
+    embedding_cache_enabled: bool = Field(default=True, env="EMBEDDING_CACHE_ENABLED")
+    embedding_cache_max_bytes: int = Field(default=64 * 1024 * 1024, env="EMBEDDING_CACHE_MAX_BYTES")  # in-process LRU budget
+    embedding_cache_path: str = Field(default="data/embedding-cache.sqlite3", env="EMBEDDING_CACHE_PATH")  # empty disables the disk tier
+    embedding_batching_enabled: bool = Field(default=True, env="EMBEDDING_BATCHING_ENABLED")
+    embedding_batch_window_ms: float = Field(default=5, env="EMBEDDING_BATCH_WINDOW_MS")  # 0 sends at once, still coalescing duplicates
+    embedding_batch_max_size: int = Field(default=64, env="EMBEDDING_BATCH_MAX_SIZE")
+    
+    # Query Routing Settings
+    query_router_enabled: bool = Field(default=True, env="QUERY_ROUTER_ENABLED")  # false = LLM classifies every query
+    query_router_confidence: float = Field(default=0.8, env="QUERY_ROUTER_CONFIDENCE")  # below this the LLM decides
+    query_router_temperature: float = Field(default=0.05, env="QUERY_ROUTER_TEMPERATURE")  # centroid margin scale
+    
+    # Agent Graph Settings
+    agent_speculative_retrieval: bool = Field(default=False, env="AGENT_SPECULATIVE_RETRIEVAL")  # retrieve while analysis runs
+    
+    # Menu Context Settings
+    menu_context_ttl: int = Field(default=60, env="MENU_CONTEXT_TTL")  # seconds between version checks
+    menu_context_sync_mode: str = Field(default="ttl", env="MENU_CONTEXT_SYNC_MODE")  # ttl | listener
+    menu_version_field: str = Field(default="updatedAt", env="MENU_VERSION_FIELD")  # on restaurants/main; empty = re-read dishes every TTL
+    menu_context_full_refresh: int = Field(default=900, env="MENU_CONTEXT_FULL_REFRESH")  # seconds; re-read dishes even if the marker is unchanged
     
     # Environment flags
     @property
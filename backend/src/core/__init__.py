@@ -1,6 +1,6 @@
 """Core module for LangGraph components."""
 
-from .agent import create_agent_graph
+from .agent import create_agent_graph, get_agent_graph, set_agent_graph, reset_agent_graph
 from .state import AgentState
 
-__all__ = ["create_agent_graph", "AgentState"]
\ No newline at end of file
+__all__ = ["create_agent_graph", "get_agent_graph", "set_agent_graph", "reset_agent_graph", "AgentState"]
\ No newline at end of file
@@ -1,9 +1,9 @@
 """LangGraph agent implementation."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 import structlog
+from src.config import settings
 from .state import AgentState
 from .nodes import Nodes
 
@@ -13,11 +13,12 @@ logger = structlog.get_logger()
 def should_retrieve(state: AgentState) -> str:
     """Determine if retrieval is needed based on analysis."""
     if state.get("should_retrieve", False):
-        return "retrieve"
+        # Speculative mode may already have retrieved during analysis
+        return "generate" if state.get("retrieval_complete") else "retrieve"
     return "skip"
 
 
-def create_agent_graph():
+def create_agent_graph(nodes: Optional[Nodes] = None):
     """
     Create the LangGraph agent with all nodes and edges.
     
@@ -25,13 +26,22 @@ def create_agent_graph():
     1. Analyze query to determine if retrieval is needed
     2. Either retrieve context or skip retrieval
     3. Plan and generate the final response in one step (optimized)
+    
+    With ``agent_speculative_retrieval`` step 2 starts alongside step 1
+    and its result is kept or discarded once the analysis is known.
+    
+    The compiled graph holds no per-request state, so one instance can
+    serve concurrent invocations; use ``get_agent_graph`` for that.
     """
     
-    nodes = Nodes()
+    nodes = nodes or Nodes()
     
     workflow = StateGraph(AgentState)
 
-    workflow.add_node("analyze_query", nodes.analyze_query)
+    workflow.add_node(
+        "analyze_query",
+        nodes.analyze_query_speculative if settings.agent_speculative_retrieval else nodes.analyze_query
+    )
     workflow.add_node("retrieve_context", nodes.retrieve_context)
     workflow.add_node("skip_retrieval", nodes.skip_retrieval)
     workflow.add_node("plan_and_generate_response", nodes.plan_and_generate_response)
@@ -43,7 +53,8 @@ def create_agent_graph():
         should_retrieve,
         {
             "retrieve": "retrieve_context",
-            "skip": "skip_retrieval"
+            "skip": "skip_retrieval",
+            "generate": "plan_and_generate_response"
         }
     )
     
@@ -52,15 +63,41 @@ def create_agent_graph():
     
     workflow.add_edge("plan_and_generate_response", END)
     
-    memory = MemorySaver()
+    # No checkpointer: each request starts from its own initial state, and a
+    # shared in-memory saver would grow without bound across conversations
+    app = workflow.compile()
     
-    app = workflow.compile(checkpointer=memory)
-    
-    logger.info("agent_graph_created", nodes_count=4)
+    logger.info(
+        "agent_graph_created",
+        nodes_count=4,
+        speculative_retrieval=settings.agent_speculative_retrieval
+    )
     
     return app
 
 
+_agent_graph = None
+
+
+def get_agent_graph():
+    """Get the process-wide compiled agent graph, building it on first use."""
+    global _agent_graph
+    if _agent_graph is None:
+        _agent_graph = create_agent_graph()
+    return _agent_graph
+
+
+def set_agent_graph(graph) -> None:
+    """Replace the process-wide graph, e.g. with one built from test nodes."""
+    global _agent_graph
+    _agent_graph = graph
+
+
+def reset_agent_graph() -> None:
+    """Forget the process-wide graph so the next call rebuilds it."""
+    set_agent_graph(None)
+
+
 async def run_agent(
     query: str,
     conversation_id: str = "default",
@@ -80,12 +117,12 @@ async def run_agent(
         Agent response with final answer and metadata
     """
     try:
-       
-        app = create_agent_graph()
+        app = get_agent_graph()
         
         initial_state = {
             "messages": [],
             "query": query,
+            "query_embedding": None,
             "retrieved_context": [],
             "should_retrieve": False,
             "retrieval_complete": False,
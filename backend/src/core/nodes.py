@@ -1,12 +1,15 @@
 """LangGraph node implementations for agent workflow orchestration."""
 
-from typing import Dict, Any
+import asyncio
+import time
+from typing import Dict, Any, List, Optional, Callable, Awaitable
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, AIMessage
 import structlog
 
-from src.services.cached_vector_store import CachedVectorStore
+from src.services.cached_vector_store import CachedVectorStore, get_cached_vector_store
 from src.services.query_analyzer import QueryAnalyzer
+from src.services.query_router import QueryRouter
 from src.services.response_generator import ResponseGenerator
 from src.config import settings
 from .state import AgentState
@@ -18,19 +21,36 @@ logger = structlog.get_logger()
 class AnalysisNode(BaseNode):
     """Analyzes incoming queries to determine processing requirements."""
     
-    def __init__(self, llm: ChatOpenAI):
+    def __init__(self, llm: ChatOpenAI, vector_store: CachedVectorStore):
         self.analyzer = QueryAnalyzer(llm)
+        self.router = QueryRouter(self.analyzer, vector_store.embedding_service)
     
-    async def process(self, state: AgentState) -> Dict[str, Any]:
+    async def process(
+        self,
+        state: AgentState,
+        embed: Optional[Callable[[str], Awaitable[List[float]]]] = None
+    ) -> Dict[str, Any]:
         """Analyze query and determine if retrieval is needed."""
         try:
-            should_retrieve, reason = await self.analyzer.requires_retrieval(state["query"])
+            if not settings.query_router_enabled:
+                should_retrieve, reason = await self.analyzer.requires_retrieval(state["query"])
+                return {
+                    "should_retrieve": should_retrieve,
+                    "messages": self._add_system_message(
+                        state["messages"], 
+                        f"Query analysis: {reason}"
+                    )
+                }
+            
+            decision = await self.router.route(state["query"], embed)
             
+            # The router's query embedding is reused by retrieval
             return {
-                "should_retrieve": should_retrieve,
+                "should_retrieve": decision.should_retrieve,
+                "query_embedding": decision.query_embedding or state.get("query_embedding"),
                 "messages": self._add_system_message(
                     state["messages"], 
-                    f"Query analysis: {reason}"
+                    f"Query analysis: {decision.reason}"
                 )
             }
         except Exception as e:
@@ -43,13 +63,21 @@ class RetrievalNode(BaseNode):
     def __init__(self, vector_store: CachedVectorStore):
         self.vector_store = vector_store
     
-    async def process(self, state: AgentState) -> Dict[str, Any]:
+    async def process(
+        self,
+        state: AgentState,
+        embed: Optional[Callable[[str], Awaitable[List[float]]]] = None
+    ) -> Dict[str, Any]:
         """Retrieve relevant context from vector store."""
         try:
-            results = await self.vector_store.search(
+            # Reuse the router's embedding; otherwise the store embeds only
+            # when the lexical shortcut does not answer the query
+            results, query_embedding = await self.vector_store.search_with_embedding(
                 query=state["query"],
                 top_k=settings.max_search_results,
-                threshold=settings.similarity_threshold
+                threshold=settings.similarity_threshold,
+                query_embedding=state.get("query_embedding"),
+                embed=embed
             )
             
             logger.info(
@@ -59,6 +87,7 @@ class RetrievalNode(BaseNode):
             )
             
             return {
+                "query_embedding": query_embedding,
                 "retrieved_context": results,
                 "retrieval_complete": True,
                 "messages": self._add_system_message(
@@ -133,19 +162,102 @@ class Nodes:
             max_retries=2
         )
         
-        # Shared vector store with caching
-        self.vector_store = CachedVectorStore(cache_ttl=300)
+        # Process-wide vector store so the cached index outlives this graph
+        self.vector_store = get_cached_vector_store()
         
         # Initialize node instances
-        self._analysis_node = AnalysisNode(self.llm)
+        self._analysis_node = AnalysisNode(self.llm, self.vector_store)
         self._retrieval_node = RetrievalNode(self.vector_store)
         self._response_node = ResponseNode(self.llm)
         self._direct_node = DirectResponseNode()
+        
+        # Outcomes of speculative retrieval, cumulative for this process
+        self.speculation_stats = {
+            "speculated": 0,
+            "used": 0,
+            "discarded": 0,
+            "cancelled_in_flight": 0,
+            "wasted_ms": 0.0
+        }
     
     async def analyze_query(self, state: AgentState) -> Dict[str, Any]:
         """Delegate to AnalysisNode for backward compatibility."""
         return await self._analysis_node.process(state)
     
+    async def analyze_query_speculative(self, state: AgentState) -> Dict[str, Any]:
+        """
+        Run analysis and retrieval concurrently, keeping retrieval if needed.
+        
+        Critical-path latency becomes max(analysis, retrieval). When the
+        analysis says to skip, the retrieval is cancelled if still running
+        and its result discarded; the time it spent is counted as waste.
+        The router and the retrieval share one embedding request.
+        """
+        stats = self.speculation_stats
+        stats["speculated"] += 1
+        started = time.perf_counter()
+        finished = []
+        embeddings: Dict[str, asyncio.Task] = {}
+        
+        async def embed(query: str) -> List[float]:
+            if query not in embeddings:
+                embeddings[query] = asyncio.create_task(
+                    self.vector_store.embedding_service.embed_text(query)
+                )
+            # Shielded so a cancelled retrieval leaves it to the router
+            return await asyncio.shield(embeddings[query])
+        
+        async def retrieve() -> Dict[str, Any]:
+            try:
+                return await self._retrieval_node.process(state, embed)
+            finally:
+                finished.append(time.perf_counter())
+        
+        retrieval = asyncio.create_task(retrieve())
+        
+        try:
+            analysis = await self._analysis_node.process(state, embed)
+        except BaseException:
+            retrieval.cancel()
+            for task in embeddings.values():
+                task.cancel()
+            raise
+        
+        if analysis.get("should_retrieve"):
+            retrieved = await retrieval
+            stats["used"] += 1
+            messages = self._retrieval_node._add_system_message(
+                analysis["messages"],
+                f"Retrieved {len(retrieved.get('retrieved_context', []))} relevant documents from knowledge base"
+            )
+            return {
+                **retrieved,
+                **analysis,
+                "query_embedding": analysis.get("query_embedding") or retrieved.get("query_embedding"),
+                "messages": messages
+            }
+        
+        in_flight = not retrieval.done()
+        retrieval.cancel()
+        try:
+            await retrieval
+        except asyncio.CancelledError:
+            pass
+        for task in embeddings.values():
+            task.cancel()
+        
+        wasted_ms = ((finished[0] if finished else time.perf_counter()) - started) * 1000
+        stats["discarded"] += 1
+        stats["cancelled_in_flight"] += int(in_flight)
+        stats["wasted_ms"] += wasted_ms
+        logger.info(
+            "speculative_retrieval_discarded",
+            cancelled=in_flight,
+            wasted_ms=round(wasted_ms, 1),
+            **{f"total_{key}": round(value, 1) for key, value in stats.items()}
+        )
+        return analysis
+    
     async def retrieve_context(self, state: AgentState) -> Dict[str, Any]:
         """Delegate to RetrievalNode for backward compatibility."""
         return await self._retrieval_node.process(state)
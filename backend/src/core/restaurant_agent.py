@@ -7,7 +7,9 @@ from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import HumanMessage, AIMessage
 from src.services.menu_service import MenuService
+from src.services.menu_context import MenuContextCache, DEFAULT_LANGUAGE
 from src.services.order_service import OrderService
+from src.utils.quick_responses import detect_language
 from src.config import settings
 
 logger = structlog.get_logger()
@@ -47,7 +49,12 @@ Guidelines:
 
 
 class RestaurantAgent:
-    """AI agent specialized for restaurant interactions."""
+    """
+    AI agent specialized for restaurant interactions.
+    
+    Holds no per-request state, so one instance per worker serves every
+    chat request and reuses its LLM client's connection pool.
+    """
     
     def __init__(self, model_name: str = None):
         """Initialize the restaurant agent."""
@@ -58,6 +65,7 @@ class RestaurantAgent:
             max_tokens=500
         )
         self.menu_service = MenuService()
+        self.menu_context = MenuContextCache(self.menu_service)
         self.order_service = OrderService()
         
         # Create the prompt template
@@ -70,25 +78,17 @@ class RestaurantAgent:
         # Create the chain
         self.chain = self.prompt | self.llm
         
-    async def get_menu_context(self) -> str:
-        """Fetch and format current menu data."""
+    async def aclose(self) -> None:
+        """Stop the menu listener and close the LLM client's HTTP connections."""
+        self.menu_context.close()
+        client = getattr(self.llm, "root_async_client", None)
+        if client is not None:
+            await client.close()
+        
+    async def get_menu_context(self, language: str = DEFAULT_LANGUAGE) -> str:
+        """Get the preformatted menu text from the in-memory snapshot."""
         try:
-            menu_data = await self.menu_service.get_all_menu_items()
-            
-            # Format menu items for context
-            menu_text = []
-            for category, items in menu_data.items():
-                menu_text.append(f"\n{category}:")
-                for item in items:
-                    allergens = ", ".join(item.get("allergens", [])) or "None"
-                    menu_text.append(
-                        f"- {item['name']} ({item['priceSek']} SEK)"
-                        f"\n  Description: {item['description']}"
-                        f"\n  Allergens: {allergens}"
-                        f"\n  Tags: {', '.join(item.get('tags', []))}"
-                    )
-            
-            return "\n".join(menu_text)
+            return await self.menu_context.get_prompt(language)
         except Exception as e:
             logger.error("failed_to_get_menu_context", error=str(e))
             return "Menu data temporarily unavailable"
@@ -140,8 +140,8 @@ class RestaurantAgent:
             intent_data = self._detect_intent(query)
             logger.info("intent_detected", intents=intent_data["intents"])
             
-            # Get menu context
-            menu_context = await self.get_menu_context()
+            # Get menu context in the language of the query
+            menu_context = await self.get_menu_context(detect_language(query))
             
             # Format chat history
             chat_history = self._format_chat_history(conversation_history or [])
@@ -202,10 +202,36 @@ async def run_restaurant_agent(
     **kwargs
 ) -> Dict[str, Any]:
     """Run the restaurant agent with the given query."""
-    agent = RestaurantAgent()
+    agent = get_restaurant_agent()
     result = await agent.process_query(query, conversation_id, conversation_history)
     
     # Add user context
     result["user_id"] = user_id
     
-    return result
\ No newline at end of file
+    return result
+
+
+_restaurant_agent: Optional[RestaurantAgent] = None
+
+
+def get_restaurant_agent() -> RestaurantAgent:
+    """Get the worker's shared restaurant agent, creating it on first use."""
+    global _restaurant_agent
+    if _restaurant_agent is None:
+        _restaurant_agent = RestaurantAgent()
+        logger.info("restaurant_agent_created")
+    return _restaurant_agent
+
+
+def set_restaurant_agent(agent: Optional[RestaurantAgent]) -> None:
+    """Replace the shared agent, e.g. with a test double; None resets it."""
+    global _restaurant_agent
+    _restaurant_agent = agent
+
+
+async def close_restaurant_agent() -> None:
+    """Release the shared agent's connections at shutdown."""
+    global _restaurant_agent
+    if _restaurant_agent is not None:
+        await _restaurant_agent.aclose()
+        _restaurant_agent = None
\ No newline at end of file
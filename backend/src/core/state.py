@@ -14,6 +14,9 @@ class AgentState(TypedDict):
     # Current user query
     query: str
     
+    # Embedding of the query, computed at most once per request
+    query_embedding: Optional[List[float]]
+    
     # Retrieved context from Firebase
     retrieved_context: List[Dict[str, Any]]
     
@@ -10,6 +10,8 @@ from src.api.routes import chat, documents, search, health, admin
 from src.config import settings
 from src.utils import setup_logging
 from src.middleware import setup_security_middleware
+from src.services.ingestion_jobs import get_ingestion_job_queue
+from src.core.restaurant_agent import get_restaurant_agent, close_restaurant_agent
 
 setup_logging()
 logger = structlog.get_logger()
@@ -25,9 +27,26 @@ async def lifespan(app: FastAPI):
         host=settings.api_host,
         port=settings.api_port
     )
+    
+    # Background workers for ?job=true document writes; without them the
+    # API still serves and job submissions are refused
+    job_queue = get_ingestion_job_queue()
+    try:
+        await job_queue.start()
+    except Exception as e:
+        logger.error("ingestion_job_queue_start_failed", error=str(e))
+    
+    # Build the chat agent and its clients once, before the first request
+    try:
+        get_restaurant_agent()
+    except Exception as e:
+        logger.error("restaurant_agent_init_failed", error=str(e))
+    
     yield
     
     logger.info("application_shutting_down")
+    await job_queue.stop()
+    await close_restaurant_agent()
 
 app = FastAPI(
     title="Peterbot LangGraph API",
@@ -1,15 +1,37 @@
 """Data models for API requests and responses."""
 
-from .requests import ChatRequest, DocumentRequest, SearchRequest
-from .responses import ChatResponse, DocumentResponse, SearchResponse, SearchResult, ErrorResponse
+from .requests import (
+    ChatRequest,
+    DocumentRequest,
+    BulkDocumentRequest,
+    SearchRequest,
+    BatchSearchRequest
+)
+from .responses import (
+    ChatResponse,
+    DocumentResponse,
+    BulkDocumentResponse,
+    BulkDocumentFailure,
+    IngestionJobResponse,
+    SearchResponse,
+    SearchResult,
+    BatchSearchResponse,
+    ErrorResponse
+)
 
 __all__ = [
     "ChatRequest",
     "DocumentRequest", 
+    "BulkDocumentRequest",
     "SearchRequest",
+    "BatchSearchRequest",
     "ChatResponse",
     "DocumentResponse",
+    "BulkDocumentResponse",
+    "BulkDocumentFailure",
+    "IngestionJobResponse",
     "SearchResponse",
     "SearchResult",
+    "BatchSearchResponse",
     "ErrorResponse"
 ]
\ No newline at end of file
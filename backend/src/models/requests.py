@@ -1,7 +1,11 @@
 """Request models for API endpoints."""
 
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field, StrictBool, StrictFloat, StrictInt, StrictStr
+from typing import Optional, Dict, Any, List, Union
+
+# Metadata filters compare hashable values: a scalar or a list of scalars
+FilterScalar = Union[StrictStr, StrictInt, StrictFloat, StrictBool, None]
+FilterValue = Union[FilterScalar, List[FilterScalar]]
 
 
 class ChatRequest(BaseModel):
@@ -56,6 +60,27 @@ class DocumentRequest(BaseModel):
         }
 
 
+class BulkDocumentRequest(BaseModel):
+    """Request model for bulk document ingestion."""
+    
+    documents: List[DocumentRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Documents to embed and store; split larger sets across requests"
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "documents": [
+                    {"text": "Peter has 5 years of experience with Python", "metadata": {"category": "experience"}},
+                    {"text": "Peter builds frontends with React and TypeScript", "metadata": {"category": "skills"}}
+                ]
+            }
+        }
+
+
 class SearchRequest(BaseModel):
     """Request model for search endpoint."""
     
@@ -72,12 +97,53 @@ class SearchRequest(BaseModel):
         le=1.0,
         description="Minimum similarity threshold"
     )
+    filters: Optional[Dict[str, FilterValue]] = Field(
+        default=None,
+        description="Metadata equality filters; a list value matches any element"
+    )
     
     class Config:
         json_schema_extra = {
             "example": {
                 "query": "Python experience",
                 "top_k": 5,
+                "threshold": 0.7,
+                "filters": {"category": "experience"}
+            }
+        }
+
+
+class BatchSearchRequest(BaseModel):
+    """Request model for batched search endpoint."""
+    
+    queries: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="Search queries"
+    )
+    top_k: Optional[int] = Field(
+        default=5,
+        ge=1,
+        le=20,
+        description="Number of results to return per query"
+    )
+    threshold: Optional[float] = Field(
+        default=0.7,
+        ge=0.0,
+        le=1.0,
+        description="Minimum similarity threshold"
+    )
+    filters: Optional[Dict[str, FilterValue]] = Field(
+        default=None,
+        description="Metadata equality filters; a list value matches any element"
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "queries": ["Python experience", "Contact information"],
+                "top_k": 5,
                 "threshold": 0.7
             }
-        }
\ No newline at end of file
+        }
@@ -69,6 +69,57 @@ class SearchResult(BaseModel):
     )
 
 
+class BulkDocumentFailure(BaseModel):
+    """A document that could not be ingested."""
+    
+    index: int = Field(..., description="Position in the request's documents list")
+    document_id: Optional[str] = Field(default=None, description="Document ID it would have had")
+    error: str = Field(..., description="Failure reason")
+
+
+class BulkDocumentResponse(BaseModel):
+    """Response model for bulk document ingestion."""
+    
+    document_ids: List[Optional[str]] = Field(
+        default_factory=list,
+        description="Document ID per request position"
+    )
+    succeeded: int = Field(..., description="Documents stored")
+    failed: List[BulkDocumentFailure] = Field(
+        default_factory=list,
+        description="Documents to resubmit; their IDs make a retry idempotent"
+    )
+    success: bool = Field(..., description="True if every document was stored")
+    message: str = Field(..., description="Status message")
+
+
+class IngestionJobResponse(BaseModel):
+    """Status of a background document ingestion job."""
+    
+    job_id: str = Field(..., description="Job identifier")
+    kind: str = Field(..., description="create or update")
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    document_id: Optional[str] = Field(default=None, description="Document the job writes")
+    attempts: int = Field(default=0, description="Processing attempts so far")
+    error: Optional[str] = Field(default=None, description="Last failure reason")
+    created_at: datetime = Field(..., description="Submission time")
+    updated_at: datetime = Field(..., description="Last status change")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "job_id": "3f2b8c1e9a4d4e0f8b7a6c5d4e3f2a1b",
+                "kind": "create",
+                "status": "queued",
+                "document_id": "a1b2c3d4e5f6a7b8c9d0",
+                "attempts": 0,
+                "error": None,
+                "created_at": "2024-01-20T10:30:00Z",
+                "updated_at": "2024-01-20T10:30:00Z"
+            }
+        }
+
+
 class SearchResponse(BaseModel):
     """Response model for search endpoint."""
     
@@ -96,6 +147,16 @@ class SearchResponse(BaseModel):
         }
 
 
+class BatchSearchResponse(BaseModel):
+    """Response model for batched search endpoint."""
+    
+    results: List[SearchResponse] = Field(
+        default_factory=list,
+        description="Search results per query, in request order"
+    )
+    total_queries: int = Field(..., description="Number of queries searched")
+
+
 class ErrorResponse(BaseModel):
     """Error response model."""
     
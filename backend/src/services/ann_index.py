@@ -0,0 +1,203 @@
+"""Approximate nearest-neighbour structures for the vector index."""
+
+from typing import Any, Dict, List, Optional, Set
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+
+class IVFIndex:
+    """
+    Inverted-file index over normalized embeddings.
+
+    Rows are bucketed by their nearest k-means centroid; a query scores
+    only the rows in its ``nprobe`` closest buckets.
+
+    Upserted and removed rows are assigned to (or dropped from) their
+    bucket incrementally against the trained centroids, so index writes do
+    not force a rebuild. :meth:`retrain_reason` tells when the centroids
+    no longer describe the data: too many rows changed since training, or
+    new rows sit markedly further from their centroid than trained ones.
+    """
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        labels: np.ndarray,
+        version: int,
+        trained_fit: float = 0.0
+    ):
+        self.centroids = centroids
+        self.labels: List[int] = labels.tolist()
+        self.version = version
+        self.buckets: List[Set[int]] = [set() for _ in range(centroids.shape[0])]
+        for row, label in enumerate(self.labels):
+            self.buckets[label].add(row)
+        self._bucket_rows: List[Optional[np.ndarray]] = [None] * centroids.shape[0]
+
+        self.trained_size = len(self.labels)
+        # Mean similarity of trained rows to their centroid
+        self.trained_fit = trained_fit
+        self.updates = 0
+        self._assigned_fit = 0.0
+        self._assigned = 0
+
+    @property
+    def nlist(self) -> int:
+        return self.centroids.shape[0]
+
+    @staticmethod
+    def train_centroids(
+        matrix: np.ndarray,
+        nlist: int,
+        iterations: int = 8,
+        sample_size: Optional[int] = None,
+        seed: int = 0
+    ) -> np.ndarray:
+        """
+        Run spherical k-means on a sample of rows.
+
+        Args:
+            matrix: Normalized embeddings, one per row
+            nlist: Number of centroids
+            iterations: Lloyd iterations
+            sample_size: Rows used for training (default 64 per centroid)
+            seed: Random seed for reproducible builds
+
+        Returns:
+            Normalized centroid matrix of shape (nlist, dimension)
+        """
+        rng = np.random.default_rng(seed)
+        size = matrix.shape[0]
+        sample_size = min(size, sample_size or nlist * 64)
+
+        sample = matrix[rng.choice(size, sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            counts = np.bincount(labels, minlength=nlist)
+
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+
+            # Re-seed empty clusters from random sample rows
+            empty = np.flatnonzero(counts == 0)
+            if empty.size:
+                sums[empty] = sample[rng.choice(sample_size, empty.size, replace=False)]
+
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            np.divide(sums, norms, out=sums, where=norms > 0)
+            centroids = sums
+
+        return centroids.astype(np.float32, copy=False)
+
+    @classmethod
+    def build(
+        cls,
+        matrix: np.ndarray,
+        nlist: int,
+        version: int,
+        iterations: int = 8,
+        seed: int = 0
+    ) -> "IVFIndex":
+        """Train centroids and bucket every row of ``matrix``."""
+        nlist = max(1, min(nlist, matrix.shape[0]))
+        centroids = cls.train_centroids(matrix, nlist, iterations, seed=seed)
+
+        scores = matrix @ centroids.T
+        labels = np.argmax(scores, axis=1)
+        trained_fit = float(scores[np.arange(len(labels)), labels].mean()) if len(labels) else 0.0
+
+        return cls(centroids, labels, version, trained_fit)
+
+    def assign(self, row: int, vector: np.ndarray, version: int) -> None:
+        """Put an inserted or overwritten row in its nearest bucket."""
+        scores = self.centroids @ vector
+        label = int(np.argmax(scores))
+
+        if row < len(self.labels):
+            self._move(row, self.labels[row], None)
+            self.labels[row] = label
+        else:
+            self.labels.append(label)
+        self._move(row, None, label)
+
+        self.updates += 1
+        self._assigned_fit += float(scores[label])
+        self._assigned += 1
+        self.version = version
+
+    def remove(self, row: int, last: int, version: int) -> None:
+        """Mirror the vector index's swap-remove: ``last`` moves into ``row``."""
+        self._move(row, self.labels[row], None)
+        if row != last:
+            moved = self.labels[last]
+            self._move(last, moved, None)
+            self._move(row, None, moved)
+            self.labels[row] = moved
+        self.labels.pop()
+
+        self.updates += 1
+        self.version = version
+
+    def _move(self, row: int, source: Optional[int], target: Optional[int]) -> None:
+        if source is not None:
+            self.buckets[source].discard(row)
+            self._bucket_rows[source] = None
+        if target is not None:
+            self.buckets[target].add(row)
+            self._bucket_rows[target] = None
+
+    def _rows_in(self, bucket: int) -> np.ndarray:
+        rows = self._bucket_rows[bucket]
+        if rows is None:
+            rows = self._bucket_rows[bucket] = np.fromiter(
+                self.buckets[bucket], dtype=np.int64, count=len(self.buckets[bucket])
+            )
+        return rows
+
+    @property
+    def drift(self) -> float:
+        """How much worse incrementally assigned rows fit than trained ones."""
+        if not self._assigned:
+            return 0.0
+        return self.trained_fit - self._assigned_fit / self._assigned
+
+    def retrain_reason(self, max_changed_fraction: float, max_drift: float) -> Optional[str]:
+        """Why the centroids should be retrained, or None while they still fit."""
+        if self.updates > max_changed_fraction * max(self.trained_size, 1):
+            return "changed_rows"
+        if self._assigned and self.drift > max_drift:
+            return "centroid_drift"
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Describe the structure for monitoring."""
+        return {
+            "nlist": self.nlist,
+            "rows": len(self.labels),
+            "trained_rows": self.trained_size,
+            "updates_since_training": self.updates,
+            "drift": round(self.drift, 4),
+            "version": self.version
+        }
+
+    def candidate_rows(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """
+        Collect rows from the buckets closest to the query.
+
+        Returns:
+            Sorted row numbers to score exactly
+        """
+        scores = self.centroids @ query
+
+        if nprobe < self.nlist:
+            probe = np.argpartition(-scores, nprobe - 1)[:nprobe]
+        else:
+            probe = np.arange(self.nlist)
+
+        rows = np.concatenate([self._rows_in(bucket) for bucket in probe])
+        rows.sort()
+        return rows
@@ -2,10 +2,19 @@
 
 import asyncio
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
+import numpy as np
 import structlog
+from src.config import settings
 from src.services.firebase_vector_store import FirebaseVectorStore
 from src.services.embeddings import EmbeddingService
+from src.services.vector_index import VectorIndex
+from src.services.vector_search_engine import VectorSearchEngine
+from src.services.vector_snapshot import VectorSnapshotStore
+from src.services.lexical_index import reciprocal_rank_fusion
+from src.services.document_processor import DocumentProcessor
+from src.services.payload_cache import PayloadCache
+from src.services.ingestion import IngestionPipeline, IngestionReport
 
 logger = structlog.get_logger()
 
@@ -13,121 +22,419 @@ logger = structlog.get_logger()
 class CachedVectorStore:
     """Vector store with local caching for improved search performance."""
     
-    def __init__(self, cache_ttl: int = 300):  # 5 minutes cache
+    def __init__(self, cache_ttl: int = 300, sync_mode: Optional[str] = None):  # 5 minutes cache
         self.firebase_store = FirebaseVectorStore()
         self.embedding_service = EmbeddingService()
+        self.search_engine = VectorSearchEngine(self.embedding_service)
         self.cache_ttl = cache_ttl
-        self.documents_cache = None
+        self.sync_mode = sync_mode or settings.vector_cache_sync_mode
+        self.index: Optional[VectorIndex] = None
         self.cache_timestamp = 0
         self.cache_lock = asyncio.Lock()
+        self._watch = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._retry_after = 0.0
+        # Ids written during a background rebuild; None when no rebuild runs
+        self._dirty_ids: Optional[set] = None
+        
+        # Workers share one memory-mapped copy of the index when configured
+        self.snapshots = (
+            VectorSnapshotStore(settings.vector_snapshot_dir)
+            if settings.vector_snapshot_dir and self.sync_mode == "ttl"
+            else None
+        )
+        self.snapshot_version: Optional[str] = None
+        
+        # Quantized codes only save memory when the float32 rows they are
+        # re-ranked against live in the shared snapshot; on the heap they
+        # would be held in addition to the full matrix
+        self.quantization = settings.vector_quantization
+        if self.quantization != "none" and self.snapshots is None:
+            logger.warning(
+                "vector_quantization_disabled",
+                quantization=self.quantization,
+                reason="requires VECTOR_SNAPSHOT_DIR and ttl sync mode"
+            )
+            self.quantization = "none"
+        
+        # Lazy mode keeps only ids and vectors resident; result text and
+        # metadata come from a bounded LRU backed by batched reads
+        self.lazy_payloads = settings.vector_cache_payloads == "lazy"
+        self.payloads = PayloadCache(settings.payload_cache_size)
+    
+    def _get_collection(self):
+        """Get the knowledge base collection reference."""
+        return self.firebase_store.firebase.get_collection(self.firebase_store.collection_name)
+    
+    def _to_cached_document(
+        self,
+        doc_id: str,
+        doc_data: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Convert stored document data to an index entry, or None without embedding."""
+        embedding = self.firebase_store.processor.extract_embedding(doc_data)
+        
+        if embedding is None:
+            return None
+        
+        return {"id": doc_id, "embedding": embedding, **self._to_payload(doc_data)}
+    
+    def _to_payload(self, doc_data: Dict[str, Any]) -> Dict[str, Any]:
+        """The parts of a document a search result returns besides its score."""
+        return {
+            "text": self.firebase_store.processor.extract_text_content(doc_data),
+            "metadata": doc_data.get("metadata", {}),
+            "created_at": doc_data.get("created_at"),
+            "updated_at": doc_data.get("updated_at")
+        }
+        
+    def _configure_index(self, index: VectorIndex) -> VectorIndex:
+        """Apply quantization and, in lazy mode, drop payloads from a new index."""
+        index.set_quantization(self.quantization, settings.vector_rerank_factor)
+        if self.lazy_payloads:
+            index.drop_payloads(keep_lexical=settings.retrieval_mode == "hybrid")
+        return index
+    
+    def _load_from_firestore(self) -> VectorIndex:
+        """Stream the whole collection into a new index."""
+        collection = self._get_collection()
+        processor = self.firebase_store.processor
+        
+        # A lazy, unshared index needs no text unless BM25 is built from it
+        if self.lazy_payloads and self.snapshots is None and settings.retrieval_mode != "hybrid":
+            docs = collection.select(processor.EMBEDDING_FIELDS + ["metadata"]).stream()
+        else:
+            docs = collection.stream()
+        
+        cached_docs = []
+        for doc in docs:
+            cached_doc = self._to_cached_document(doc.id, doc.to_dict())
+            if cached_doc:
+                cached_docs.append(cached_doc)
+        
+        return VectorIndex.from_documents(cached_docs)
+    
+    def _build_index(self) -> Optional[Tuple[VectorIndex, Optional[str], float]]:
+        """
+        Produce a replacement index; blocking, so it runs in a worker thread.
+        
+        A snapshot another worker published within the TTL is adopted as-is.
+        Otherwise the collection is streamed, and published when this
+        process wins the snapshot lock.
+        
+        Returns:
+            (index, snapshot version, cache timestamp), or None to keep
+            serving the current index while another worker publishes
+        """
+        if self.snapshots is not None:
+            version = self.snapshots.current_version()
+            if version is not None:
+                manifest = self.snapshots.read_manifest(version)
+                if time.time() - manifest["published_at"] <= self.cache_ttl:
+                    if version == self.snapshot_version:
+                        return self.index, version, manifest["published_at"]
+                    return self.snapshots.load(version)[1], version, manifest["published_at"]
+        
+        logger.info("refreshing_document_cache")
+        
+        if self.snapshots is None:
+            return self._load_from_firestore(), None, time.time()
+        
+        with self.snapshots.publisher_lock() as is_publisher:
+            if not is_publisher and self.index is not None:
+                return None
+            
+            index = self._load_from_firestore()
+            if not is_publisher:
+                return index, self.snapshot_version, time.time()
+            
+            try:
+                version = self.snapshots.publish(index)
+                return self.snapshots.load(version)[1], version, time.time()
+            except (OSError, ValueError) as e:
+                # E.g. a full /dev/shm: serve this worker's heap copy instead
+                logger.error("vector_snapshot_publish_failed", error=str(e))
+                return index, self.snapshot_version, time.time()
         
     async def _refresh_cache(self) -> None:
-        """Refresh the document cache from Firebase."""
+        """Rebuild the index off the event loop and swap it in atomically."""
         try:
-            logger.info("refreshing_document_cache")
+            self._dirty_ids = set()
+            rebuilt = await asyncio.to_thread(self._build_index)
+            if rebuilt is None:
+                # Another worker is publishing; look for its snapshot shortly
+                self._dirty_ids = None
+                self._retry_after = time.time() + settings.vector_snapshot_wait_seconds
+                return
             
-            # Access the collection through the firebase connection
-            collection = self.firebase_store.firebase.get_collection(self.firebase_store.collection_name)
-            docs = collection.stream()
+            index, version, timestamp = rebuilt
+            if index is not self.index:
+                self.index = await asyncio.to_thread(self._configure_index, index)
+                self.payloads.clear()
+            self.snapshot_version = version
+            self.cache_timestamp = timestamp
             
-            cached_docs = []
-            for doc in docs:
-                doc_data = doc.to_dict()
-                
-                # Use the document processor for consistency
-                embedding = self.firebase_store.processor.extract_embedding(doc_data)
-                
-                if embedding:
-                    text_content = self.firebase_store.processor.extract_text_content(doc_data)
-                    
-                    cached_docs.append({
-                        "id": doc.id,
-                        "text": text_content,
-                        "embedding": embedding,
-                        "metadata": doc_data.get("metadata", {}),
-                        "created_at": doc_data.get("created_at"),
-                        "updated_at": doc_data.get("updated_at")
-                    })
-            
-            self.documents_cache = cached_docs
-            self.cache_timestamp = time.time()
+            # Writes made while the rebuild streamed may predate its read
+            dirty_ids, self._dirty_ids = self._dirty_ids, None
+            for document_id in dirty_ids:
+                await self._sync_document(document_id)
             
             logger.info(
                 "document_cache_refreshed", 
-                document_count=len(cached_docs),
+                document_count=len(self.index),
+                matrix_bytes=self.index.memory_bytes(),
+                memory_mapped=self.index.is_memory_mapped,
+                resynced_documents=len(dirty_ids),
                 cache_timestamp=self.cache_timestamp
             )
             
         except Exception as e:
             logger.error("cache_refresh_failed", error=str(e))
+            self._dirty_ids = None
+            self._retry_after = time.time() + settings.vector_cache_retry_seconds
             # Ensure cache is initialized even on failure
-            if self.documents_cache is None:
-                self.documents_cache = []
+            if self.index is None:
+                self.index = self._configure_index(VectorIndex())
+    
+    async def _start_listener(self) -> None:
+        """
+        Subscribe to collection changes and build the index from them.
+        
+        Firestore delivers the full collection once as ADDED changes, then
+        only the documents that were added, modified or removed. Callbacks
+        arrive on a background thread, so changes are handed to the event
+        loop and applied there, between searches.
+        """
+        loop = asyncio.get_running_loop()
+        initial_sync = asyncio.Event()
+        index = self._configure_index(VectorIndex())
+        
+        def on_snapshot(col_snapshot, changes, read_time):
+            batch = [
+                (change.type.name, change.document.id, change.document.to_dict())
+                for change in changes
+            ]
+            loop.call_soon_threadsafe(self._apply_changes, index, batch, initial_sync)
+        
+        try:
+            logger.info("starting_vector_cache_listener")
+            self._watch = self._get_collection().on_snapshot(on_snapshot)
+            await asyncio.wait_for(
+                initial_sync.wait(),
+                timeout=settings.vector_cache_listener_timeout
+            )
+            self.index = index
+            
+            logger.info(
+                "vector_cache_listener_started",
+                document_count=len(index),
+                matrix_bytes=index.memory_bytes()
+            )
+            
+        except Exception as e:
+            logger.error("vector_cache_listener_failed", error=str(e))
+            self.close()
+            self.sync_mode = "ttl"
+            await self._refresh_cache()
+    
+    def _apply_changes(
+        self,
+        index: VectorIndex,
+        changes: List[Tuple[str, str, Optional[Dict[str, Any]]]],
+        initial_sync: asyncio.Event
+    ) -> None:
+        """Apply a batch of (change type, document id, data) to the index."""
+        for change_type, doc_id, doc_data in changes:
+            self.payloads.invalidate(doc_id)
+            cached_doc = None
+            if change_type != "REMOVED" and doc_data:
+                cached_doc = self._to_cached_document(doc_id, doc_data)
+            
+            if cached_doc:
+                index.upsert(cached_doc)
+            else:
+                index.remove(doc_id)
+        
+        self.cache_timestamp = time.time()
+        
+        if initial_sync.is_set():
+            logger.info(
+                "vector_cache_changes_applied",
+                change_count=len(changes),
+                document_count=len(index)
+            )
+        initial_sync.set()
+    
+    async def _sync_document(self, document_id: str) -> None:
+        """Apply a single document's current state to the resident index."""
+        if self._dirty_ids is not None:
+            self._dirty_ids.add(document_id)
+        if self.index is None:
+            return
+        
+        try:
+            doc = self._get_collection().document(document_id).get()
+            cached_doc = self._to_cached_document(doc.id, doc.to_dict()) if doc.exists else None
+            
+            if cached_doc:
+                self.index.upsert(cached_doc)
+                if self.lazy_payloads:
+                    self.payloads.put(document_id, self._to_payload(doc.to_dict()))
+            else:
+                self.index.remove(document_id)
+                self.payloads.invalidate(document_id)
+            
+        except Exception as e:
+            self.payloads.invalidate(document_id)
+            logger.error("document_cache_sync_failed", error=str(e), document_id=document_id)
+            # Fall back to a full reload on next access
+            self.cache_timestamp = 0
+    
+    def _is_fresh(self, current_time: float) -> bool:
+        """Check whether the index can serve without a reload."""
+        if self.index is None:
+            return False
+        if self.sync_mode == "listener":
+            return self._watch is not None
+        return current_time - self.cache_timestamp <= self.cache_ttl
     
     async def _ensure_cache_fresh(self) -> None:
-        """Ensure cache is fresh, refresh if needed."""
+        """
+        Ensure the cache can serve, refreshing stale data in the background.
+        
+        Only the very first load blocks the caller. An expired index keeps
+        serving while a single background task rebuilds and swaps it.
+        """
         current_time = time.time()
         
-        if (self.documents_cache is None or 
-            current_time - self.cache_timestamp > self.cache_ttl):
+        if self.index is None:
             
             async with self.cache_lock:
                
-                if (self.documents_cache is None or 
-                    current_time - self.cache_timestamp > self.cache_ttl):
-                    await self._refresh_cache()
+                if self.index is None:
+                    if self.sync_mode == "listener":
+                        await self._start_listener()
+                    else:
+                        await self._refresh_cache()
+            return
+        
+        if not self._is_fresh(current_time) and current_time >= self._retry_after:
+            self._schedule_refresh()
+    
+    def _schedule_refresh(self) -> None:
+        """Start a background rebuild unless one is already running."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        
+        if self.sync_mode == "listener":
+            self._refresh_task = asyncio.create_task(self._start_listener())
+        else:
+            self._refresh_task = asyncio.create_task(self._refresh_cache())
+        logger.info("vector_cache_background_refresh_scheduled", sync_mode=self.sync_mode)
+    
+    def close(self) -> None:
+        """Stop the change listener, if one is running."""
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
     
     async def search(
         self,
         query: str,
         top_k: Optional[int] = None,
-        threshold: Optional[float] = None
+        threshold: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        mode: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
+        """Search for similar documents using cached data; see ``search_with_embedding``."""
+        results, _ = await self.search_with_embedding(query, top_k, threshold, filters, mode, query_embedding)
+        return results
+    
+    async def search_with_embedding(
+        self,
+        query: str,
+        top_k: Optional[int] = None,
+        threshold: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        mode: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None,
+        embed: Optional[Callable[[str], Awaitable[List[float]]]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[List[float]]]:
         """
         Search for similar documents using cached data.
         
+        In "hybrid" mode a BM25 ranking over the document text is fused with
+        the vector ranking by reciprocal rank; when ``lexical_shortcut`` is
+        enabled and the lexical match is decisive, the embedding call is
+        skipped entirely.
+        
         Args:
             query: Query text
             top_k: Number of results to return
             threshold: Minimum similarity threshold
+            filters: Metadata equality filters, e.g. {"category": "contact"}
+            mode: "vector" or "hybrid" (default: settings.retrieval_mode)
+            query_embedding: Embedding of ``query`` if the caller already has it
+            embed: Embeds ``query`` instead of the store's embedding service,
+                e.g. a request shared with the query router
             
         Returns:
-            List of matching documents with similarity scores
+            Matching documents with similarity scores, and the query embedding
+            for reuse (None when the lexical shortcut made it unnecessary)
         """
         try:
             start_time = time.time()
             
             # Use settings defaults if not provided
-            from src.config import settings
             top_k = top_k or settings.max_search_results
             threshold = threshold or settings.similarity_threshold
             
             # Ensure cache is fresh
             await self._ensure_cache_fresh()
             
-            # Generate query embedding
-            query_embedding = await self.embedding_service.embed_text(query)
+            index = self.index
+            mode = mode or settings.retrieval_mode
+            if mode == "hybrid" and not index.has_lexical:
+                # Lazy payloads keep BM25 postings only when hybrid is the default
+                logger.info("cached_search_hybrid_unavailable")
+                mode = "vector"
+            rows, lexical_matches = self._candidates(index, query, top_k, filters, mode)
+            if rows is not None and rows.size == 0:
+                logger.info("cached_search_filtered_out", filters=filters)
+                return [], query_embedding
             
-            # Search through cached documents
-            results = []
-            for doc in self.documents_cache:
-                similarity = self.embedding_service.calculate_similarity(
-                    query_embedding,
-                    doc["embedding"]
-                )
+            if mode == "hybrid":
+                if settings.lexical_shortcut and self._is_lexical_decisive(index, query, lexical_matches):
+                    results = await self._hydrate(index, self._lexical_results(index, lexical_matches[:top_k]))
+                    logger.info(
+                        "cached_search_lexical_shortcut",
+                        query_length=len(query),
+                        results_count=len(results),
+                        search_time_ms=int((time.time() - start_time) * 1000),
+                        top_lexical_score=lexical_matches[0][1]
+                    )
+                    return results, query_embedding
+            
+            # Generate query embedding unless the caller brought one
+            if query_embedding is None:
+                version = index.version
+                query_embedding = await (embed or self.embedding_service.embed_text)(query)
                 
-                if similarity >= threshold:
-                    results.append({
-                        "id": doc["id"],
-                        "text": doc["text"],
-                        "metadata": doc["metadata"],
-                        "similarity": similarity,
-                        "created_at": doc.get("created_at"),
-                        "updated_at": doc.get("updated_at")
-                    })
-            
-            results.sort(key=lambda x: x["similarity"], reverse=True)
-            results = results[:top_k]
+                # Rows may have moved if changes were applied while embedding
+                if index.version != version:
+                    rows, lexical_matches = self._candidates(index, query, top_k, filters, mode)
+            
+            # Score the cached matrix with the configured search backend
+            depth = top_k if mode == "vector" else max(top_k, settings.hybrid_candidate_depth)
+            matches = await self.search_engine.search_index(
+                index, query_embedding, depth, threshold, rows=rows
+            )
+            if mode == "hybrid":
+                matches = self._fuse_rankings(index, query_embedding, matches, lexical_matches, top_k)
+            results = await self._hydrate(
+                index, [index.to_result(row, similarity) for row, similarity in matches]
+            )
             
             search_time = time.time() - start_time
             
@@ -137,16 +444,221 @@ class CachedVectorStore:
                 results_count=len(results),
                 search_time_ms=int(search_time * 1000),
                 top_similarity=results[0]["similarity"] if results else 0,
-                cache_doc_count=len(self.documents_cache)
+                retrieval_mode=mode,
+                cache_doc_count=len(index),
+                scanned_doc_count=len(index) if rows is None else len(rows)
             )
             
-            return results
+            return results, query_embedding
             
         except Exception as e:
             logger.error("cached_search_failed", error=str(e), query=query[:100])
             
-            logger.info("falling_back_to_firebase_search")
-            return await self.firebase_store.search(query, top_k, threshold)
+            # A full-collection scan per request turns an outage into a
+            # thundering herd, so it only happens when explicitly enabled
+            if settings.vector_search_fallback == "firebase":
+                logger.info("falling_back_to_firebase_search")
+                results = await self.firebase_store.search(
+                    query, top_k, threshold, filters, query_embedding=query_embedding
+                )
+                return results, query_embedding
+            
+            logger.info("cached_search_fallback_disabled")
+            return [], query_embedding
+    
+    def _candidates(
+        self,
+        index: VectorIndex,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        mode: str
+    ) -> Tuple[Optional[np.ndarray], List[Tuple[str, float]]]:
+        """Resolve the filtered row subset and, in hybrid mode, the BM25 ranking."""
+        rows = index.filter_rows(filters) if filters else None
+        
+        lexical_matches = []
+        if mode == "hybrid" and (rows is None or rows.size):
+            allowed = {index.ids[row] for row in rows} if rows is not None else None
+            lexical_matches = index.lexical.search(
+                query, max(top_k, settings.hybrid_candidate_depth), allowed
+            )
+        
+        return rows, lexical_matches
+    
+    def _is_lexical_decisive(
+        self,
+        index: VectorIndex,
+        query: str,
+        lexical_matches: List[Tuple[str, float]]
+    ) -> bool:
+        """
+        Decide whether BM25 alone can answer the query.
+        
+        The top document must contain (nearly) every query token and beat
+        the runner-up by ``lexical_shortcut_margin``; this catches exact dish
+        names and keywords without trusting partial word overlap.
+        """
+        if not lexical_matches:
+            return False
+        
+        top_id, top_score = lexical_matches[0]
+        if index.lexical.coverage(top_id, query) < settings.lexical_shortcut_coverage:
+            return False
+        
+        if len(lexical_matches) > 1:
+            return top_score >= settings.lexical_shortcut_margin * lexical_matches[1][1]
+        return True
+    
+    def _lexical_results(
+        self,
+        index: VectorIndex,
+        lexical_matches: List[Tuple[str, float]]
+    ) -> List[Dict[str, Any]]:
+        """Format BM25 matches; similarity is the score relative to the best match."""
+        top_score = lexical_matches[0][1]
+        results = []
+        for doc_id, score in lexical_matches:
+            result = index.to_result(index.row_of(doc_id), score / top_score)
+            result["lexical_score"] = score
+            results.append(result)
+        return results
+    
+    def _fuse_rankings(
+        self,
+        index: VectorIndex,
+        query_embedding: List[float],
+        vector_matches: List[Tuple[int, float]],
+        lexical_matches: List[Tuple[str, float]],
+        top_k: int
+    ) -> List[Tuple[int, float]]:
+        """
+        Merge vector and BM25 rankings with reciprocal rank fusion.
+        
+        Vector hits already passed the similarity threshold; lexical hits
+        are kept on their own evidence and get their cosine similarity
+        computed so every result reports the same score.
+        """
+        similarities = {index.ids[row]: similarity for row, similarity in vector_matches}
+        fused = reciprocal_rank_fusion(
+            [list(similarities), [doc_id for doc_id, _ in lexical_matches]],
+            k=settings.rrf_k
+        )[:top_k]
+        
+        missing = [doc_id for doc_id, _ in fused if doc_id not in similarities]
+        if missing:
+            scores = index.score_rows(query_embedding, [index.row_of(doc_id) for doc_id in missing])
+            similarities.update(zip(missing, (float(score) for score in scores)))
+        
+        return [(index.row_of(doc_id), similarities[doc_id]) for doc_id, _ in fused]
+    
+    async def _hydrate(self, index: VectorIndex, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fill in text, metadata and timestamps for one result list."""
+        return (await self._hydrate_many(index, [results]))[0]
+    
+    async def _hydrate_many(
+        self,
+        index: VectorIndex,
+        result_lists: List[List[Dict[str, Any]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Attach payloads to id-only results from an index without payloads.
+        
+        Cached payloads are reused; every miss across all lists is fetched
+        with a single projected ``get_all``. Results whose document no
+        longer exists are dropped.
+        """
+        if index.payloads_resident:
+            return result_lists
+        
+        document_ids = list(dict.fromkeys(r["id"] for results in result_lists for r in results))
+        if not document_ids:
+            return result_lists
+        
+        payloads, missing = self.payloads.get_many(document_ids)
+        if missing:
+            fetched = await self.firebase_store.get_documents(missing, DocumentProcessor.PAYLOAD_FIELDS)
+            for doc_id, doc_data in fetched.items():
+                payloads[doc_id] = self._to_payload(doc_data)
+                self.payloads.put(doc_id, payloads[doc_id])
+            
+            logger.info(
+                "search_payloads_fetched",
+                requested=len(document_ids),
+                fetched=len(fetched),
+                cache_hits=len(document_ids) - len(missing)
+            )
+        
+        hydrated = []
+        for results in result_lists:
+            hydrated.append([
+                {
+                    "id": result["id"],
+                    "text": payloads[result["id"]]["text"],
+                    "metadata": payloads[result["id"]]["metadata"],
+                    **{key: value for key, value in result.items() if key != "id"},
+                    "created_at": payloads[result["id"]]["created_at"],
+                    "updated_at": payloads[result["id"]]["updated_at"]
+                }
+                for result in results
+                if result["id"] in payloads
+            ])
+        return hydrated
+    
+    async def search_batch(
+        self,
+        queries: List[str],
+        top_k: Optional[int] = None,
+        threshold: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for many queries with one embedding call and one scoring pass.
+        
+        Args:
+            queries: Query texts
+            top_k: Number of results to return per query
+            threshold: Minimum similarity threshold
+            filters: Metadata equality filters applied to every query
+            
+        Returns:
+            One result list per query, in input order
+        """
+        start_time = time.time()
+        
+        top_k = top_k or settings.max_search_results
+        threshold = threshold or settings.similarity_threshold
+        
+        await self._ensure_cache_fresh()
+        
+        index = self.index
+        rows = index.filter_rows(filters) if filters else None
+        if rows is not None and rows.size == 0:
+            return [[] for _ in queries]
+        
+        version = index.version
+        query_embeddings = await self.embedding_service.embed_texts(queries)
+        
+        if rows is not None and index.version != version:
+            rows = index.filter_rows(filters)
+        
+        batch_matches = await self.search_engine.search_index_many(
+            index, query_embeddings, top_k, threshold, rows=rows
+        )
+        results = await self._hydrate_many(index, [
+            [index.to_result(row, similarity) for row, similarity in matches]
+            for matches in batch_matches
+        ])
+        
+        logger.info(
+            "cached_batch_search_completed",
+            query_count=len(queries),
+            results_count=sum(len(r) for r in results),
+            search_time_ms=int((time.time() - start_time) * 1000),
+            cache_doc_count=len(index)
+        )
+        
+        return results
     
     async def add_document(
         self,
@@ -154,39 +666,106 @@ class CachedVectorStore:
         metadata: Optional[Dict[str, Any]] = None,
         document_id: Optional[str] = None
     ) -> str:
-        """Add document and invalidate cache."""
+        """Add document and apply it to the cached index."""
         result = await self.firebase_store.add_document(text, metadata, document_id)
        
-        self.cache_timestamp = 0
-        logger.info("document_added_cache_invalidated", document_id=result)
+        await self._sync_document(result)
+        logger.info("document_added_cache_synced", document_id=result)
         return result
     
+    async def add_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        pipeline: Optional[IngestionPipeline] = None
+    ) -> IngestionReport:
+        """
+        Bulk-ingest documents and apply every stored batch to the cached index.
+        
+        Args:
+            documents: Dicts with text and optional metadata and document_id
+            pipeline: Pipeline to use (default: one over this store's Firestore)
+        """
+        pipeline = pipeline or IngestionPipeline(self.firebase_store)
+        
+        async def apply_batch(result) -> None:
+            if not result.succeeded:
+                return
+            for document_id, doc_data in zip(result.document_ids, result.documents):
+                if self._dirty_ids is not None:
+                    self._dirty_ids.add(document_id)
+                self.payloads.invalidate(document_id)
+                cached_doc = self._to_cached_document(document_id, doc_data)
+                if self.index is not None and cached_doc:
+                    self.index.upsert(cached_doc)
+        
+        report = await pipeline.ingest(documents, on_batch=apply_batch)
+        logger.info(
+            "documents_ingested_cache_synced",
+            succeeded=report.succeeded,
+            failed=len(report.failures)
+        )
+        return report
+    
     async def update_document(
         self,
         document_id: str,
         text: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
     ) -> bool:
-        """Update document and invalidate cache."""
+        """Update document and apply it to the cached index."""
         result = await self.firebase_store.update_document(document_id, text, metadata)
        
-        self.cache_timestamp = 0
-        logger.info("document_updated_cache_invalidated", document_id=document_id)
+        await self._sync_document(document_id)
+        logger.info("document_updated_cache_synced", document_id=document_id)
         return result
     
     async def delete_document(self, document_id: str) -> bool:
-        """Delete document and invalidate cache."""
+        """Delete document and drop it from the cached index."""
         result = await self.firebase_store.delete_document(document_id)
       
-        self.cache_timestamp = 0
-        logger.info("document_deleted_cache_invalidated", document_id=document_id)
+        # A rebuild in progress may have streamed the document before it went
+        if self._dirty_ids is not None:
+            self._dirty_ids.add(document_id)
+        if self.index is not None:
+            self.index.remove(document_id)
+        self.payloads.invalidate(document_id)
+        logger.info("document_deleted_cache_synced", document_id=document_id)
         return result
     
+    async def measure_quantization_recall(self, top_k: int = 10, sample_size: int = 50) -> Dict[str, Any]:
+        """Report recall of the quantized scan against exact search, off the event loop."""
+        if self.index is None:
+            return {"quantization": self.quantization, "recall": None, "queries": 0}
+        return await asyncio.to_thread(self.index.measure_recall, top_k=top_k, sample_size=sample_size)
+    
     def get_cache_info(self) -> Dict[str, Any]:
         """Get cache information for monitoring."""
         return {
-            "cached_documents": len(self.documents_cache) if self.documents_cache else 0,
+            "cached_documents": len(self.index) if self.index else 0,
+            "index_bytes": self.index.memory_bytes() if self.index else 0,
+            "index_memory_mapped": self.index.is_memory_mapped if self.index else False,
+            "index_overlay_rows": self.index.overlay_rows if self.index else 0,
+            "quantization": self.index.quantization if self.index else None,
+            "quantized_bytes": self.index.quantized_bytes() if self.index else 0,
+            "snapshot_version": self.snapshot_version,
+            "payloads_resident": self.index.payloads_resident if self.index else not self.lazy_payloads,
+            "payload_cache": self.payloads.stats(),
             "cache_age_seconds": int(time.time() - self.cache_timestamp),
             "cache_ttl_seconds": self.cache_ttl,
-            "cache_fresh": time.time() - self.cache_timestamp < self.cache_ttl
-        }
\ No newline at end of file
+            "sync_mode": self.sync_mode,
+            "search_backend": self.search_engine.backend,
+            "ann_index": self.index.ann.stats() if self.index and self.index.ann else None,
+            "refresh_in_progress": self._refresh_task is not None and not self._refresh_task.done(),
+            "cache_fresh": self._is_fresh(time.time())
+        }
+
+
+_shared_store: Optional[CachedVectorStore] = None
+
+
+def get_cached_vector_store() -> CachedVectorStore:
+    """Get the process-wide cached store so every caller shares one warm index."""
+    global _shared_store
+    if _shared_store is None:
+        _shared_store = CachedVectorStore()
+    return _shared_store
\ No newline at end of file
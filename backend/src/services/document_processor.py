@@ -1,8 +1,11 @@
 """Document processing service for vector store operations."""
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, Tuple, Hashable, Union
 from datetime import datetime
+import numpy as np
 import structlog
+from src.config import settings
+from src.services.embedding_codec import encode_embedding, decode_embedding, is_encoded
 
 logger = structlog.get_logger()
 
@@ -13,6 +16,8 @@ class DocumentProcessor:
     # Field mapping for different document schemas
     EMBEDDING_FIELDS = ["embedding", "embeddings", "vector"]
     TEXT_FIELDS = ["text", "content", "chunk", "document", "data"]
+    # Everything a search result needs except the embedding
+    PAYLOAD_FIELDS = TEXT_FIELDS + ["metadata", "created_at", "updated_at"]
     
     @classmethod
     def prepare_document_data(
@@ -29,18 +34,39 @@ class DocumentProcessor:
         """
         return {
             "text": text,
-            "embedding": embedding,
+            "embedding": cls.encode_embedding(embedding),
             "metadata": metadata or {},
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
     
     @classmethod
-    def extract_embedding(cls, doc_data: Dict[str, Any]) -> Optional[List[float]]:
-        """Extract embedding from document with flexible field mapping."""
+    def encode_embedding(cls, embedding: Any) -> Any:
+        """
+        Convert an embedding to its stored form.
+        
+        Lists become float32 blobs when ``EMBEDDING_STORAGE_FORMAT`` is
+        ``binary``; other values, such as Firestore vectors, pass through.
+        """
+        if settings.embedding_storage_format == "binary" and isinstance(embedding, (list, tuple, np.ndarray)):
+            return encode_embedding(embedding, settings.embedding_model)
+        return embedding
+    
+    @classmethod
+    def extract_embedding(cls, doc_data: Dict[str, Any]) -> Optional[Union[List[float], np.ndarray]]:
+        """
+        Extract embedding from document with flexible field mapping.
+        
+        Binary-encoded embeddings come back as read-only float32 views
+        over the stored bytes; list embeddings are returned as-is.
+        """
         for field in cls.EMBEDDING_FIELDS:
             if field in doc_data and doc_data[field]:
-                return doc_data[field]
+                value = doc_data[field]
+                if is_encoded(value):
+                    return decode_embedding(value)[0]
+                # Firestore vector values are sequences, not lists
+                return value if isinstance(value, list) else list(value)
         return None
     
     @classmethod
@@ -77,4 +103,52 @@ class DocumentProcessor:
         # Remove embedding vectors (too large for responses)
         for field in cls.EMBEDDING_FIELDS:
             sanitized.pop(field, None)
-        return sanitized
\ No newline at end of file
+        return sanitized
+    
+    @classmethod
+    def flatten_metadata(
+        cls,
+        metadata: Dict[str, Any],
+        prefix: str = ""
+    ) -> Iterator[Tuple[str, Hashable]]:
+        """
+        Yield (key, value) pairs usable for metadata filtering.
+        
+        Nested dicts produce dotted keys and list values yield one pair
+        per element, so {"tags": ["a", "b"]} matches both "a" and "b".
+        """
+        for key, value in (metadata or {}).items():
+            path = f"{prefix}{key}"
+            if isinstance(value, dict):
+                yield from cls.flatten_metadata(value, f"{path}.")
+            elif isinstance(value, (list, tuple, set)):
+                for item in value:
+                    if isinstance(item, Hashable):
+                        yield path, item
+            elif isinstance(value, Hashable):
+                yield path, value
+    
+    @classmethod
+    def matches_filters(
+        cls,
+        metadata: Dict[str, Any],
+        filters: Optional[Dict[str, Any]]
+    ) -> bool:
+        """
+        Check metadata against equality filters.
+        
+        Every filter key must match; a list filter value matches any of
+        its elements.
+        """
+        if not filters:
+            return True
+        
+        values: Dict[str, set] = {}
+        for key, value in cls.flatten_metadata(metadata):
+            values.setdefault(key, set()).add(value)
+        
+        for key, expected in filters.items():
+            options = expected if isinstance(expected, (list, tuple, set)) else [expected]
+            if not values.get(key, set()) & set(options):
+                return False
+        return True
@@ -0,0 +1,197 @@
+"""Two-tier content-addressed cache of text embeddings."""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import structlog
+from src.config import settings
+from src.services.embedding_codec import encode_embedding, decode_embedding, EmbeddingCodecError
+
+logger = structlog.get_logger()
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form for cache keys: NFC, trimmed, single spaces."""
+    return WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(model: str, text: str) -> str:
+    """Content address of a text's embedding under a model."""
+    return hashlib.sha256(f"{model}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    In-process LRU bounded by bytes, backed by an SQLite file.
+
+    The SQLite tier runs in WAL mode so every worker process on the host
+    reads and writes the same file; an embedding computed by one worker
+    is a disk hit for the others. Vectors are stored with the binary
+    embedding codec and held in memory as float32 arrays.
+
+    Methods are called from worker threads, so the memory tier and the
+    counters are guarded by one lock and the SQLite connection by another.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, path: Optional[str] = None):
+        self.max_bytes = settings.embedding_cache_max_bytes if max_bytes is None else max_bytes
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        path = settings.embedding_cache_path if path is None else path
+        self.path = Path(path) if path else None
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+        if self.path is not None:
+            try:
+                self._db = self._open(self.path)
+            except sqlite3.Error as e:
+                logger.error("embedding_cache_disk_unavailable", path=str(self.path), error=str(e))
+
+    @staticmethod
+    def _open(path: Path) -> sqlite3.Connection:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(str(path), timeout=5, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+        return db
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Add to the memory tier, evicting least recently used past the budget; needs ``_lock``."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        self._entries[key] = vector
+        self._bytes += vector.nbytes
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up embeddings, memory first and then disk.
+
+        Blocking on the disk tier; call through ``asyncio.to_thread``.
+
+        Returns:
+            One float32 vector or None per text
+        """
+        keys = [cache_key(model, text) for text in texts]
+        found: List[Optional[np.ndarray]] = [None] * len(keys)
+
+        disk_keys: Dict[str, List[int]] = {}
+        with self._lock:
+            for position, key in enumerate(keys):
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[position] = vector
+                    self.memory_hits += 1
+                else:
+                    disk_keys.setdefault(key, []).append(position)
+
+        stored = self._read(list(disk_keys)) if disk_keys and self._db is not None else {}
+
+        with self._lock:
+            for key, vector in stored.items():
+                self._remember(key, vector)
+                for position in disk_keys.pop(key):
+                    found[position] = vector
+                    self.disk_hits += 1
+            self.misses += sum(len(positions) for positions in disk_keys.values())
+        return found
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Store freshly computed embeddings in both tiers."""
+        rows = []
+        for text, vector in zip(texts, vectors):
+            array = np.asarray(vector, dtype=np.float32)
+            rows.append((cache_key(model, text), array, encode_embedding(array, model), time.time()))
+
+        with self._lock:
+            for key, array, _, _ in rows:
+                self._remember(key, array)
+        rows = [(key, blob, created_at) for key, _, blob, created_at in rows]
+
+        if rows and self._db is not None:
+            try:
+                with self._db_lock:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector, created_at) VALUES (?, ?, ?)",
+                        rows
+                    )
+            except sqlite3.Error as e:
+                logger.warning("embedding_cache_write_failed", error=str(e), count=len(rows))
+
+    def _read(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Fetch stored vectors for the given keys."""
+        vectors: Dict[str, np.ndarray] = {}
+        try:
+            with self._db_lock:
+                # SQLite limits bound parameters per statement
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    for key, blob in self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                    ):
+                        vectors[key] = decode_embedding(blob)[0]
+        except (sqlite3.Error, EmbeddingCodecError) as e:
+            logger.warning("embedding_cache_read_failed", error=str(e), count=len(keys))
+        return vectors
+
+    def stats(self) -> Dict[str, object]:
+        """Get cache statistics."""
+        with self._lock:
+            memory_hits, disk_hits, misses = self.memory_hits, self.disk_hits, self.misses
+            entries, memory_bytes = len(self._entries), self._bytes
+
+        total_requests = memory_hits + disk_hits + misses
+        hit_rate = ((memory_hits + disk_hits) / total_requests * 100) if total_requests > 0 else 0
+
+        return {
+            "memory_hits": memory_hits,
+            "disk_hits": disk_hits,
+            "misses": misses,
+            "hit_rate": round(hit_rate, 2),
+            "memory_entries": entries,
+            "memory_bytes": memory_bytes,
+            "max_memory_bytes": self.max_bytes,
+            "disk_path": str(self.path) if self._db is not None else None
+        }
+
+    def clear(self) -> None:
+        """Empty the memory tier and reset counters; the disk tier is kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache shared by every EmbeddingService."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache()
+    return _embedding_cache
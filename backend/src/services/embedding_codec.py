@@ -0,0 +1,68 @@
+"""Compact binary encoding for stored embeddings."""
+
+import struct
+from typing import Sequence, Tuple, Union
+import numpy as np
+
+MAGIC = b"EMB1"
+# magic, dimension, model name length
+HEADER = struct.Struct("<4sIH")
+VECTOR_DTYPE = np.dtype("<f4")
+
+
+class EmbeddingCodecError(ValueError):
+    """Raised when a stored embedding blob is malformed."""
+    pass
+
+
+def _padding(model_length: int) -> int:
+    """Bytes needed after the model name to align the vector to float32."""
+    return -(HEADER.size + model_length) % VECTOR_DTYPE.itemsize
+
+
+def encode_embedding(embedding: Union[Sequence[float], np.ndarray], model: str) -> bytes:
+    """
+    Pack an embedding as little-endian float32 with a header.
+
+    Layout: ``EMB1`` | uint32 dimension | uint16 model length | model
+    name (UTF-8) | zero padding to 4 bytes | float32 values.
+    """
+    vector = np.asarray(embedding, dtype=VECTOR_DTYPE)
+    if vector.ndim != 1:
+        raise EmbeddingCodecError(f"Expected a 1-D embedding, got shape {vector.shape}")
+
+    model_bytes = model.encode("utf-8")
+    header = HEADER.pack(MAGIC, vector.shape[0], len(model_bytes))
+    return header + model_bytes + b"\0" * _padding(len(model_bytes)) + vector.tobytes()
+
+
+def decode_embedding(blob: Union[bytes, bytearray, memoryview]) -> Tuple[np.ndarray, str]:
+    """
+    Unpack an encoded embedding without copying the vector data.
+
+    Returns:
+        (read-only float32 view over ``blob``, embedding model name)
+    """
+    if len(blob) < HEADER.size:
+        raise EmbeddingCodecError("Embedding blob is shorter than its header")
+
+    magic, dimension, model_length = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise EmbeddingCodecError(f"Unknown embedding encoding {magic!r}")
+
+    offset = HEADER.size + model_length
+    model = bytes(blob[HEADER.size:offset]).decode("utf-8")
+    offset += _padding(model_length)
+
+    if len(blob) - offset != dimension * VECTOR_DTYPE.itemsize:
+        raise EmbeddingCodecError(
+            f"Embedding blob holds {len(blob) - offset} bytes for dimension {dimension}"
+        )
+
+    vector = np.frombuffer(blob, dtype=VECTOR_DTYPE, count=dimension, offset=offset)
+    return vector, model
+
+
+def is_encoded(value) -> bool:
+    """Whether a stored embedding value uses the binary encoding."""
+    return isinstance(value, (bytes, bytearray, memoryview)) and bytes(value[:4]) == MAGIC
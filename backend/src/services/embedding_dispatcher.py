@@ -0,0 +1,135 @@
+"""Micro-batching and single-flight coalescing of embedding requests."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+import structlog
+from src.config import settings
+
+logger = structlog.get_logger()
+
+EmbedBatch = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+class EmbeddingDispatcher:
+    """
+    Collects concurrent single-text embedding calls into batch requests.
+
+    Calls arriving within ``window_ms`` of the first pending one (or until
+    ``max_batch`` texts are pending) are sent as one ``embed_batch`` call
+    and the vectors are fanned back out. A text that is already pending or
+    in flight is not sent again; its callers await the same future.
+    """
+
+    def __init__(self, embed_batch: EmbedBatch, window_ms: float = 5, max_batch: int = 64):
+        self.embed_batch = embed_batch
+        self.window = max(0.0, window_ms) / 1000
+        self.max_batch = max(1, max_batch)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending: List[str] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self.requests = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.batched_texts = 0
+
+    def _bind(self) -> asyncio.AbstractEventLoop:
+        """Start from a clean slate when called from a new event loop."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._inflight = {}
+            self._pending = []
+            self._timer = None
+            self._tasks = set()
+        return loop
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed one text as part of the next batch."""
+        loop = self._bind()
+        self.requests += 1
+
+        future = self._inflight.get(text)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = loop.create_future()
+            self._inflight[text] = future
+            self._pending.append(text)
+
+            if len(self._pending) >= self.max_batch or self.window == 0:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._flush)
+
+        # A cancelled caller must not cancel the result other callers share
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        """Send everything pending as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = self._loop.create_task(self._dispatch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, texts: List[str]) -> None:
+        """Run one batch request and resolve its futures."""
+        self.batches += 1
+        self.batched_texts += len(texts)
+        try:
+            embeddings = await self.embed_batch(texts)
+        except Exception as e:
+            logger.error("embedding_batch_dispatch_failed", error=str(e), count=len(texts))
+            for text in texts:
+                future = self._inflight.pop(text)
+                if not future.done():
+                    future.set_exception(e)
+                # Retrieve the exception so an unawaited future does not warn
+                future.exception()
+            return
+
+        for text, embedding in zip(texts, embeddings):
+            future = self._inflight.pop(text)
+            if not future.done():
+                future.set_result(embedding)
+
+        logger.debug("embedding_batch_dispatched", count=len(texts))
+
+    def stats(self) -> Dict[str, float]:
+        """Get dispatcher statistics."""
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "average_batch_size": round(self.batched_texts / self.batches, 2) if self.batches else 0,
+            "pending": len(self._pending),
+            "in_flight": len(self._inflight)
+        }
+
+
+_dispatchers: Dict[str, EmbeddingDispatcher] = {}
+
+
+def get_embedding_dispatcher(name: str, embed_batch: EmbedBatch) -> EmbeddingDispatcher:
+    """
+    Get the process-wide dispatcher for a vector space.
+
+    Services are built per request, so batching only pays off when they
+    share one dispatcher per provider name; ``embed_batch`` is used by the
+    first caller to create it.
+    """
+    dispatcher = _dispatchers.get(name)
+    if dispatcher is None:
+        dispatcher = _dispatchers[name] = EmbeddingDispatcher(
+            embed_batch,
+            window_ms=settings.embedding_batch_window_ms,
+            max_batch=settings.embedding_batch_max_size
+        )
+    return dispatcher
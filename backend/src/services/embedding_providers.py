@@ -0,0 +1,122 @@
+"""Embedding providers behind EmbeddingService."""
+
+import re
+import zlib
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+from src.config import settings
+from src.services.embedding_cache import normalize_text
+
+TOKEN = re.compile(r"\w+")
+
+
+class EmbeddingProvider(ABC):
+    """Turns texts into fixed-dimension vectors."""
+
+    #: Identifies the vector space; used as the embedding cache namespace
+    name: str
+    dimension: int
+    #: Remote providers are worth caching and batching; local ones are not
+    remote: bool = True
+
+    @abstractmethod
+    async def embed_query(self, text: str) -> List[float]:
+        """Embed a search query."""
+        pass
+
+    @abstractmethod
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts in one request."""
+        pass
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """Embeddings from the OpenAI API."""
+
+    def __init__(self, model: Optional[str] = None):
+        self.name = model or settings.embedding_model
+        self.dimension = settings.vector_dimension
+        self.client = OpenAIEmbeddings(
+            openai_api_key=settings.openai_api_key,
+            model=self.name
+        )
+
+    async def embed_query(self, text: str) -> List[float]:
+        return await self.client.aembed_query(text)
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.client.aembed_documents(texts)
+
+
+class HashedNgramEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic local embeddings from hashed character n-grams and words.
+
+    Each feature is hashed with CRC32 to a dimension and a sign, and the
+    counts are L2-normalized, so texts sharing spelling and vocabulary get
+    high cosine similarity. No network, no model files, microseconds per
+    text, and identical output in every process.
+
+    Vectors live in their own space: the knowledge base must be embedded
+    with this provider too (e.g. into a separate collection) before it can
+    be searched with it. Intended for benchmarks, load tests and running
+    retrieval while the remote provider is unavailable.
+    """
+
+    remote = False
+
+    def __init__(self, dimension: Optional[int] = None, ngram_range: Tuple[int, int] = (3, 5)):
+        self.dimension = dimension or settings.vector_dimension
+        self.ngram_range = ngram_range
+        self.name = f"hashed-ngram-{ngram_range[0]}-{ngram_range[1]}-{self.dimension}"
+
+    def _features(self, text: str) -> List[str]:
+        text = normalize_text(text).lower()
+        words = TOKEN.findall(text)
+        features = [f"w:{word}" for word in words]
+
+        low, high = self.ngram_range
+        for word in words:
+            padded = f" {word} "
+            for size in range(low, high + 1):
+                features.extend(padded[start:start + size] for start in range(len(padded) - size + 1))
+        return features
+
+    def embed(self, text: str) -> List[float]:
+        """Embed one text synchronously."""
+        digests = np.fromiter(
+            (zlib.crc32(feature.encode("utf-8")) for feature in self._features(text)),
+            dtype=np.int64
+        )
+        signs = np.where(digests & 1, 1.0, -1.0).astype(np.float32)
+        vector = np.bincount(
+            (digests >> 1) % self.dimension, weights=signs, minlength=self.dimension
+        ).astype(np.float32)
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
+
+    async def embed_query(self, text: str) -> List[float]:
+        return self.embed(text)
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed(text) for text in texts]
+
+
+PROVIDERS = {
+    "openai": OpenAIEmbeddingProvider,
+    "local": HashedNgramEmbeddingProvider,
+}
+
+
+def create_embedding_provider(name: Optional[str] = None) -> EmbeddingProvider:
+    """Build the provider named by ``name`` or EMBEDDING_PROVIDER."""
+    name = name or settings.embedding_provider
+    try:
+        return PROVIDERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown embedding provider: {name} (expected one of {', '.join(PROVIDERS)})")
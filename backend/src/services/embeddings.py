@@ -1,59 +1,121 @@
 """Embedding service for text vectorization."""
 
-from typing import List, Union
+import asyncio
+from typing import List, Optional, Union
 import numpy as np
-from langchain_openai import OpenAIEmbeddings
 from src.config import settings
+from src.services.embedding_cache import EmbeddingCache, get_embedding_cache
+from src.services.embedding_dispatcher import get_embedding_dispatcher
+from src.services.embedding_providers import EmbeddingProvider, create_embedding_provider
 import structlog
 
 logger = structlog.get_logger()
 
 
 class EmbeddingService:
-    """Service for creating text embeddings using OpenAI."""
+    """Service for creating text embeddings with a configurable provider."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        provider: Optional[EmbeddingProvider] = None,
+        cache: Optional[EmbeddingCache] = None
+    ):
         """Initialize the embedding service."""
-        self.embeddings = OpenAIEmbeddings(
-            openai_api_key=settings.openai_api_key,
-            model=settings.embedding_model
+        self.provider = provider or create_embedding_provider()
+        self.model = self.provider.name
+        remote = self.provider.remote
+
+        self.cache = cache or (
+            get_embedding_cache() if remote and settings.embedding_cache_enabled else None
         )
+        self.dispatcher = get_embedding_dispatcher(
+            self.model, self._embed_and_store
+        ) if remote and settings.embedding_batching_enabled else None
         logger.info(
             "embedding_service_initialized",
-            model=settings.embedding_model,
-            dimension=settings.vector_dimension
+            model=self.model,
+            dimension=self.provider.dimension,
+            cache_enabled=self.cache is not None,
+            batching_enabled=self.dispatcher is not None
         )
     
     async def embed_text(self, text: str) -> List[float]:
         """
         Create embedding for a single text.
         
+        Cache misses go through the dispatcher, which batches concurrent
+        calls into one provider request and shares identical in-flight
+        texts.
+        
         Args:
             text: Text to embed
             
         Returns:
             List of floats representing the embedding
         """
+        if self.cache is not None:
+            cached = (await asyncio.to_thread(self.cache.get_many, self.model, [text]))[0]
+            if cached is not None:
+                return cached.tolist()
+
+        if self.dispatcher is not None:
+            return await self.dispatcher.embed(text)
+
         try:
-            embedding = await self.embeddings.aembed_query(text)
+            embedding = await self.provider.embed_query(text)
             logger.debug("text_embedded", text_length=len(text))
-            return embedding
         except Exception as e:
             logger.error("embedding_failed", error=str(e), text=text[:100])
             raise
+
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put_many, self.model, [text], [embedding])
+        return embedding
     
     async def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """
         Create embeddings for multiple texts.
         
+        Only texts missing from the cache are sent to the provider, each
+        distinct text once.
+        
         Args:
             texts: List of texts to embed
             
         Returns:
             List of embeddings
         """
+        if self.cache is None:
+            return await self._embed_documents(texts)
+
+        cached = await asyncio.to_thread(self.cache.get_many, self.model, texts)
+        embeddings: List[Optional[List[float]]] = [
+            vector.tolist() if vector is not None else None for vector in cached
+        ]
+
+        missing = list(dict.fromkeys(
+            text for text, embedding in zip(texts, embeddings) if embedding is None
+        ))
+        if missing:
+            computed = dict(zip(missing, await self._embed_and_store(missing)))
+            embeddings = [
+                embedding if embedding is not None else computed[text]
+                for text, embedding in zip(texts, embeddings)
+            ]
+
+        return embeddings
+
+    async def _embed_and_store(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in one provider request and cache the vectors."""
+        embeddings = await self._embed_documents(texts)
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put_many, self.model, texts, embeddings)
+        return embeddings
+
+    async def _embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Send texts to the provider in one request."""
         try:
-            embeddings = await self.embeddings.aembed_documents(texts)
+            embeddings = await self.provider.embed_documents(texts)
             logger.debug("texts_embedded", count=len(texts))
             return embeddings
         except Exception as e:
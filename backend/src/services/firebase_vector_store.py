@@ -1,5 +1,8 @@
 """Enterprise-grade Firebase vector store with modular architecture."""
 
+import asyncio
+import base64
+import json
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import structlog
@@ -9,6 +12,7 @@ from src.services.embeddings import EmbeddingService
 from src.services.firebase_connection import FirebaseConnection
 from src.services.document_processor import DocumentProcessor
 from src.services.vector_search_engine import VectorSearchEngine
+from src.services.firestore_vector_search import FirestoreVectorSearch
 
 logger = structlog.get_logger()
 
@@ -28,11 +32,15 @@ class FirebaseVectorStore:
         self.embedding_service = EmbeddingService()
         self.processor = DocumentProcessor()
         self.search_engine = VectorSearchEngine(self.embedding_service)
+        self.native_search = FirestoreVectorSearch(
+            self.firebase.get_collection(self.collection_name)
+        )
         
         logger.info(
             "firebase_vector_store_initialized",
             collection=self.collection_name,
-            project_id=settings.firebase_project_id
+            project_id=settings.firebase_project_id,
+            native_vector_search=self.native_search.enabled
         )
     
     async def add_document(
@@ -44,11 +52,15 @@ class FirebaseVectorStore:
         """Add document with automatic embedding generation."""
         try:
             embedding = await self.embedding_service.embed_text(text)
-            doc_data = self.processor.prepare_document_data(text, embedding, metadata)
+            doc_data = self.processor.prepare_document_data(
+                text, self.native_search.to_storage(embedding), metadata
+            )
             
             collection = self.firebase.get_collection(self.collection_name)
             
             if document_id:
+                # Overwriting keeps the original creation time
+                doc_data.update(self.existing_created_at([document_id]).get(document_id, {}))
                 collection.document(document_id).set(doc_data)
             else:
                 doc_ref = collection.add(doc_data)[1]
@@ -71,22 +83,47 @@ class FirebaseVectorStore:
         self,
         query: str,
         top_k: Optional[int] = None,
-        threshold: Optional[float] = None
+        threshold: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
-        """Execute semantic similarity search."""
+        """Execute semantic similarity search, optionally restricted by metadata."""
         try:
             top_k = top_k or settings.max_search_results
             threshold = threshold or settings.similarity_threshold
             
-            # Stream documents for memory efficiency
+            # One embedding serves the native query and the local fallback
+            if query_embedding is None:
+                query_embedding = await self.embedding_service.embed_text(query)
+            
+            # Nearest-neighbour query runs server-side when available
+            if self.native_search.enabled:
+                results = self.native_search.search(query_embedding, top_k, threshold, filters)
+                if results is not None:
+                    return results
+                logger.info("falling_back_to_local_vector_search")
+            
+            # Phase 1: rank on an ids + vectors projection (metadata only to filter)
+            fields = self.processor.EMBEDDING_FIELDS + (["metadata"] if filters else [])
             collection = self.firebase.get_collection(self.collection_name)
-            documents = [(doc.id, doc.to_dict()) for doc in collection.stream()]
+            documents = [(doc.id, doc.to_dict()) for doc in collection.select(fields).stream()]
             
-            # Delegate to search engine
-            results = await self.search_engine.execute_similarity_search(
-                query, documents, top_k, threshold
+            ranked = await self.search_engine.rank_documents(
+                query, documents, top_k, threshold, filters, query_embedding=query_embedding
             )
             
+            # Phase 2: one batched read of the winners' payloads
+            payloads = await self.get_documents(
+                [doc_id for doc_id, _ in ranked], self.processor.PAYLOAD_FIELDS
+            )
+            results = [
+                self.processor.format_search_result(doc_id, payloads[doc_id], similarity)
+                for doc_id, similarity in ranked
+                if doc_id in payloads
+            ]
+            
+            self.search_engine.log_search_metrics(query, results, len(documents))
+            
             return results
             
         except Exception as e:
@@ -108,7 +145,12 @@ class FirebaseVectorStore:
             
             if text is not None:
                 embedding = await self.embedding_service.embed_text(text)
-                update_data.update({"text": text, "embedding": embedding})
+                update_data.update({
+                    "text": text,
+                    "embedding": self.processor.encode_embedding(
+                        self.native_search.to_storage(embedding)
+                    )
+                })
             
             if metadata is not None:
                 update_data["metadata"] = metadata
@@ -145,10 +187,11 @@ class FirebaseVectorStore:
         """Retrieve document by ID with sanitized response."""
         try:
             collection = self.firebase.get_collection(self.collection_name)
-            doc = collection.document(document_id).get()
+            # Only the returned fields are read; the embedding never leaves Firestore
+            doc = collection.document(document_id).get(field_paths=self.processor.PAYLOAD_FIELDS)
             
             if doc.exists:
-                doc_data = self.processor.sanitize_for_response(doc.to_dict())
+                doc_data = doc.to_dict()
                 doc_data["id"] = doc.id
                 return doc_data
             
@@ -158,39 +201,130 @@ class FirebaseVectorStore:
             logger.error("document_get_failed", error=str(e), document_id=document_id)
             raise DocumentOperationError(f"Failed to retrieve document {document_id}: {e}")
     
+    def existing_created_at(self, document_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Read the creation time of documents that already exist; blocking.
+        
+        Returns:
+            ``{"created_at": value}`` by id, for documents that have one
+        """
+        collection = self.firebase.get_collection(self.collection_name)
+        snapshots = self.firebase.db.get_all(
+            [collection.document(document_id) for document_id in document_ids],
+            field_paths=["created_at"]
+        )
+        created = {doc.id: (doc.to_dict() or {}).get("created_at") for doc in snapshots if doc.exists}
+        return {doc_id: {"created_at": value} for doc_id, value in created.items() if value is not None}
+    
+    async def get_documents(
+        self,
+        document_ids: List[str],
+        field_paths: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch several documents in one batched read.
+        
+        Args:
+            document_ids: Ids to fetch
+            field_paths: Optional projection, e.g. DocumentProcessor.PAYLOAD_FIELDS
+        
+        Returns:
+            Raw document data by id; missing documents are omitted
+        """
+        try:
+            collection = self.firebase.get_collection(self.collection_name)
+            references = [collection.document(document_id) for document_id in document_ids]
+            
+            snapshots = await asyncio.to_thread(
+                lambda: list(self.firebase.db.get_all(references, field_paths=field_paths))
+            )
+            return {doc.id: doc.to_dict() for doc in snapshots if doc.exists}
+            
+        except Exception as e:
+            logger.error("documents_get_failed", error=str(e), document_count=len(document_ids))
+            raise DocumentOperationError(f"Failed to retrieve documents: {e}")
+    
     async def list_documents(
         self,
         limit: int = 100,
-        offset: int = 0
-    ) -> Tuple[List[Dict[str, Any]], int]:
-        """List documents with pagination and performance optimization."""
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+        """
+        List documents newest first, one page per call.
+        
+        Pages are continued with the opaque ``cursor`` returned by the
+        previous call, so Firestore reads only the requested page. ``offset``
+        is kept for compatibility but still bills the skipped documents.
+        
+        Returns:
+            (documents, total count, cursor for the next page or None)
+        
+        Raises:
+            ValueError: If the cursor cannot be decoded
+        """
+        start_after = self._decode_cursor(cursor) if cursor else None
+        
         try:
             collection = self.firebase.get_collection(self.collection_name)
             
-            # Count query (consider caching this in production)
-            total_count = len(list(collection.stream()))
+            # Server-side aggregation; no documents are transferred
+            total_count = int(collection.count().get()[0][0].value)
+            
+            # Document id breaks created_at ties so cursors are stable
+            query = collection.select(self.processor.PAYLOAD_FIELDS) \
+                             .order_by("created_at", direction="DESCENDING") \
+                             .order_by("__name__", direction="DESCENDING")
             
-            # Paginated query with ordering
-            query = collection.order_by("created_at", direction="DESCENDING") \
-                             .limit(limit) \
-                             .offset(offset)
+            if start_after is not None:
+                query = query.start_after(start_after)
+            elif offset:
+                query = query.offset(offset)
             
             documents = []
-            for doc in query.stream():
-                doc_data = self.processor.sanitize_for_response(doc.to_dict())
+            last_created_at = None
+            for doc in query.limit(limit).stream():
+                doc_data = doc.to_dict()
+                last_created_at = doc_data.get("created_at")
                 doc_data["id"] = doc.id
                 documents.append(doc_data)
             
+            next_cursor = None
+            if len(documents) == limit:
+                next_cursor = self._encode_cursor(last_created_at, documents[-1]["id"])
+            
             logger.info(
                 "documents_listed",
                 count=len(documents),
                 total_count=total_count,
                 limit=limit,
-                offset=offset
+                offset=offset,
+                cursor=bool(cursor),
+                has_more=next_cursor is not None
             )
             
-            return documents, total_count
+            return documents, total_count, next_cursor
             
         except Exception as e:
             logger.error("document_list_failed", error=str(e))
-            raise DocumentOperationError(f"Failed to list documents: {e}")
\ No newline at end of file
+            raise DocumentOperationError(f"Failed to list documents: {e}")
+    
+    @staticmethod
+    def _encode_cursor(created_at: Any, document_id: str) -> str:
+        """Encode the last document's sort key as an opaque page cursor."""
+        if isinstance(created_at, datetime):
+            created_at = created_at.isoformat()
+        payload = json.dumps({"created_at": created_at, "id": document_id})
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Dict[str, Any]:
+        """Decode a page cursor into ``start_after`` field values."""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            created_at = datetime.fromisoformat(payload["created_at"])
+            document_id = str(payload["id"])
+        except (ValueError, TypeError, KeyError, UnicodeError) as e:
+            raise ValueError(f"Invalid pagination cursor: {e}")
+        
+        return {"created_at": created_at, "__name__": document_id}
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""Server-side nearest-neighbour search with Firestore vector values."""
+
+from typing import List, Dict, Any, Optional, Sequence
+import structlog
+from google.api_core.exceptions import FailedPrecondition
+from src.config import settings
+from src.services.document_processor import DocumentProcessor
+
+logger = structlog.get_logger()
+
+try:
+    from google.cloud.firestore_v1.base_vector_query import DistanceMeasure
+    from google.cloud.firestore_v1.vector import Vector
+except ImportError:  # google-cloud-firestore without vector support
+    DistanceMeasure = None
+    Vector = None
+
+# Firestore rejects find_nearest limits above this
+MAX_NEAREST_LIMIT = 1000
+
+
+class FirestoreVectorSearch:
+    """
+    Runs ``find_nearest`` against the collection instead of streaming it.
+
+    Embeddings must be stored as Firestore vector values and the field
+    needs a vector index, e.g.::
+
+        gcloud firestore indexes composite create \\
+            --collection-group=knowledge_base --query-scope=COLLECTION \\
+            --field-config=field-path=embedding,vector-config='{"dimension":"1536","flat":"{}"}'
+
+    Any failure returns None so the caller can fall back to the local
+    engine; a missing index disables the backend for the process.
+    """
+
+    DISTANCE_FIELD = "vector_distance"
+
+    def __init__(
+        self,
+        collection,
+        vector_field: Optional[str] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.collection = collection
+        self.vector_field = vector_field or settings.firestore_vector_field
+        self.processor = DocumentProcessor()
+
+        wanted = settings.firestore_vector_search if enabled is None else enabled
+        self.enabled = wanted and self.is_supported(collection)
+
+        if wanted and not self.enabled:
+            logger.warning("firestore_vector_search_unsupported")
+
+    @staticmethod
+    def is_supported(collection) -> bool:
+        """Check the client library and collection can run vector queries."""
+        return Vector is not None and hasattr(collection, "find_nearest")
+
+    def to_storage(self, embedding: Sequence[float]) -> Any:
+        """Wrap an embedding as a vector value when native search is on."""
+        if self.enabled:
+            return Vector([float(value) for value in embedding])
+        return embedding
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        top_k: int,
+        threshold: float,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Ask Firestore for the nearest documents by cosine distance.
+
+        Metadata filters are applied to an over-fetched candidate list,
+        since server-side pre-filtering needs a composite vector index
+        per filtered field.
+
+        Returns:
+            Formatted results ordered by similarity, or None on failure
+        """
+        if not self.enabled:
+            return None
+
+        limit = top_k
+        if filters:
+            limit = top_k * settings.firestore_vector_overfetch
+        limit = min(limit, MAX_NEAREST_LIMIT)
+
+        try:
+            # Project away the stored embeddings; only text and metadata come back
+            query = self.collection.select(DocumentProcessor.PAYLOAD_FIELDS).find_nearest(
+                vector_field=self.vector_field,
+                query_vector=Vector([float(value) for value in query_embedding]),
+                distance_measure=DistanceMeasure.COSINE,
+                limit=limit,
+                distance_result_field=self.DISTANCE_FIELD
+            )
+
+            results = []
+            for doc in query.stream():
+                doc_data = doc.to_dict()
+                similarity = 1.0 - float(doc_data.pop(self.DISTANCE_FIELD))
+
+                if similarity < threshold:
+                    break
+                if not self.processor.matches_filters(doc_data.get("metadata", {}), filters):
+                    continue
+
+                results.append(self.processor.format_search_result(doc.id, doc_data, similarity))
+                if len(results) == top_k:
+                    break
+
+            logger.info(
+                "firestore_vector_search_completed",
+                results_count=len(results),
+                limit=limit,
+                top_similarity=results[0]["similarity"] if results else 0
+            )
+            return results
+
+        except Exception as e:
+            # FailedPrecondition means the vector index does not exist
+            if isinstance(e, FailedPrecondition):
+                self.enabled = False
+            logger.error(
+                "firestore_vector_search_failed",
+                error=str(e),
+                backend_disabled=not self.enabled
+            )
+            return None
+
@@ -0,0 +1,194 @@
+"""Batched, concurrent ingestion of documents into the knowledge base."""
+
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+import structlog
+from src.config import settings
+from src.services.firebase_vector_store import FirebaseVectorStore
+
+logger = structlog.get_logger()
+
+# Firestore allows at most 500 writes per batch
+MAX_WRITE_BATCH = 500
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one embed-and-write batch."""
+    positions: List[int]
+    document_ids: List[str]
+    documents: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class IngestionReport:
+    """Summary of an ingestion run; failures carry input positions for retry."""
+    document_ids: List[Optional[str]]
+    succeeded: int = 0
+    failures: List[Dict[str, Any]] = field(default_factory=list)
+    batches: int = 0
+
+
+class IngestionPipeline:
+    """
+    Embeds documents with ``embed_texts`` and stores them with batched writes.
+
+    Input is cut into batches of ``batch_size``; up to ``concurrency``
+    batches embed and commit at once. Each batch is one embedding request
+    and one Firestore batch commit, so a failure affects only that batch.
+
+    Documents without an id get one derived from their content, so
+    re-running the same input overwrites instead of duplicating and an
+    interrupted run can simply be resumed.
+    """
+
+    def __init__(
+        self,
+        vector_store: Optional[FirebaseVectorStore] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None
+    ):
+        self.vector_store = vector_store or FirebaseVectorStore()
+        self.batch_size = max(1, min(batch_size or settings.ingest_batch_size, MAX_WRITE_BATCH))
+        self.concurrency = max(1, concurrency or settings.ingest_concurrency)
+        self.max_retries = settings.ingest_max_retries if max_retries is None else max_retries
+
+    @staticmethod
+    def content_id(text: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Deterministic document id for a text and its metadata."""
+        payload = json.dumps([text, metadata or {}], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:20]
+
+    async def ingest(
+        self,
+        documents: List[Dict[str, Any]],
+        skip: Optional[set] = None,
+        on_batch: Optional[Callable[[BatchResult], Awaitable[None]]] = None
+    ) -> IngestionReport:
+        """
+        Embed and store documents.
+
+        Args:
+            documents: Dicts with ``text`` and optional ``metadata`` and
+                ``document_id``
+            skip: Input positions already stored by a previous run
+            on_batch: Awaited after every batch, e.g. to checkpoint progress
+
+        Returns:
+            Report with the id of every input position (None if skipped)
+        """
+        skip = skip or set()
+        report = IngestionReport(document_ids=[None] * len(documents))
+
+        pending = [position for position in range(len(documents)) if position not in skip]
+        batches = [
+            pending[start:start + self.batch_size]
+            for start in range(0, len(pending), self.batch_size)
+        ]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(positions: List[int]) -> None:
+            async with semaphore:
+                result = await self._process_batch(documents, positions)
+
+            report.batches += 1
+            for position, document_id in zip(positions, result.document_ids):
+                report.document_ids[position] = document_id
+
+            if result.succeeded:
+                report.succeeded += len(positions)
+            else:
+                report.failures.extend(
+                    {"index": position, "document_id": document_id, "error": result.error}
+                    for position, document_id in zip(positions, result.document_ids)
+                )
+
+            if on_batch is not None:
+                await on_batch(result)
+
+        await asyncio.gather(*(run(positions) for positions in batches))
+
+        logger.info(
+            "ingestion_completed",
+            documents=len(documents),
+            skipped=len(documents) - len(pending),
+            succeeded=report.succeeded,
+            failed=len(report.failures),
+            batches=report.batches,
+            batch_size=self.batch_size,
+            concurrency=self.concurrency
+        )
+        return report
+
+    async def _process_batch(
+        self,
+        documents: List[Dict[str, Any]],
+        positions: List[int]
+    ) -> BatchResult:
+        """Embed one batch and commit it as a single batched write, with retries."""
+        store = self.vector_store
+        batch_docs = [documents[position] for position in positions]
+        document_ids = [
+            doc.get("document_id") or self.content_id(doc["text"], doc.get("metadata"))
+            for doc in batch_docs
+        ]
+        result = BatchResult(positions=positions, document_ids=document_ids)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                embeddings = await store.embedding_service.embed_texts(
+                    [doc["text"] for doc in batch_docs]
+                )
+
+                stored = [
+                    store.processor.prepare_document_data(
+                        doc["text"],
+                        store.native_search.to_storage(embedding),
+                        doc.get("metadata")
+                    )
+                    for doc, embedding in zip(batch_docs, embeddings)
+                ]
+
+                await asyncio.to_thread(self._commit, document_ids, stored)
+
+                result.documents = stored
+                result.error = None
+                logger.info("ingestion_batch_written", documents=len(positions), attempt=attempt + 1)
+                return result
+
+            except Exception as e:
+                result.error = str(e)
+                logger.warning(
+                    "ingestion_batch_failed",
+                    error=str(e),
+                    documents=len(positions),
+                    attempt=attempt + 1
+                )
+                if attempt < self.max_retries:
+                    await asyncio.sleep(2 ** attempt)
+
+        return result
+
+    def _commit(self, document_ids: List[str], stored: List[Dict[str, Any]]) -> None:
+        """Write a batch of documents in one Firestore batch commit."""
+        store = self.vector_store
+        collection = store.firebase.get_collection(store.collection_name)
+
+        # Re-ingested documents keep their creation time, which listing
+        # order and cursors rely on; one batched read covers the batch
+        existing = store.existing_created_at(document_ids)
+
+        batch = store.firebase.db.batch()
+        for document_id, doc_data in zip(document_ids, stored):
+            doc_data.update(existing.get(document_id, {}))
+            batch.set(collection.document(document_id), doc_data)
+        batch.commit()
@@ -0,0 +1,297 @@
+"""Durable in-process job queue for embedding and storing documents."""
+
+import asyncio
+import fcntl
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import structlog
+from src.config import settings
+from src.services.cached_vector_store import get_cached_vector_store
+
+logger = structlog.get_logger()
+
+JOB_KINDS = ("create", "update")
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+
+class IngestionJobQueue:
+    """
+    Runs document writes on background workers instead of the request.
+
+    Every state change is appended to a JSON Lines journal, so queued and
+    interrupted jobs are replayed after a restart. Each server process
+    claims its own journal "slot" with an exclusive file lock; a restarted
+    process takes over a free slot and finishes the jobs left in it.
+    Status lookups fall back to reading the other slots' journals, so any
+    worker can answer ``GET /documents/jobs/{id}``.
+    """
+
+    MAX_SLOTS = 256
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        workers: Optional[int] = None,
+        max_attempts: Optional[int] = None
+    ):
+        self.directory = Path(directory or settings.ingest_job_dir)
+        self.worker_count = max(1, workers or settings.ingest_job_workers)
+        self.max_attempts = max(1, max_attempts or settings.ingest_job_max_attempts)
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._lock_file = None
+        self._journal: Optional[Path] = None
+        self._journal_records = 0
+        self._journal_lock = threading.Lock()
+        self._compacting = False
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def _claim_slot(self) -> Path:
+        """Lock the first free journal slot for this process."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for slot in range(self.MAX_SLOTS):
+            lock_file = open(self.directory / f"queue-{slot}.lock", "w")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                continue
+            self._lock_file = lock_file
+            return self.directory / f"queue-{slot}.jsonl"
+        raise RuntimeError(f"No free ingestion job slot in {self.directory}")
+
+    @staticmethod
+    def _read_journal(path: Path) -> Dict[str, Dict[str, Any]]:
+        """Replay a journal into the latest record per job."""
+        jobs: Dict[str, Dict[str, Any]] = {}
+        if not path.exists():
+            return jobs
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from a crash mid-write
+                continue
+            jobs[record["job_id"]] = record
+        return jobs
+
+    def _encode(self, job: Dict[str, Any]) -> str:
+        job["updated_at"] = time.time()
+        return json.dumps(job) + "\n"
+
+    def _write(self, line: str) -> None:
+        """Append one record and fsync it; blocking."""
+        with self._journal_lock:
+            with open(self._journal, "a", encoding="utf-8") as journal:
+                journal.write(line)
+                journal.flush()
+                os.fsync(journal.fileno())
+            self._journal_records += 1
+
+    async def _record(self, job: Dict[str, Any]) -> None:
+        """Persist a job's current state without blocking the event loop."""
+        await asyncio.to_thread(self._write, self._encode(job))
+
+    def _compact(self) -> List[str]:
+        """
+        Rewrite the journal with live jobs and recent results only; blocking.
+
+        Returns:
+            Ids of the expired jobs that were left out
+        """
+        cutoff = time.time() - settings.ingest_job_retention_seconds
+        # Held across the rewrite so no concurrent append lands in the old file
+        with self._journal_lock:
+            kept, expired = [], []
+            for job in list(self.jobs.values()):
+                if job["status"] in TERMINAL_STATUSES and job["updated_at"] < cutoff:
+                    expired.append(job["job_id"])
+                else:
+                    kept.append(json.dumps(job) + "\n")
+            staging = self._journal.with_suffix(".tmp")
+            staging.write_text("".join(kept), encoding="utf-8")
+            os.replace(staging, self._journal)
+            self._journal_records = len(kept)
+        return expired
+
+    async def _compact_journal(self) -> None:
+        """Compact the journal in a thread, then forget the expired jobs."""
+        if self._compacting:
+            return
+        self._compacting = True
+        try:
+            for job_id in await asyncio.to_thread(self._compact):
+                self.jobs.pop(job_id, None)
+        finally:
+            self._compacting = False
+
+    async def start(self) -> None:
+        """Claim a slot, replay its unfinished jobs and start the workers."""
+        if self.running:
+            return
+
+        self._journal = self._claim_slot()
+        self.jobs = await asyncio.to_thread(self._read_journal, self._journal)
+        await self._compact_journal()
+
+        self._queue = asyncio.Queue()
+        resumed = 0
+        for job in sorted(self.jobs.values(), key=lambda job: job["created_at"]):
+            if job["status"] not in TERMINAL_STATUSES:
+                job["status"] = "queued"
+                await self._record(job)
+                self._queue.put_nowait(job["job_id"])
+                resumed += 1
+
+        self._workers = [
+            asyncio.create_task(self._worker(number)) for number in range(self.worker_count)
+        ]
+        logger.info(
+            "ingestion_job_queue_started",
+            journal=str(self._journal),
+            workers=self.worker_count,
+            resumed_jobs=resumed
+        )
+
+    async def stop(self) -> None:
+        """Stop the workers; unfinished jobs stay in the journal for the next start."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        logger.info("ingestion_job_queue_stopped")
+
+    async def submit(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Record a job durably and queue it.
+
+        Create jobs get their document id up front, so a job replayed
+        after a crash overwrites the same document instead of adding a
+        second one.
+
+        Returns:
+            The queued job record
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown ingestion job kind: {kind}")
+        if not self.running:
+            raise RuntimeError("Ingestion job queue is not running")
+
+        payload = dict(payload)
+        if kind == "create" and not payload.get("document_id"):
+            payload["document_id"] = uuid.uuid4().hex[:20]
+
+        now = time.time()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": "queued",
+            "payload": payload,
+            "document_id": payload.get("document_id"),
+            "attempts": 0,
+            "error": None,
+            "created_at": now,
+            "updated_at": now
+        }
+        self.jobs[job["job_id"]] = job
+        await self._record(job)
+        self._queue.put_nowait(job["job_id"])
+
+        logger.info("ingestion_job_submitted", job_id=job["job_id"], kind=kind, document_id=job["document_id"])
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look a job up here first, then in the other processes' journals."""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return job
+        return await asyncio.to_thread(self._find_in_other_journals, job_id)
+
+    def _find_in_other_journals(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Replay the other slots' journals looking for a job; blocking."""
+        for path in self.directory.glob("queue-*.jsonl"):
+            if path == self._journal:
+                continue
+            job = self._read_journal(path).get(job_id)
+            if job is not None:
+                return job
+        return None
+
+    async def _worker(self, number: int) -> None:
+        """Process queued jobs one at a time until cancelled."""
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(self.jobs[job_id])
+            except Exception as e:
+                logger.error("ingestion_job_worker_error", worker=number, job_id=job_id, error=str(e))
+            finally:
+                self._queue.task_done()
+
+            if self._journal_records > 4 * max(len(self.jobs), 64):
+                await self._compact_journal()
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        """Embed and store one job, retrying with backoff before failing it."""
+        vector_store = get_cached_vector_store()
+        payload = job["payload"]
+
+        job["status"] = "running"
+        job["attempts"] += 1
+        await self._record(job)
+
+        try:
+            if job["kind"] == "create":
+                job["document_id"] = await vector_store.add_document(
+                    text=payload["text"],
+                    metadata=payload.get("metadata"),
+                    document_id=payload["document_id"]
+                )
+            else:
+                await vector_store.update_document(
+                    document_id=payload["document_id"],
+                    text=payload.get("text"),
+                    metadata=payload.get("metadata")
+                )
+
+            job["status"] = "succeeded"
+            job["error"] = None
+            await self._record(job)
+            logger.info("ingestion_job_succeeded", job_id=job["job_id"], attempts=job["attempts"])
+
+        except Exception as e:
+            job["error"] = str(e)
+            if job["attempts"] >= self.max_attempts:
+                job["status"] = "failed"
+                await self._record(job)
+                logger.error("ingestion_job_failed", job_id=job["job_id"], error=str(e), attempts=job["attempts"])
+                return
+
+            job["status"] = "queued"
+            await self._record(job)
+            logger.warning("ingestion_job_retrying", job_id=job["job_id"], error=str(e), attempts=job["attempts"])
+            await asyncio.sleep(2 ** job["attempts"])
+            self._queue.put_nowait(job["job_id"])
+
+
+_job_queue: Optional[IngestionJobQueue] = None
+
+
+def get_ingestion_job_queue() -> IngestionJobQueue:
+    """Get the process-wide ingestion job queue."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = IngestionJobQueue()
+    return _job_queue
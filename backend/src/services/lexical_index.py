@@ -0,0 +1,125 @@
+"""BM25 inverted index for lexical retrieval over document text."""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; ``\\w`` keeps Swedish letters such as å, ä and ö."""
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+class BM25Index:
+    """Okapi BM25 over documents keyed by id."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, List[str]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index a document, replacing any previous text for the id."""
+        self.remove(doc_id)
+
+        terms = Counter(tokenize(text))
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+
+        length = sum(terms.values())
+        self._doc_terms[doc_id] = list(terms)
+        self._lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id: str) -> None:
+        """Drop a document from the index if present."""
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+
+        self._total_length -= length
+        for term in self._doc_terms.pop(doc_id, ()):
+            del self._postings[term][doc_id]
+            if not self._postings[term]:
+                del self._postings[term]
+
+    def _idf(self, term: str) -> float:
+        frequency = len(self._postings.get(term, ()))
+        return math.log(1 + (len(self._lengths) - frequency + 0.5) / (frequency + 0.5))
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        allowed: Optional[Set[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank documents by BM25 score.
+
+        Args:
+            query: Query text
+            top_k: Maximum results to return
+            allowed: Optional set of document ids to restrict results to
+
+        Returns:
+            (document id, score) pairs ordered by descending score
+        """
+        if not self._lengths:
+            return []
+
+        average_length = self._total_length / len(self._lengths)
+        scores: Dict[str, float] = {}
+
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+
+            idf = self._idf(term)
+            for doc_id, frequency in postings.items():
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                norm = 1 - self.b + self.b * self._lengths[doc_id] / average_length
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * (
+                    frequency * (self.k1 + 1) / (frequency + self.k1 * norm)
+                )
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:top_k]
+
+    def coverage(self, doc_id: str, query: str) -> float:
+        """Fraction of distinct query tokens that occur in the document."""
+        terms = set(tokenize(query))
+        if not terms:
+            return 0.0
+        present = sum(1 for term in terms if doc_id in self._postings.get(term, ()))
+        return present / len(terms)
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[List[str]],
+    k: int = 60
+) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked id lists with reciprocal rank fusion.
+
+    Each list contributes ``1 / (k + rank)`` per id, with rank starting at 1.
+
+    Returns:
+        (id, fused score) pairs ordered by descending score
+    """
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            fused[item] = fused.get(item, 0.0) + 1.0 / (k + rank)
+
+    return sorted(fused.items(), key=lambda entry: entry[1], reverse=True)
@@ -0,0 +1,215 @@
+"""Versioned, preformatted menu context for the restaurant agent's prompt."""
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import structlog
+from src.config import settings
+from src.services.menu_service import MenuService
+
+logger = structlog.get_logger()
+
+# Prompt labels per language; dish names and descriptions stay as stored
+LABELS = {
+    "en": {"description": "Description", "allergens": "Allergens", "tags": "Tags", "none": "None"},
+    "sv": {"description": "Beskrivning", "allergens": "Allergener", "tags": "Taggar", "none": "Inga"},
+}
+DEFAULT_LANGUAGE = "en"
+
+
+@dataclass
+class MenuSnapshot:
+    """One version of the menu and its prompt text per language."""
+    version: str
+    prompts: Dict[str, str]
+    item_count: int
+    marker: Any = None
+    loaded_at: float = field(default_factory=time.time)
+
+
+def menu_version(dishes: List[Dict[str, Any]]) -> str:
+    """Content hash of the menu, independent of read order."""
+    canonical = json.dumps(
+        sorted(dishes, key=lambda dish: dish["id"]), sort_keys=True, default=str, ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def format_menu(dishes: List[Dict[str, Any]], language: str) -> str:
+    """Render dishes grouped by category for the system prompt."""
+    labels = LABELS[language]
+    by_category: Dict[str, List[Dict[str, Any]]] = {}
+    for dish in sorted(dishes, key=lambda dish: dish["id"]):
+        by_category.setdefault(dish.get("category", "Other"), []).append(dish)
+
+    menu_text = []
+    for category, items in by_category.items():
+        menu_text.append(f"\n{category}:")
+        for item in items:
+            allergens = ", ".join(item.get("allergens", [])) or labels["none"]
+            menu_text.append(
+                f"- {item['name']} ({item['priceSek']} SEK)"
+                f"\n  {labels['description']}: {item['description']}"
+                f"\n  {labels['allergens']}: {allergens}"
+                f"\n  {labels['tags']}: {', '.join(item.get('tags', []))}"
+            )
+
+    return "\n".join(menu_text)
+
+
+class MenuContextCache:
+    """
+    Holds the formatted menu in memory instead of re-reading it per chat.
+
+    In "ttl" mode an expired snapshot keeps serving while one background
+    task checks the version marker field on ``restaurants/main`` (a single
+    document read) and re-reads the dishes only when the marker changed or
+    is missing, or when ``full_refresh`` seconds passed since the last read
+    (dish edits that bypass the uploader leave the marker alone). In
+    "listener" mode a Firestore snapshot listener rebuilds
+    the prompts whenever a dish changes. Either way the prompt text is
+    rebuilt only when the menu's content hash differs.
+    """
+
+    def __init__(
+        self,
+        menu_service: Optional[MenuService] = None,
+        ttl: Optional[int] = None,
+        sync_mode: Optional[str] = None,
+        full_refresh: Optional[int] = None
+    ):
+        self.menu_service = menu_service or MenuService()
+        self.ttl = settings.menu_context_ttl if ttl is None else ttl
+        self.sync_mode = sync_mode or settings.menu_context_sync_mode
+        self.full_refresh = settings.menu_context_full_refresh if full_refresh is None else full_refresh
+        self.snapshot: Optional[MenuSnapshot] = None
+        self.checked_at = 0.0
+        self.read_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._watch = None
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.snapshot.version if self.snapshot else None
+
+    async def get_prompt(self, language: str = DEFAULT_LANGUAGE) -> str:
+        """
+        Get the menu text for the system prompt.
+
+        Raises:
+            Exception: If the menu has never been loaded successfully
+        """
+        await self._ensure_fresh()
+        prompts = self.snapshot.prompts
+        return prompts.get(language, prompts[DEFAULT_LANGUAGE])
+
+    async def _ensure_fresh(self) -> None:
+        """Block only for the first load; refresh stale menus in the background."""
+        if self.snapshot is None:
+            async with self._lock:
+                if self.snapshot is None:
+                    if self.sync_mode == "listener":
+                        await self._start_listener()
+                    else:
+                        await asyncio.to_thread(self._refresh)
+            return
+
+        if self._watch is None and time.time() - self.checked_at > self.ttl:
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self._refresh_in_background())
+
+    async def _refresh_in_background(self) -> None:
+        try:
+            await asyncio.to_thread(self._refresh)
+        except Exception as e:
+            # Keep serving the previous menu; try again after another TTL
+            self.checked_at = time.time()
+            logger.error("menu_context_refresh_failed", error=str(e), version=self.version)
+
+    def _read_marker(self) -> Any:
+        """The restaurant document's version field, or None if not kept."""
+        if not settings.menu_version_field:
+            return None
+        doc = self.menu_service.restaurant_document().get(field_paths=[settings.menu_version_field])
+        return (doc.to_dict() or {}).get(settings.menu_version_field) if doc.exists else None
+
+    def _refresh(self) -> None:
+        """Re-read the menu unless the version marker shows it unchanged; blocking."""
+        marker = self._read_marker()
+        if (
+            marker is not None
+            and self.snapshot is not None
+            and marker == self.snapshot.marker
+            and time.time() - self.read_at < self.full_refresh
+        ):
+            self.checked_at = time.time()
+            logger.debug("menu_context_unchanged", version=self.version)
+            return
+
+        dishes = [
+            {**doc.to_dict(), "id": doc.id}
+            for doc in self.menu_service.dishes_collection().stream()
+        ]
+        self.read_at = time.time()
+        self._install(dishes, marker)
+
+    def _install(self, dishes: List[Dict[str, Any]], marker: Any = None) -> None:
+        """Swap in a new snapshot if the menu content changed."""
+        self.checked_at = time.time()
+        version = menu_version(dishes)
+        if self.snapshot is not None and version == self.snapshot.version:
+            self.snapshot.marker = marker
+            return
+
+        self.snapshot = MenuSnapshot(
+            version=version,
+            prompts={language: format_menu(dishes, language) for language in LABELS},
+            item_count=len(dishes),
+            marker=marker
+        )
+        logger.info("menu_context_updated", version=version, item_count=len(dishes))
+
+    async def _start_listener(self) -> None:
+        """Keep the snapshot current from a Firestore listener on the dishes."""
+        loop = asyncio.get_running_loop()
+        initial_sync = asyncio.Event()
+
+        def on_snapshot(col_snapshot, changes, read_time):
+            dishes = [{**doc.to_dict(), "id": doc.id} for doc in col_snapshot]
+            loop.call_soon_threadsafe(self._apply_snapshot, dishes, initial_sync)
+
+        try:
+            self._watch = self.menu_service.dishes_collection().on_snapshot(on_snapshot)
+            await asyncio.wait_for(initial_sync.wait(), timeout=settings.vector_cache_listener_timeout)
+            logger.info("menu_context_listener_started", version=self.version)
+        except Exception as e:
+            logger.error("menu_context_listener_failed", error=str(e))
+            self.close()
+            self.sync_mode = "ttl"
+            await asyncio.to_thread(self._refresh)
+
+    def _apply_snapshot(self, dishes: List[Dict[str, Any]], initial_sync: asyncio.Event) -> None:
+        self._install(dishes)
+        initial_sync.set()
+
+    def close(self) -> None:
+        """Stop the change listener, if one is running."""
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+    def get_info(self) -> Dict[str, Any]:
+        """Describe the current snapshot for monitoring."""
+        return {
+            "version": self.version,
+            "item_count": self.snapshot.item_count if self.snapshot else 0,
+            "languages": list(LABELS),
+            "sync_mode": self.sync_mode,
+            "loaded_at": self.snapshot.loaded_at if self.snapshot else None,
+            "checked_at": self.checked_at,
+            "read_at": self.read_at
+        }
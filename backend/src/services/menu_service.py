@@ -35,6 +35,14 @@ class MenuService:
         """Initialize the menu service."""
         self.db = firestore.client()
         
+    def restaurant_document(self):
+        """Reference to the restaurant document that owns the menu."""
+        return self.db.collection('restaurants').document('main')
+    
+    def dishes_collection(self):
+        """Reference to the menu's dishes collection."""
+        return self.restaurant_document().collection('dishes')
+        
     async def get_all_menu_items(self) -> Dict[str, List[Dict[str, Any]]]:
         """
         Fetch all menu items organized by category.
@@ -44,8 +52,7 @@ class MenuService:
         """
         try:
             # Get all dishes from Firebase
-            dishes_ref = self.db.collection('restaurants').document('main').collection('dishes')
-            docs = dishes_ref.stream()
+            docs = self.dishes_collection().stream()
             
             # Organize by category
             menu_by_category = {}
@@ -0,0 +1,75 @@
+"""Bounded LRU cache of document payloads for search-result hydration."""
+
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Tuple
+import structlog
+
+logger = structlog.get_logger()
+
+
+class PayloadCache:
+    """
+    Least-recently-used map from document id to text, metadata and timestamps.
+
+    The vector index keeps only ids and embeddings resident; the handful of
+    documents a search returns are looked up here and fetched from
+    Firestore on a miss.
+    """
+
+    def __init__(self, max_entries: int = 2000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, document_ids: Iterable[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        Look up several payloads at once.
+
+        Returns:
+            (payloads found, ids that missed)
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for document_id in document_ids:
+            payload = self._entries.get(document_id)
+            if payload is None:
+                missing.append(document_id)
+                continue
+            self._entries.move_to_end(document_id)
+            found[document_id] = payload
+
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    def put(self, document_id: str, payload: Dict[str, Any]) -> None:
+        """Store a payload, evicting the least recently used beyond the bound."""
+        self._entries[document_id] = payload
+        self._entries.move_to_end(document_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, document_id: str) -> None:
+        """Forget a payload after its document changed."""
+        self._entries.pop(document_id, None)
+
+    def clear(self) -> None:
+        """Drop every payload, e.g. after the index was rebuilt."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        total_requests = self.hits + self.misses
+        hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(hit_rate, 2),
+            "cache_size": len(self._entries),
+            "max_entries": self.max_entries
+        }
@@ -0,0 +1,201 @@
+"""Local routing of queries to retrieval or direct answers."""
+
+import asyncio
+import math
+import re
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+import numpy as np
+import structlog
+from src.config import settings
+from src.services.embeddings import EmbeddingService
+from src.services.query_analyzer import QueryAnalyzer
+from src.utils.quick_responses import GREETING_PATTERNS
+
+logger = structlog.get_logger()
+
+# Unambiguous cues decided without any model; checked in order
+RETRIEVE_PATTERNS = [
+    r"\bpeters?\b",
+    r"\b(cv|resume|résumé|experience|erfarenhet|skills?|kompetens|education|utbildning|projects?|projekt|contact|kontakt)\b",
+]
+SKIP_PATTERNS = GREETING_PATTERNS + [
+    r"^(thanks?|thank\s+you|tack)( så mycket)?[.!]*$",
+    r"\b(how\s+does\s+(this|the)\s+(ai|bot|chat|system)\s+work|hur\s+fungerar\s+(den här|denna)\s+(ai|bot|chatt))\b",
+]
+
+# Labelled examples the centroids are built from; extend from routing logs
+LABELLED_EXAMPLES: Dict[str, List[str]] = {
+    "retrieve": [
+        "How old are you?",
+        "Where do you live?",
+        "What's your experience?",
+        "What do you do for work?",
+        "What did you study?",
+        "Tell me about your projects",
+        "What are your qualifications?",
+        "How can I contact you?",
+        "What programming languages do you know?",
+        "Where did Peter work before?",
+        "Hur gammal är du?",
+        "Var bor du?",
+        "Vad har du för erfarenhet?",
+        "Vad har du studerat?",
+        "Berätta om dina projekt",
+        "Hur kontaktar jag dig?",
+    ],
+    "skip": [
+        "Hello",
+        "Hi there",
+        "Good morning",
+        "What is the capital of France?",
+        "Explain what a neural network is",
+        "How does this AI system work?",
+        "Can you help me write an email?",
+        "What is 15 times 12?",
+        "Hej",
+        "God morgon",
+        "Vad är huvudstaden i Norge?",
+        "Förklara vad maskininlärning är",
+    ],
+}
+
+
+@dataclass
+class RouteDecision:
+    """Whether to retrieve, how sure the router is, and what decided it."""
+    should_retrieve: bool
+    confidence: float
+    source: str
+    reason: str
+    query_embedding: Optional[List[float]] = None
+
+
+class QueryRouter:
+    """
+    Decides locally whether a query needs knowledge base retrieval.
+
+    Keyword rules settle clear cases without a model. Otherwise the query
+    embedding, which retrieval reuses, is compared with the centroids of
+    the labelled example queries; their embeddings are computed once and
+    come from the embedding cache afterwards. Only when the centroid
+    margin leaves confidence below ``threshold`` is the LLM classifier
+    asked. Every decision is logged with its source and confidence for
+    offline tuning of the rules, examples and threshold.
+    """
+
+    def __init__(
+        self,
+        analyzer: QueryAnalyzer,
+        embedding_service: EmbeddingService,
+        threshold: Optional[float] = None,
+        examples: Optional[Dict[str, List[str]]] = None
+    ):
+        self.analyzer = analyzer
+        self.embedding_service = embedding_service
+        self.threshold = settings.query_router_confidence if threshold is None else threshold
+        self.examples = examples or LABELLED_EXAMPLES
+        self.temperature = settings.query_router_temperature
+        self._retrieve_rules = [re.compile(pattern, re.IGNORECASE) for pattern in RETRIEVE_PATTERNS]
+        self._skip_rules = [re.compile(pattern, re.IGNORECASE) for pattern in SKIP_PATTERNS]
+        self._centroids: Optional[np.ndarray] = None
+        self._centroid_lock = asyncio.Lock()
+
+    def match_rules(self, query: str) -> Optional[RouteDecision]:
+        """Decide from keywords alone, or None when no rule applies."""
+        query_clean = query.lower().strip()
+        for rule in self._skip_rules:
+            if rule.search(query_clean):
+                return RouteDecision(False, 1.0, "rule", f"direct answer (rule {rule.pattern})")
+        for rule in self._retrieve_rules:
+            if rule.search(query_clean):
+                return RouteDecision(True, 1.0, "rule", f"retrieve (rule {rule.pattern})")
+        return None
+
+    async def _get_centroids(self) -> np.ndarray:
+        """Unit centroids of the [retrieve, skip] examples, built once."""
+        if self._centroids is None:
+            async with self._centroid_lock:
+                if self._centroids is None:
+                    centroids = []
+                    for label in ("retrieve", "skip"):
+                        vectors = np.asarray(
+                            await self.embedding_service.embed_texts(self.examples[label]),
+                            dtype=np.float32
+                        )
+                        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+                        centroid = vectors.mean(axis=0)
+                        centroids.append(centroid / max(np.linalg.norm(centroid), 1e-12))
+                    self._centroids = np.stack(centroids)
+        return self._centroids
+
+    def classify(self, centroids: np.ndarray, query_embedding: List[float]) -> RouteDecision:
+        """Nearest-centroid decision with a logistic confidence on the margin."""
+        vector = np.asarray(query_embedding, dtype=np.float32)
+        vector /= max(np.linalg.norm(vector), 1e-12)
+        retrieve_score, skip_score = (centroids @ vector).tolist()
+
+        margin = retrieve_score - skip_score
+        probability = 1 / (1 + math.exp(-margin / self.temperature))
+        should_retrieve = margin >= 0
+        return RouteDecision(
+            should_retrieve,
+            probability if should_retrieve else 1 - probability,
+            "centroid",
+            f"{'retrieve' if should_retrieve else 'direct answer'} (margin {margin:.3f})",
+            query_embedding
+        )
+
+    async def route(
+        self,
+        query: str,
+        embed: Optional[Callable[[str], Awaitable[List[float]]]] = None
+    ) -> RouteDecision:
+        """
+        Route a query, asking the LLM only when the local decision is unsure.
+
+        Args:
+            query: User query
+            embed: Embeds the query instead of the embedding service, e.g.
+                a request shared with speculative retrieval
+        """
+        start_time = time.perf_counter()
+
+        decision = self.match_rules(query)
+        if decision is None:
+            decision = await self._route_by_centroid(query, embed)
+
+        if decision.confidence < self.threshold:
+            should_retrieve, reason = await self.analyzer.requires_retrieval(query)
+            decision = RouteDecision(
+                should_retrieve,
+                decision.confidence,
+                "llm",
+                reason,
+                decision.query_embedding
+            )
+
+        logger.info(
+            "query_routed",
+            query=query[:100],
+            should_retrieve=decision.should_retrieve,
+            source=decision.source,
+            confidence=round(decision.confidence, 4),
+            reason=decision.reason,
+            route_time_ms=round((time.perf_counter() - start_time) * 1000, 3)
+        )
+        return decision
+
+    async def _route_by_centroid(
+        self,
+        query: str,
+        embed: Optional[Callable[[str], Awaitable[List[float]]]] = None
+    ) -> RouteDecision:
+        try:
+            centroids = await self._get_centroids()
+            query_embedding = await (embed or self.embedding_service.embed_text)(query)
+        except Exception as e:
+            logger.error("query_router_embedding_failed", error=str(e))
+            return RouteDecision(True, 0.0, "centroid", "embedding unavailable")
+        return self.classify(centroids, query_embedding)
@@ -0,0 +1,747 @@
+"""In-memory vector index backed by a contiguous embedding matrix."""
+
+from typing import List, Dict, Any, Optional, Set, Tuple, Union, Hashable
+import numpy as np
+import structlog
+from src.services.ann_index import IVFIndex
+from src.services.document_processor import DocumentProcessor
+from src.services.lexical_index import BM25Index
+
+logger = structlog.get_logger()
+
+
+class VectorIndex:
+    """
+    Row-aligned index of pre-normalized embeddings.
+
+    Row ``i`` of ``matrix`` belongs to ``ids[i]``, ``texts[i]`` and
+    ``metadata[i]``, so a query is a single matrix-vector product.
+
+    With quantization enabled, the coarse scan runs over a compact int8
+    (per-row scale) or float16 copy and only ``top_k * rerank_factor``
+    candidates are re-scored against the float32 rows.
+
+    Metadata values are kept in an inverted index (key -> value -> rows)
+    so filtered queries only score the matching rows.
+
+    After :meth:`drop_payloads` only ids, vectors and the filter/BM25
+    postings stay resident; results then carry just id and similarity
+    and the caller hydrates text and metadata for the winners.
+
+    An index wrapping a read-only (memory-mapped) matrix never copies
+    it: written rows go to a small heap overlay that is scored next to
+    the mapping until the next snapshot replaces the index.
+    """
+
+    QUANTIZATION_MODES = ("none", "float16", "int8")
+    SCAN_CHUNK_ROWS = 4096
+    # Upcast scratch small enough to stay in cache while it is multiplied
+    SCAN_CHUNK_BYTES = 256 * 1024
+
+    def __init__(self, dimension: int = 0):
+        self.dimension = dimension
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+        self.created_at: List[Any] = []
+        self.updated_at: List[Any] = []
+        self._buffer = np.zeros((0, dimension), dtype=np.float32)
+        # Rows written over a read-only buffer: row -> slot in _overlay
+        self._overlay = np.zeros((0, dimension), dtype=np.float32)
+        self._overlay_slots: Dict[int, int] = {}
+        self._overlay_free: List[int] = []
+        self._overlay_index: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._rows: Dict[str, int] = {}
+        self._filter_keys: List[Tuple[Tuple[str, Hashable], ...]] = []
+        self._postings: Dict[str, Dict[Any, Set[int]]] = {}
+        self.payloads_resident = True
+        self._lexical: Optional[BM25Index] = None
+        self.version = 0
+        self.quantization = "none"
+        self.rerank_factor = 4
+        # Quantized rows, row-aligned with _buffer and updated by each write
+        self._codes: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        # IVF structure kept in step with upserts and removals, if attached
+        self.ann: Optional[IVFIndex] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, document_id: str) -> bool:
+        return document_id in self._rows
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """
+        Live rows of the embedding buffer.
+
+        While a mapped index has overlay rows this is a merged heap copy,
+        so searches score through ``_score`` instead.
+        """
+        return self._slice(0, len(self.ids))
+
+    @staticmethod
+    def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+        """Scale rows to unit length in place, leaving zero rows untouched."""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+    @classmethod
+    def from_documents(cls, documents: List[Dict[str, Any]]) -> "VectorIndex":
+        """
+        Build an index from cached document dicts.
+
+        Args:
+            documents: Dicts with id, text, embedding, metadata and timestamps
+
+        Returns:
+            Populated index; documents whose embedding dimension differs
+            from the first document are skipped
+        """
+        dimension = len(documents[0]["embedding"]) if documents else 0
+        index = cls(dimension)
+
+        rows = []
+        for doc in documents:
+            if len(doc["embedding"]) != dimension:
+                logger.warning(
+                    "vector_index_dimension_mismatch",
+                    document_id=doc["id"],
+                    expected=dimension,
+                    actual=len(doc["embedding"])
+                )
+                continue
+
+            rows.append(doc["embedding"])
+            index.ids.append(doc["id"])
+            index.texts.append(doc["text"])
+            index.metadata.append(doc.get("metadata", {}))
+            index.created_at.append(doc.get("created_at"))
+            index.updated_at.append(doc.get("updated_at"))
+
+        if rows:
+            index._buffer = cls.normalize_rows(np.asarray(rows, dtype=np.float32))
+            index._rows = {doc_id: row for row, doc_id in enumerate(index.ids)}
+            index._build_postings()
+
+        return index
+
+    @classmethod
+    def from_arrays(
+        cls,
+        matrix: np.ndarray,
+        ids: List[str],
+        texts: List[str],
+        metadata: List[Dict[str, Any]],
+        created_at: List[Any],
+        updated_at: List[Any]
+    ) -> "VectorIndex":
+        """
+        Wrap an already normalized matrix without copying it.
+
+        The matrix may be a read-only memory map; writes then go to a heap
+        overlay and the mapping itself is never copied.
+        """
+        index = cls(matrix.shape[1])
+        index._buffer = matrix
+        index.ids = list(ids)
+        index.texts = list(texts)
+        index.metadata = list(metadata)
+        index.created_at = list(created_at)
+        index.updated_at = list(updated_at)
+        index._rows = {doc_id: row for row, doc_id in enumerate(index.ids)}
+        index._build_postings()
+        return index
+
+    @property
+    def has_lexical(self) -> bool:
+        """Whether BM25 search is available (payloads resident or kept)."""
+        return self.payloads_resident or self._lexical is not None
+
+    @property
+    def lexical(self) -> BM25Index:
+        """BM25 index over the row texts, built on first use and kept in sync."""
+        return self._ensure_lexical()
+
+    def _ensure_lexical(self) -> BM25Index:
+        """Build the BM25 index from the resident texts unless it exists."""
+        if self._lexical is None:
+            if not self.payloads_resident:
+                raise RuntimeError("BM25 index was not kept when payloads were dropped")
+            self._lexical = BM25Index()
+            for doc_id, text in zip(self.ids, self.texts):
+                self._lexical.add(doc_id, text)
+        return self._lexical
+
+    def drop_payloads(self, keep_lexical: bool = False) -> None:
+        """
+        Release text, metadata and timestamps, keeping ids and vectors.
+
+        Args:
+            keep_lexical: Build the BM25 index first so hybrid search
+                keeps working; its postings stay resident
+        """
+        if not self.payloads_resident:
+            return
+        if keep_lexical:
+            self._ensure_lexical()
+        self.texts, self.metadata, self.created_at, self.updated_at = [], [], [], []
+        self.payloads_resident = False
+
+    def _payload_columns(self) -> Tuple[List[Any], ...]:
+        """Per-row payload lists, or none once payloads were dropped."""
+        if not self.payloads_resident:
+            return ()
+        return (self.texts, self.metadata, self.created_at, self.updated_at)
+
+    def row_of(self, document_id: str) -> Optional[int]:
+        """Current row of a document, or None if it is not indexed."""
+        return self._rows.get(document_id)
+
+    @property
+    def is_memory_mapped(self) -> bool:
+        """True while rows are served from a shared read-only mapping."""
+        return not self._buffer.flags.writeable
+
+    @property
+    def overlay_rows(self) -> int:
+        """Rows served from the heap overlay instead of the mapping."""
+        return len(self._overlay_slots)
+
+    def _row(self, row: int) -> np.ndarray:
+        """Current vector of one row, preferring its overlay copy."""
+        slot = self._overlay_slots.get(row)
+        return self._buffer[row] if slot is None else self._overlay[slot]
+
+    def _slice(self, start: int, end: int) -> np.ndarray:
+        """Vectors of a row range (a view unless overlay rows are merged in)."""
+        if not self._overlay_slots:
+            return self._buffer[start:end]
+        return self._gather(np.arange(start, end))
+
+    def _gather(self, rows: np.ndarray) -> np.ndarray:
+        """Vectors of specific rows, taking overlay rows over mapped ones."""
+        if not self._overlay_slots:
+            return self._buffer[rows]
+
+        vectors = np.empty((len(rows), self.dimension), dtype=np.float32)
+        in_buffer = rows < self._buffer.shape[0]
+        vectors[in_buffer] = self._buffer[rows[in_buffer]]
+        patched, slots = self._overlay_lookup()
+        hit = np.isin(rows, patched)
+        vectors[hit] = self._overlay[slots[np.searchsorted(patched, rows[hit])]]
+        return vectors
+
+    def _overlay_lookup(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(sorted overlay rows, their slots), rebuilt after the overlay changes."""
+        if self._overlay_index is None:
+            items = sorted(self._overlay_slots.items())
+            self._overlay_index = (
+                np.array([row for row, _ in items], dtype=np.int64),
+                np.array([slot for _, slot in items], dtype=np.int64)
+            )
+        return self._overlay_index
+
+    def _write_row(self, row: int, vector: np.ndarray) -> None:
+        """Store a row in the buffer, or in the overlay while the buffer is mapped."""
+        if not self.is_memory_mapped:
+            self._buffer[row] = vector
+            return
+
+        slot = self._overlay_slots.get(row)
+        if slot is None:
+            if self._overlay_free:
+                slot = self._overlay_free.pop()
+            else:
+                slot = len(self._overlay_slots)
+                if slot == self._overlay.shape[0]:
+                    overlay = np.zeros((max(16, slot * 2), self.dimension), dtype=np.float32)
+                    overlay[:slot] = self._overlay
+                    self._overlay = overlay
+            self._overlay_slots[row] = slot
+            self._overlay_index = None
+        self._overlay[slot] = vector
+
+    def _drop_row(self, row: int) -> None:
+        """Forget the overlay copy of a row that is no longer live."""
+        slot = self._overlay_slots.pop(row, None)
+        if slot is not None:
+            self._overlay_free.append(slot)
+            self._overlay_index = None
+
+    def upsert(self, document: Dict[str, Any]) -> bool:
+        """
+        Insert a document or overwrite its existing row.
+
+        Args:
+            document: Dict with id, text, embedding, metadata and timestamps
+
+        Returns:
+            True if the document is now indexed
+        """
+        embedding = np.asarray(document["embedding"], dtype=np.float32)
+
+        if not self.ids and self.dimension == 0:
+            self.dimension = embedding.shape[0]
+            self._buffer = np.zeros((0, self.dimension), dtype=np.float32)
+            self._overlay = np.zeros((0, self.dimension), dtype=np.float32)
+
+        if embedding.shape[0] != self.dimension:
+            logger.warning(
+                "vector_index_dimension_mismatch",
+                document_id=document["id"],
+                expected=self.dimension,
+                actual=embedding.shape[0]
+            )
+            return False
+
+        row = self._rows.get(document["id"])
+        if row is None:
+            row = len(self.ids)
+            self._reserve(row + 1)
+            self._rows[document["id"]] = row
+            self.ids.append(document["id"])
+            self._filter_keys.append(())
+            for column in self._payload_columns():
+                column.append(None)
+
+        self._write_row(row, self.normalize_rows(embedding[None, :].copy())[0])
+        self._quantize_row(row)
+        self._unindex_metadata(row)
+        self._filter_keys[row] = tuple(DocumentProcessor.flatten_metadata(document.get("metadata", {})))
+        self._index_metadata(row)
+        if self._lexical is not None:
+            self._lexical.add(document["id"], document["text"])
+        if self.payloads_resident:
+            self.texts[row] = document["text"]
+            self.metadata[row] = document.get("metadata", {})
+            self.created_at[row] = document.get("created_at")
+            self.updated_at[row] = document.get("updated_at")
+        self.version += 1
+        if self.ann is not None:
+            self.ann.assign(row, self._row(row), self.version)
+        return True
+
+    def remove(self, document_id: str) -> bool:
+        """
+        Drop a document by moving the last row into its slot.
+
+        Returns:
+            True if the document was indexed
+        """
+        row = self._rows.pop(document_id, None)
+        if row is None:
+            return False
+
+        self._unindex_metadata(row)
+        if self._lexical is not None:
+            self._lexical.remove(document_id)
+
+        last = len(self.ids) - 1
+        if row != last:
+            self._unindex_metadata(last)
+            self._write_row(row, self._row(last))
+            if self._codes is not None:
+                self._codes[row] = self._codes[last]
+                if self._scales is not None:
+                    self._scales[row] = self._scales[last]
+            for column in (self.ids, self._filter_keys, *self._payload_columns()):
+                column[row] = column[last]
+            self._rows[self.ids[row]] = row
+            self._index_metadata(row)
+
+        for column in (self.ids, self._filter_keys, *self._payload_columns()):
+            column.pop()
+        self._drop_row(last)
+
+        self.version += 1
+        if self.ann is not None:
+            self.ann.remove(row, last, self.version)
+        return True
+
+    def _build_postings(self) -> None:
+        """Rebuild the metadata inverted index from scratch."""
+        self._filter_keys = [
+            tuple(DocumentProcessor.flatten_metadata(metadata)) for metadata in self.metadata
+        ]
+        self._postings = {}
+        for row in range(len(self.ids)):
+            self._index_metadata(row)
+
+    def _index_metadata(self, row: int) -> None:
+        for key, value in self._filter_keys[row]:
+            self._postings.setdefault(key, {}).setdefault(value, set()).add(row)
+
+    def _unindex_metadata(self, row: int) -> None:
+        for key, value in self._filter_keys[row]:
+            rows = self._postings.get(key, {}).get(value)
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    del self._postings[key][value]
+
+    def filter_rows(self, filters: Dict[str, Any]) -> np.ndarray:
+        """
+        Resolve metadata equality filters to a sorted row subset.
+
+        Args:
+            filters: Metadata key (dotted for nested) to a value or list of
+                accepted values; all keys must match
+
+        Returns:
+            Sorted row numbers matching every filter
+        """
+        matched: Optional[Set[int]] = None
+        for key, expected in filters.items():
+            options = expected if isinstance(expected, (list, tuple, set)) else [expected]
+            postings = self._postings.get(key, {})
+
+            rows: Set[int] = set()
+            for option in options:
+                rows |= postings.get(option, set())
+
+            matched = rows if matched is None else matched & rows
+            if not matched:
+                break
+
+        return np.array(sorted(matched or ()), dtype=np.int64)
+
+    def _reserve(self, size: int) -> None:
+        """Grow the embedding buffer geometrically to hold ``size`` rows."""
+        capacity = self._buffer.shape[0]
+        if size <= capacity or self.is_memory_mapped:
+            # Rows past a read-only mapping live in the overlay
+            return
+
+        buffer = np.zeros((max(size, capacity * 2, 16), self.dimension), dtype=np.float32)
+        buffer[:len(self.ids)] = self.matrix
+        self._buffer = buffer
+
+    def set_quantization(self, mode: str, rerank_factor: int = 4) -> None:
+        """
+        Choose the representation used for the coarse scan.
+
+        Args:
+            mode: "none", "float16" or "int8"; float16 only saves memory,
+                since NumPy converts it too slowly to scan faster than float32
+            rerank_factor: Candidates re-scored in full precision per result
+        """
+        if mode not in self.QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization mode: {mode}")
+
+        self.quantization = mode
+        self.rerank_factor = max(1, rerank_factor)
+        self._codes = None
+        self._scales = None
+
+    def _encode(self, vectors: np.ndarray, codes: np.ndarray, scales: Optional[np.ndarray]) -> None:
+        """Quantize unit rows into ``codes`` (and int8 ``scales``) in place."""
+        if scales is None:
+            codes[:] = vectors
+            return
+
+        scales[:] = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        np.rint(vectors / scales[:, None], out=codes, casting="unsafe")
+
+    def _quantized(self) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Return (codes, per-row scales) for the live rows, encoding them on first use."""
+        if self._codes is None:
+            capacity = max(self._buffer.shape[0], len(self.ids))
+            dtype = np.float16 if self.quantization == "float16" else np.int8
+            self._codes = np.empty((capacity, self.dimension), dtype=dtype)
+            self._scales = np.empty(capacity, dtype=np.float32) if dtype == np.int8 else None
+            for start in range(0, len(self.ids), self.SCAN_CHUNK_ROWS):
+                end = min(start + self.SCAN_CHUNK_ROWS, len(self.ids))
+                self._encode(
+                    self._slice(start, end),
+                    self._codes[start:end],
+                    self._scales[start:end] if self._scales is not None else None
+                )
+
+        count = len(self.ids)
+        return self._codes[:count], self._scales[:count] if self._scales is not None else None
+
+    def _quantize_row(self, row: int) -> None:
+        """Re-encode one written row, growing the codes along with the buffer."""
+        if self._codes is None:
+            return
+
+        if row >= self._codes.shape[0]:
+            capacity = max(self._buffer.shape[0], row + 1, self._codes.shape[0] * 2)
+            codes = np.empty((capacity, self.dimension), dtype=self._codes.dtype)
+            codes[:self._codes.shape[0]] = self._codes
+            self._codes = codes
+            if self._scales is not None:
+                scales = np.empty(capacity, dtype=np.float32)
+                scales[:self._scales.shape[0]] = self._scales
+                self._scales = scales
+
+        self._encode(
+            self._row(row)[None, :],
+            self._codes[row:row + 1],
+            self._scales[row:row + 1] if self._scales is not None else None
+        )
+
+    def _coarse_scores(self, query: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        """Approximate scores from the quantized codes, scanned in chunks."""
+        codes, scales = self._quantized()
+        count = codes.shape[0] if rows is None else rows.shape[0]
+
+        # NumPy has no BLAS kernel for int8/float16, so each chunk is
+        # upcast into one reused, cache-sized float32 scratch buffer
+        chunk_rows = max(1, self.SCAN_CHUNK_BYTES // (4 * max(self.dimension, 1)))
+        scratch = np.empty((min(chunk_rows, count), self.dimension), dtype=np.float32)
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, chunk_rows):
+            end = min(start + chunk_rows, count)
+            chunk = scratch[:end - start]
+            block = codes[start:end] if rows is None else codes[rows[start:end]]
+            np.copyto(chunk, block, casting="unsafe")
+            np.dot(chunk, query, out=scores[start:end])
+
+        if scales is not None:
+            scores *= scales if rows is None else scales[rows]
+        return scores
+
+    def _rerank_candidates(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        rows: Optional[np.ndarray]
+    ) -> np.ndarray:
+        """Pick the rows worth re-scoring in full precision."""
+        scores = self._coarse_scores(query, rows)
+        limit = top_k * self.rerank_factor
+
+        if scores.shape[0] > limit:
+            positions = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            positions = np.arange(scores.shape[0])
+
+        candidates = positions if rows is None else rows[positions]
+        return np.sort(candidates)
+
+    def _prepare_query(
+        self,
+        query_embedding: Union[List[float], np.ndarray]
+    ) -> Optional[np.ndarray]:
+        """Convert a query to a unit float32 vector, or None if it is all zeros."""
+        query = np.asarray(query_embedding, dtype=np.float32)
+
+        if query.shape[0] != self.dimension:
+            raise ValueError(
+                f"Query dimension {query.shape[0]} does not match index "
+                f"dimension {self.dimension}"
+            )
+
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+
+        return query / norm
+
+    def _score(self, queries: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Dot products of one query (or a batch) with the live rows or a subset.
+
+        Mapped rows are scored in place and overlay rows patched in after,
+        so a written index still scans the shared mapping directly.
+        """
+        if rows is not None:
+            return queries @ self._gather(rows).T
+        if not self._overlay_slots:
+            return queries @ self.matrix.T
+
+        count = len(self.ids)
+        mapped = min(count, self._buffer.shape[0])
+        scores = np.empty(queries.shape[:-1] + (count,), dtype=np.float32)
+        scores[..., :mapped] = queries @ self._buffer[:mapped].T
+        patched, slots = self._overlay_lookup()
+        scores[..., patched] = queries @ self._overlay[slots].T
+        return scores
+
+    @staticmethod
+    def select_top_k(
+        scores: np.ndarray,
+        top_k: int,
+        threshold: float
+    ) -> List[Tuple[int, float]]:
+        """
+        Pick the best rows above a threshold without sorting every score.
+
+        Ties are broken by ascending row number, which matches a stable
+        descending sort over the documents in load order.
+
+        Returns:
+            (row, score) pairs ordered by descending score
+        """
+        candidates = np.flatnonzero(scores >= threshold)
+
+        if candidates.size > top_k:
+            candidate_scores = scores[candidates]
+            kth = np.partition(candidate_scores, -top_k)[-top_k]
+            above = candidates[candidate_scores > kth]
+            tied = candidates[candidate_scores == kth][:top_k - above.size]
+            candidates = np.concatenate([above, tied])
+
+        order = np.lexsort((candidates, -scores[candidates]))
+        return [(int(row), float(scores[row])) for row in candidates[order]]
+
+    def search(
+        self,
+        query_embedding: Union[List[float], np.ndarray],
+        top_k: int,
+        threshold: float,
+        rows: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Score rows against the query with one matrix-vector product.
+
+        Args:
+            query_embedding: Query vector (need not be normalized)
+            top_k: Maximum results to return
+            threshold: Minimum cosine similarity
+            rows: Sorted subset of rows to score (default: every row)
+
+        Returns:
+            (row, similarity) pairs ordered by descending similarity
+        """
+        if not self.ids:
+            return []
+
+        query = self._prepare_query(query_embedding)
+        if query is None:
+            return []
+
+        if self.quantization != "none":
+            rows = self._rerank_candidates(query, top_k, rows)
+
+        scores = self._score(query, rows)
+        np.clip(scores, 0.0, 1.0, out=scores)
+
+        selected = self.select_top_k(scores, top_k, threshold)
+        if rows is None:
+            return selected
+        return [(int(rows[position]), score) for position, score in selected]
+
+    def score_rows(
+        self,
+        query_embedding: Union[List[float], np.ndarray],
+        rows: List[int]
+    ) -> np.ndarray:
+        """Exact cosine similarity of the query against specific rows."""
+        query = self._prepare_query(query_embedding)
+        if query is None or not rows:
+            return np.zeros(len(rows), dtype=np.float32)
+
+        scores = self._gather(np.asarray(rows, dtype=np.int64)) @ query
+        return np.clip(scores, 0.0, 1.0)
+
+    def search_many(
+        self,
+        query_embeddings: Union[List[List[float]], np.ndarray],
+        top_k: int,
+        threshold: float,
+        rows: Optional[np.ndarray] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Score a batch of queries with one matrix-matrix product.
+
+        Args:
+            query_embeddings: One query vector per row
+            top_k: Maximum results per query
+            threshold: Minimum cosine similarity
+            rows: Sorted subset of rows to score (default: every row)
+
+        Returns:
+            Per-query lists of (row, similarity) pairs
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if not self.ids or queries.shape[0] == 0:
+            return [[] for _ in range(queries.shape[0])]
+
+        if queries.shape[1] != self.dimension:
+            raise ValueError(
+                f"Query dimension {queries.shape[1]} does not match index "
+                f"dimension {self.dimension}"
+            )
+
+        # Quantized search re-ranks a different candidate set per query
+        if self.quantization != "none":
+            return [self.search(query, top_k, threshold, rows=rows) for query in queries]
+
+        norms = np.linalg.norm(queries, axis=1)
+        queries = self.normalize_rows(queries)
+
+        scores = self._score(queries, rows)
+        np.clip(scores, 0.0, 1.0, out=scores)
+
+        results = []
+        for position in range(queries.shape[0]):
+            selected = self.select_top_k(scores[position], top_k, threshold) if norms[position] > 0 else []
+            if rows is not None:
+                selected = [(int(rows[column]), score) for column, score in selected]
+            results.append(selected)
+        return results
+
+    def to_result(self, row: int, similarity: float) -> Dict[str, Any]:
+        """Format an index row as a search result (id and similarity only without payloads)."""
+        if not self.payloads_resident:
+            return {"id": self.ids[row], "similarity": similarity}
+        return {
+            "id": self.ids[row],
+            "text": self.texts[row],
+            "metadata": self.metadata[row],
+            "similarity": similarity,
+            "created_at": self.created_at[row],
+            "updated_at": self.updated_at[row]
+        }
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the embedding buffer (shared when mapped) and overlay."""
+        return int(self._buffer.nbytes + self._overlay.nbytes)
+
+    def quantized_bytes(self) -> int:
+        """Bytes held by the quantized codes and scales."""
+        if self._codes is None:
+            return 0
+        scales = self._scales.nbytes if self._scales is not None else 0
+        return int(self._codes.nbytes + scales)
+
+    def measure_recall(
+        self,
+        top_k: int = 10,
+        sample_size: int = 100,
+        seed: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Compare quantized search against the exact scan.
+
+        Sampled rows are used as queries; recall is the fraction of the
+        exact top-k that the quantized search also returns. The index is
+        only read, so this can run in a worker thread beside searches.
+        """
+        if not self.ids or self.quantization == "none":
+            return {"quantization": self.quantization, "recall": 1.0, "queries": 0}
+
+        count = len(self.ids)
+        rng = np.random.default_rng(seed)
+        queries = rng.choice(count, min(sample_size, count), replace=False)
+
+        hits = 0
+        for row in queries:
+            query = np.array(self._row(row))
+            approximate = {r for r, _ in self.search(query, top_k, 0.0)}
+            exact = {r for r, _ in self.select_top_k(np.clip(self._score(query), 0.0, 1.0), top_k, 0.0)}
+            hits += len(approximate & exact) / max(len(exact), 1)
+
+        return {
+            "quantization": self.quantization,
+            "rerank_factor": self.rerank_factor,
+            "top_k": top_k,
+            "queries": len(queries),
+            "recall": round(hits / len(queries), 4)
+        }
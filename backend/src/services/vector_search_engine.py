@@ -1,9 +1,15 @@
 """Vector search engine for semantic similarity operations."""
 
-from typing import List, Dict, Any
+import asyncio
+import math
+from typing import List, Dict, Any, Optional, Tuple, Union
+import numpy as np
 import structlog
+from src.config import settings
 from src.services.embeddings import EmbeddingService
 from src.services.document_processor import DocumentProcessor
+from src.services.vector_index import VectorIndex
+from src.services.ann_index import IVFIndex
 
 logger = structlog.get_logger()
 
@@ -11,16 +17,176 @@ logger = structlog.get_logger()
 class VectorSearchEngine:
     """High-performance vector similarity search engine."""
     
-    def __init__(self, embedding_service: EmbeddingService):
+    BACKENDS = ("exact", "ivf")
+    
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        backend: Optional[str] = None,
+        nprobe: Optional[int] = None
+    ):
         self.embedding_service = embedding_service
         self.processor = DocumentProcessor()
+        self.backend = backend or settings.vector_search_backend
+        self.nprobe = nprobe or settings.ann_nprobe
+        
+        if self.backend not in self.BACKENDS:
+            raise ValueError(f"Unknown vector search backend: {self.backend}")
+        
+        self._ann_build_task: Optional[asyncio.Task] = None
+    
+    async def search_index(
+        self,
+        index: VectorIndex,
+        query_embedding: Union[List[float], np.ndarray],
+        top_k: int,
+        threshold: float,
+        rows: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Search a resident index with the configured backend.
+        
+        Corpora (or filtered row subsets) below ``ann_min_corpus_size``
+        are always scanned exactly. While the ANN structure is missing or
+        out of step with the index, the exact scan answers and a rebuild
+        runs in the background. Index writes keep an attached structure in
+        step incrementally; it is retrained in the background only once
+        enough rows changed or the centroids drifted, and serves meanwhile.
+        
+        Args:
+            rows: Optional sorted row subset, e.g. from a metadata filter
+        
+        Returns:
+            (row, similarity) pairs ordered by descending similarity
+        """
+        candidate_count = len(index) if rows is None else len(rows)
+        if self.backend == "exact" or candidate_count < settings.ann_min_corpus_size:
+            return index.search(query_embedding, top_k, threshold, rows=rows)
+        
+        ann = index.ann
+        if ann is None or ann.version != index.version:
+            self._schedule_ann_build(index)
+            return index.search(query_embedding, top_k, threshold, rows=rows)
+        
+        reason = ann.retrain_reason(settings.ann_retrain_changed_fraction, settings.ann_retrain_drift)
+        if reason is not None:
+            self._schedule_ann_build(index, reason)
+        
+        candidates = ann.candidate_rows(np.asarray(query_embedding, dtype=np.float32), self.nprobe)
+        if rows is not None:
+            candidates = np.intersect1d(candidates, rows, assume_unique=True)
+        return index.search(query_embedding, top_k, threshold, rows=candidates)
+    
+    async def search_index_many(
+        self,
+        index: VectorIndex,
+        query_embeddings: List[List[float]],
+        top_k: int,
+        threshold: float,
+        rows: Optional[np.ndarray] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Search a resident index for a batch of queries.
+        
+        The exact backend scores the whole batch with one matrix product;
+        the ANN backend probes its buckets per query.
+        """
+        candidate_count = len(index) if rows is None else len(rows)
+        if self.backend == "exact" or candidate_count < settings.ann_min_corpus_size:
+            return index.search_many(query_embeddings, top_k, threshold, rows=rows)
+        
+        return [
+            await self.search_index(index, query_embedding, top_k, threshold, rows=rows)
+            for query_embedding in query_embeddings
+        ]
+    
+    def _schedule_ann_build(self, index: VectorIndex, reason: str = "missing") -> None:
+        """Start a background ANN build unless one is already running."""
+        if self._ann_build_task is not None and not self._ann_build_task.done():
+            return
+        if index.ann is not None:
+            logger.info("ann_index_retrain_scheduled", reason=reason, **index.ann.stats())
+        self._ann_build_task = asyncio.create_task(self._build_ann(index, reason))
+    
+    async def _build_ann(self, index: VectorIndex, reason: str = "missing") -> None:
+        """Train the IVF structure off the event loop and attach it to the index."""
+        try:
+            version = index.version
+            nlist = settings.ann_nlist or int(math.sqrt(len(index)))
+            
+            ann = await asyncio.to_thread(IVFIndex.build, index.matrix, nlist, version)
+            
+            # Rows written during training may be bucketed wrongly; keep the
+            # previous structure (if any) and try again on a later search
+            if index.version != version:
+                logger.info("ann_index_build_outdated", built_version=version, index_version=index.version)
+                return
+            index.ann = ann
+            
+            logger.info(
+                "ann_index_built",
+                backend=self.backend,
+                reason=reason,
+                nlist=ann.nlist,
+                nprobe=self.nprobe,
+                document_count=len(index),
+                index_version=version
+            )
+            
+        except Exception as e:
+            logger.error("ann_index_build_failed", error=str(e))
+    
+    async def rank_documents(
+        self,
+        query: str,
+        documents: List[Tuple[str, Dict[str, Any]]],
+        top_k: int,
+        threshold: float,
+        filters: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank (id, data) pairs that need only carry embeddings and metadata.
+        
+        Args:
+            query: Search query text
+            documents: Document ids with (possibly projected) data
+            top_k: Maximum results to return
+            threshold: Minimum similarity threshold
+            filters: Optional metadata equality filters
+            query_embedding: Embedding of ``query`` if already computed
+        
+        Returns:
+            (document id, similarity) pairs ordered by descending similarity
+        """
+        if query_embedding is None:
+            query_embedding = await self.embedding_service.embed_text(query)
+        
+        entries = []
+        for doc_id, doc_data in documents:
+            if not self.processor.matches_filters(doc_data.get("metadata", {}), filters):
+                continue
+            
+            doc_embedding = self.processor.extract_embedding(doc_data)
+            
+            if doc_embedding is not None:
+                entries.append({"id": doc_id, "text": "", "embedding": doc_embedding})
+        
+        # One matrix product over the batch instead of a per-document loop
+        index = VectorIndex.from_documents(entries)
+        return [
+            (index.ids[row], similarity)
+            for row, similarity in index.search(query_embedding, top_k, threshold)
+        ]
     
     async def execute_similarity_search(
         self,
         query: str,
         documents: List[Dict[str, Any]],
         top_k: int,
-        threshold: float
+        threshold: float,
+        filters: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Execute semantic similarity search against document collection.
@@ -30,37 +196,22 @@ class VectorSearchEngine:
             documents: Collection of documents with embeddings
             top_k: Maximum results to return
             threshold: Minimum similarity threshold
+            filters: Optional metadata equality filters
+            query_embedding: Embedding of ``query`` if already computed
         
         Returns:
             Ranked list of similar documents with scores
         """
         try:
-          
-            query_embedding = await self.embedding_service.embed_text(query)
-            
-            results = []
-            processed_count = 0
-            
-            for doc_id, doc_data in documents:
-                processed_count += 1
-                
-                doc_embedding = self.processor.extract_embedding(doc_data)
-                
-                if doc_embedding:
-                    similarity = self.embedding_service.calculate_similarity(
-                        query_embedding, doc_embedding
-                    )
-                    
-                    if similarity >= threshold:
-                        result = self.processor.format_search_result(
-                            doc_id, doc_data, similarity
-                        )
-                        results.append(result)
-            
-            results.sort(key=lambda x: x["similarity"], reverse=True)
-            results = results[:top_k]
+            doc_lookup = dict(documents)
+            results = [
+                self.processor.format_search_result(doc_id, doc_lookup[doc_id], similarity)
+                for doc_id, similarity in await self.rank_documents(
+                    query, documents, top_k, threshold, filters, query_embedding
+                )
+            ]
             
-            self._log_search_metrics(query, results, processed_count)
+            self.log_search_metrics(query, results, len(documents))
             
             return results
             
@@ -68,7 +219,7 @@ class VectorSearchEngine:
             logger.error("similarity_search_failed", error=str(e), query=query[:100])
             raise
     
-    def _log_search_metrics(
+    def log_search_metrics(
         self, 
         query: str, 
         results: List[Dict[str, Any]], 
@@ -0,0 +1,176 @@
+"""Versioned on-disk snapshots of the vector index shared between workers."""
+
+import fcntl
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+import numpy as np
+import structlog
+from src.services.vector_index import VectorIndex
+
+logger = structlog.get_logger()
+
+
+class VectorSnapshotStore:
+    """
+    Publishes the index as ``<version>/vectors.npy`` plus a row table.
+
+    Workers open the published matrix read-only with ``np.memmap`` so the
+    page cache holds one copy of the embeddings per machine. ``CURRENT``
+    names the live version and is swapped atomically with ``os.replace``.
+    """
+
+    CURRENT_FILE = "CURRENT"
+    LOCK_FILE = ".lock"
+    VECTORS_FILE = "vectors.npy"
+    ROWS_FILE = "rows.json"
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, directory: str, keep_versions: int = 2):
+        self.directory = Path(directory)
+        self.keep_versions = keep_versions
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def current_version(self) -> Optional[str]:
+        """Name of the published version, or None if nothing is published."""
+        try:
+            return (self.directory / self.CURRENT_FILE).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def read_manifest(self, version: str) -> Dict[str, Any]:
+        """Read the manifest written alongside a version."""
+        return json.loads((self.directory / version / self.MANIFEST_FILE).read_text())
+
+    @contextmanager
+    def publisher_lock(self, blocking: bool = False) -> Iterator[bool]:
+        """
+        Elect a single publisher across worker processes.
+
+        Yields:
+            True if this process holds the lock
+        """
+        with open(self.directory / self.LOCK_FILE, "w") as lock_file:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(lock_file, flags)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def publish(self, index: VectorIndex) -> str:
+        """
+        Write the index as a new version and make it current.
+
+        Returns:
+            The published version name
+        """
+        if not index.payloads_resident:
+            raise ValueError("Cannot publish an index whose payloads were dropped")
+
+        version = f"{int(time.time() * 1000)}-{os.getpid()}"
+        staging = self.directory / f".staging-{version}"
+        pointer = self.directory / f".{self.CURRENT_FILE}.{version}"
+        try:
+            staging.mkdir()
+            np.save(staging / self.VECTORS_FILE, np.ascontiguousarray(index.matrix, dtype=np.float32))
+
+            # Row i of vectors.npy belongs to rows[i]
+            rows = [
+                {
+                    "id": index.ids[row],
+                    "text": index.texts[row],
+                    "metadata": index.metadata[row],
+                    "created_at": self._encode_timestamp(index.created_at[row]),
+                    "updated_at": self._encode_timestamp(index.updated_at[row])
+                }
+                for row in range(len(index))
+            ]
+            (staging / self.ROWS_FILE).write_text(json.dumps(rows, default=str))
+            (staging / self.MANIFEST_FILE).write_text(json.dumps({
+                "version": version,
+                "published_at": time.time(),
+                "document_count": len(index),
+                "dimension": index.dimension
+            }))
+
+            staging.rename(self.directory / version)
+
+            pointer.write_text(version)
+            os.replace(pointer, self.directory / self.CURRENT_FILE)
+        finally:
+            # _prune skips dot-prefixed names, so a failed write (e.g. a
+            # full /dev/shm) must not leave its partial copy behind
+            shutil.rmtree(staging, ignore_errors=True)
+            pointer.unlink(missing_ok=True)
+
+        self._prune(version)
+
+        logger.info(
+            "vector_snapshot_published",
+            version=version,
+            document_count=len(index),
+            directory=str(self.directory)
+        )
+        return version
+
+    def load(self, version: Optional[str] = None) -> Tuple[str, VectorIndex]:
+        """
+        Open a published version with the matrix memory-mapped read-only.
+
+        Returns:
+            (version, index) for the requested or current version
+        """
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"No vector snapshot published in {self.directory}")
+
+        path = self.directory / version
+        matrix = np.load(path / self.VECTORS_FILE, mmap_mode="r")
+        rows = json.loads((path / self.ROWS_FILE).read_text())
+
+        index = VectorIndex.from_arrays(
+            matrix,
+            ids=[row["id"] for row in rows],
+            texts=[row["text"] for row in rows],
+            metadata=[row["metadata"] for row in rows],
+            created_at=[self._decode_timestamp(row["created_at"]) for row in rows],
+            updated_at=[self._decode_timestamp(row["updated_at"]) for row in rows]
+        )
+
+        logger.info("vector_snapshot_loaded", version=version, document_count=len(index))
+        return version, index
+
+    def _prune(self, current: str) -> None:
+        """Delete all but the newest versions; mapped files stay valid after unlink."""
+        versions = sorted(
+            (p for p in self.directory.iterdir() if p.is_dir() and not p.name.startswith(".")),
+            key=lambda p: p.name
+        )
+        for path in versions[:-self.keep_versions]:
+            if path.name != current:
+                shutil.rmtree(path, ignore_errors=True)
+
+    @staticmethod
+    def _encode_timestamp(value: Any) -> Optional[str]:
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _decode_timestamp(value: Optional[str]) -> Any:
+        if not value:
+            return value
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return value
@@ -0,0 +1,21 @@
+"""Shared fixtures for the unit tests.
+
+The settings object is created at import time and requires credentials,
+so placeholder values are provided before anything from ``src`` loads.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+for name, value in {
+    "OPENAI_API_KEY": "test-key",
+    "FIREBASE_PROJECT_ID": "test-project",
+    "FIREBASE_PRIVATE_KEY": "test-private-key",
+    "FIREBASE_CLIENT_EMAIL": "test@example.com",
+    "API_KEY": "test-api-key",
+    "EMBEDDING_CACHE_PATH": "",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,81 @@
+"""In-memory stand-ins for Firestore objects used by the unit tests."""
+
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+
+
+class FakeSnapshot:
+    """A document snapshot holding a copy of its data."""
+
+    def __init__(self, doc_id: str, data: Optional[Dict[str, Any]]):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeQuery:
+    def __init__(self, results: List[FakeSnapshot]):
+        self._results = results
+
+    def stream(self):
+        return iter(self._results)
+
+
+class FakeVectorCollection:
+    """
+    Collection that supports ``select`` and ``find_nearest``.
+
+    Scores exactly with NumPy so FirestoreVectorSearch can be exercised
+    without a Firestore vector index.
+    """
+
+    def __init__(self, documents: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.documents = dict(documents or {})
+        self._fields: Optional[List[str]] = None
+
+    def select(self, field_paths: List[str]) -> "FakeVectorCollection":
+        projected = type(self)()
+        projected.documents = self.documents
+        projected._fields = list(field_paths)
+        return projected
+
+    def _project(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if self._fields is None:
+            return dict(data)
+        return {field: data[field] for field in self._fields if field in data}
+
+    def stream(self):
+        return iter([
+            FakeSnapshot(doc_id, self._project(data)) for doc_id, data in self.documents.items()
+        ])
+
+    def find_nearest(
+        self,
+        vector_field: str,
+        query_vector: Sequence[float],
+        distance_measure: Any,
+        limit: int,
+        distance_result_field: Optional[str] = None
+    ) -> FakeQuery:
+        query = np.asarray(list(query_vector), dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+
+        scored = []
+        for doc_id, data in self.documents.items():
+            if data.get(vector_field) is None:
+                continue
+            vector = np.asarray(list(data[vector_field]), dtype=np.float32)
+            distance = 1.0 - float(vector @ query) / (float(np.linalg.norm(vector)) or 1.0)
+            scored.append((distance, doc_id))
+        scored.sort()
+
+        results = []
+        for distance, doc_id in scored[:limit]:
+            data = self._project(self.documents[doc_id])
+            if distance_result_field:
+                data[distance_result_field] = distance
+            results.append(FakeSnapshot(doc_id, data))
+        return FakeQuery(results)
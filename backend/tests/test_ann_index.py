@@ -0,0 +1,106 @@
+"""Tests for the IVF structure and its incremental maintenance."""
+
+import asyncio
+import numpy as np
+from src.config import settings
+from src.services.ann_index import IVFIndex
+from src.services.embeddings import EmbeddingService
+from src.services.embedding_providers import HashedNgramEmbeddingProvider
+from src.services.vector_index import VectorIndex
+from src.services.vector_search_engine import VectorSearchEngine
+
+
+def clustered(count=600, clusters=12, dimension=32, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dimension))
+    vectors = centres[rng.integers(0, clusters, count)] + 0.1 * rng.normal(size=(count, dimension))
+    return VectorIndex.normalize_rows(vectors.astype(np.float32))
+
+
+def make_index(vectors):
+    return VectorIndex.from_documents([
+        {"id": f"doc-{row}", "text": "", "embedding": vector, "metadata": {}}
+        for row, vector in enumerate(vectors)
+    ])
+
+
+def exact_top_k(matrix, query, top_k):
+    return set(np.argsort(-(matrix @ query))[:top_k].tolist())
+
+
+def test_candidate_recall():
+    matrix = clustered()
+    ann = IVFIndex.build(matrix, nlist=12, version=0)
+
+    recall = np.mean([
+        len(exact_top_k(matrix, matrix[row], 10) & set(ann.candidate_rows(matrix[row], 3).tolist())) / 10
+        for row in range(0, len(matrix), 20)
+    ])
+
+    assert recall >= 0.95
+
+
+def test_buckets_cover_every_row_once():
+    matrix = clustered()
+    ann = IVFIndex.build(matrix, nlist=12, version=0)
+
+    rows = ann.candidate_rows(matrix[0], ann.nlist)
+
+    assert rows.tolist() == list(range(len(matrix)))
+
+
+def test_incremental_updates_follow_swap_remove():
+    vectors = clustered()
+    index = make_index(vectors[:500])
+    index.ann = IVFIndex.build(index.matrix, nlist=12, version=index.version)
+
+    for row in range(500, 600):
+        index.upsert({"id": f"doc-{row}", "text": "", "embedding": vectors[row]})
+    for row in range(0, 100, 3):
+        index.remove(f"doc-{row}")
+    index.upsert({"id": "doc-1", "text": "", "embedding": vectors[599]})
+
+    ann = index.ann
+    assert ann.version == index.version
+    assert len(ann.labels) == len(index)
+    assert ann.candidate_rows(vectors[0], ann.nlist).tolist() == list(range(len(index)))
+    expected = np.argmax(index.matrix @ ann.centroids.T, axis=1).tolist()
+    assert ann.labels == expected
+
+
+def test_retrain_reasons():
+    matrix = clustered()
+    ann = IVFIndex.build(matrix[:500], nlist=12, version=0)
+    assert ann.retrain_reason(0.2, 0.05) is None
+
+    for row in range(500, 600):
+        ann.assign(row, matrix[row], row)
+    assert ann.retrain_reason(0.2, 0.05) is None
+    assert ann.retrain_reason(0.1, 0.05) == "changed_rows"
+
+    # Rows far from every centroid show up as drift
+    noise = VectorIndex.normalize_rows(np.random.default_rng(1).normal(size=(5, 32)).astype(np.float32))
+    for offset, vector in enumerate(noise):
+        ann.assign(600 + offset, vector, 600 + offset)
+    assert ann.retrain_reason(1.0, 0.05) == "centroid_drift"
+
+
+async def test_writes_do_not_force_a_rebuild(monkeypatch):
+    monkeypatch.setattr(settings, "ann_min_corpus_size", 100)
+    vectors = clustered()
+    index = make_index(vectors[:500])
+    engine = VectorSearchEngine(
+        EmbeddingService(provider=HashedNgramEmbeddingProvider(dimension=32)), backend="ivf", nprobe=4
+    )
+
+    await engine.search_index(index, vectors[0], 5, 0.0)
+    await engine._ann_build_task
+    ann = index.ann
+    assert ann is not None
+
+    index.upsert({"id": "doc-500", "text": "", "embedding": vectors[500]})
+    results = await engine.search_index(index, vectors[500], 1, 0.0)
+
+    assert index.ann is ann
+    assert engine._ann_build_task.done()
+    assert results[0][0] == index.row_of("doc-500")
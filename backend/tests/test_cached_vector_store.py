@@ -0,0 +1,324 @@
+"""Tests for the cached vector store over a fake Firestore collection."""
+
+import asyncio
+import threading
+import time
+import pytest
+from src.config import settings
+from src.services import cached_vector_store
+from src.services.cached_vector_store import CachedVectorStore
+from src.services.document_processor import DocumentProcessor
+from src.services.embedding_providers import HashedNgramEmbeddingProvider
+from src.services.embeddings import EmbeddingService
+from src.services.vector_index import VectorIndex
+from fakes import FakeSnapshot, FakeVectorCollection
+
+PROVIDER = HashedNgramEmbeddingProvider(dimension=256)
+
+MENU = {
+    "margherita": ("Margherita pizza with tomato, mozzarella and basil", "pizza"),
+    "pepperoni": ("Pepperoni pizza with spicy salami and mozzarella", "pizza"),
+    "tiramisu": ("Tiramisu dessert with mascarpone and espresso", "dessert"),
+    "lemonade": ("Homemade lemonade with fresh lemons and mint", "drinks"),
+    "espresso": ("Double espresso from freshly ground beans", "drinks"),
+}
+
+
+class FakeDocumentReference:
+    def __init__(self, documents, document_id):
+        self.documents = documents
+        self.document_id = document_id
+
+    def get(self):
+        return FakeSnapshot(self.document_id, self.documents.get(self.document_id))
+
+
+class FakeCollection(FakeVectorCollection):
+    def document(self, document_id):
+        return FakeDocumentReference(self.documents, document_id)
+
+
+class FakeFirebase:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def get_collection(self, name):
+        collection = FakeCollection()
+        collection.documents = self.documents
+        return collection
+
+
+class FakeFirebaseVectorStore:
+    """The parts of FirebaseVectorStore the cached store reads and writes through."""
+
+    collection_name = "knowledge_base"
+
+    def __init__(self):
+        self.documents = {}
+        self.firebase = FakeFirebase(self.documents)
+        self.processor = DocumentProcessor()
+        self.fetches = []
+
+    async def get_documents(self, document_ids, field_paths=None):
+        self.fetches.append(list(document_ids))
+        return {
+            doc_id: dict(self.documents[doc_id])
+            for doc_id in document_ids
+            if doc_id in self.documents
+        }
+
+    async def delete_document(self, document_id):
+        return self.documents.pop(document_id, None) is not None
+
+
+class CountingEmbeddingService(EmbeddingService):
+    def __init__(self):
+        super().__init__(provider=PROVIDER)
+        self.calls = 0
+
+    async def embed_text(self, text):
+        self.calls += 1
+        return await super().embed_text(text)
+
+
+def document(text, category):
+    return {
+        "text": text,
+        "embedding": PROVIDER.embed(text),
+        "metadata": {"category": category},
+        "created_at": None,
+        "updated_at": None
+    }
+
+
+@pytest.fixture
+def make_store(monkeypatch):
+    monkeypatch.setattr(cached_vector_store, "FirebaseVectorStore", FakeFirebaseVectorStore)
+    monkeypatch.setattr(cached_vector_store, "EmbeddingService", CountingEmbeddingService)
+    monkeypatch.setattr(settings, "similarity_threshold", 0.01)
+    monkeypatch.setattr(settings, "vector_snapshot_dir", "")
+    monkeypatch.setattr(settings, "vector_cache_sync_mode", "ttl")
+    monkeypatch.setattr(settings, "vector_search_backend", "exact")
+
+    def make(payloads="resident", retrieval_mode="vector"):
+        monkeypatch.setattr(settings, "vector_cache_payloads", payloads)
+        monkeypatch.setattr(settings, "retrieval_mode", retrieval_mode)
+        store = CachedVectorStore()
+        for doc_id, (text, category) in MENU.items():
+            store.firebase_store.documents[doc_id] = document(text, category)
+        return store
+
+    return make
+
+
+async def test_search_with_embedding_returns_embedding_for_reuse(make_store):
+    store = make_store()
+
+    results, embedding = await store.search_with_embedding("margherita pizza with basil", top_k=2)
+
+    assert results[0]["id"] == "margherita"
+    assert results[0]["text"] == MENU["margherita"][0]
+    assert len(embedding) == PROVIDER.dimension
+    assert store.embedding_service.calls == 1
+
+    reused, returned = await store.search_with_embedding(
+        "margherita pizza with basil", top_k=2, query_embedding=embedding
+    )
+
+    assert [r["id"] for r in reused] == [r["id"] for r in results]
+    assert returned is embedding
+    assert store.embedding_service.calls == 1
+
+
+async def test_filtered_search_scores_only_matching_rows(make_store):
+    store = make_store()
+
+    results = await store.search("espresso", top_k=5, filters={"category": "drinks"})
+
+    assert results[0]["id"] == "espresso"
+    assert {r["metadata"]["category"] for r in results} == {"drinks"}
+
+
+async def test_hybrid_search_keeps_lexical_hits(make_store, monkeypatch):
+    monkeypatch.setattr(settings, "similarity_threshold", 0.99)
+    store = make_store()
+
+    vector_only = await store.search("mascarpone", top_k=3, mode="vector")
+    hybrid = await store.search("mascarpone", top_k=3, mode="hybrid")
+
+    assert vector_only == []
+    assert hybrid[0]["id"] == "tiramisu"
+    assert 0.0 < hybrid[0]["similarity"] < 0.99
+
+
+async def test_lexical_shortcut_skips_embedding(make_store, monkeypatch):
+    monkeypatch.setattr(settings, "lexical_shortcut", True)
+    store = make_store(retrieval_mode="hybrid")
+
+    results, embedding = await store.search_with_embedding("tiramisu", top_k=3)
+
+    assert embedding is None
+    assert store.embedding_service.calls == 0
+    assert results[0]["id"] == "tiramisu"
+    assert results[0]["similarity"] == 1.0
+    assert "lexical_score" in results[0]
+
+
+async def test_partial_lexical_match_still_embeds(make_store, monkeypatch):
+    monkeypatch.setattr(settings, "lexical_shortcut", True)
+    store = make_store(retrieval_mode="hybrid")
+
+    _, embedding = await store.search_with_embedding("pizza with anchovies", top_k=3)
+
+    assert embedding is not None
+    assert store.embedding_service.calls == 1
+
+
+async def test_fuse_rankings_scores_lexical_only_hits(make_store):
+    store = make_store()
+    await store._ensure_cache_fresh()
+    index = store.index
+    query = PROVIDER.embed("pizza")
+    vector_matches = [(index.row_of("margherita"), 0.9), (index.row_of("pepperoni"), 0.8)]
+    lexical_matches = [("pepperoni", 3.0), ("lemonade", 1.0)]
+
+    fused = store._fuse_rankings(index, query, vector_matches, lexical_matches, top_k=3)
+
+    assert [index.ids[row] for row, _ in fused] == ["pepperoni", "margherita", "lemonade"]
+    assert dict((index.ids[row], score) for row, score in fused)["pepperoni"] == 0.8
+    expected = float(index.score_rows(query, [index.row_of("lemonade")])[0])
+    assert fused[2][1] == pytest.approx(expected)
+
+
+async def test_hydrate_many_fetches_each_miss_once(make_store):
+    store = make_store(payloads="lazy")
+    await store._ensure_cache_fresh()
+    index = store.index
+    assert not index.payloads_resident
+
+    del store.firebase_store.documents["lemonade"]
+    first = [index.to_result(index.row_of("margherita"), 0.9), index.to_result(index.row_of("lemonade"), 0.5)]
+    second = [index.to_result(index.row_of("margherita"), 0.7)]
+
+    hydrated = await store._hydrate_many(index, [first, second])
+
+    assert store.firebase_store.fetches == [["margherita", "lemonade"]]
+    assert [[r["id"] for r in results] for results in hydrated] == [["margherita"], ["margherita"]]
+    assert hydrated[0][0]["text"] == MENU["margherita"][0]
+    assert hydrated[1][0]["similarity"] == 0.7
+
+    await store._hydrate(index, second)
+
+    assert len(store.firebase_store.fetches) == 1
+
+
+async def test_writes_during_rebuild_are_resynced(make_store, monkeypatch):
+    store = make_store()
+    await store._ensure_cache_fresh()
+    load = store._load_from_firestore
+
+    def build_while_writing():
+        index = load()
+        # The document changes after the rebuild streamed it
+        store.firebase_store.documents["lemonade"] = document("Iced tea with peach", "drinks")
+        store._dirty_ids.add("lemonade")
+        return index, None, time.time()
+
+    monkeypatch.setattr(store, "_build_index", build_while_writing)
+
+    await store._refresh_cache()
+
+    assert store._dirty_ids is None
+    results = await store.search("iced tea with peach", top_k=1)
+    assert results[0]["id"] == "lemonade"
+    assert results[0]["text"] == "Iced tea with peach"
+
+
+async def test_deletes_during_rebuild_are_resynced(make_store, monkeypatch):
+    store = make_store()
+    await store._ensure_cache_fresh()
+    load = store._load_from_firestore
+
+    def build_while_deleting():
+        index = load()
+        asyncio.run_coroutine_threadsafe(store.delete_document("tiramisu"), loop).result()
+        return index, None, time.time()
+
+    loop = asyncio.get_running_loop()
+    monkeypatch.setattr(store, "_build_index", build_while_deleting)
+
+    await store._refresh_cache()
+
+    assert "tiramisu" not in store.index
+
+
+async def test_apply_changes_upserts_and_removes(make_store):
+    store = make_store()
+    index = store._configure_index(VectorIndex())
+    initial_sync = asyncio.Event()
+    documents = store.firebase_store.documents
+
+    store._apply_changes(index, [("ADDED", doc_id, documents[doc_id]) for doc_id in documents], initial_sync)
+
+    assert initial_sync.is_set()
+    assert len(index) == len(MENU)
+
+    store._apply_changes(index, [
+        ("MODIFIED", "espresso", document("Cold brew coffee", "drinks")),
+        ("REMOVED", "tiramisu", None),
+        ("ADDED", "broken", {"text": "No embedding yet"})
+    ], initial_sync)
+
+    assert "tiramisu" not in index
+    assert "broken" not in index
+    assert index.texts[index.row_of("espresso")] == "Cold brew coffee"
+    assert len(index) == len(MENU) - 1
+
+
+async def test_filters_matching_nothing_return_no_results(make_store):
+    store = make_store()
+
+    results = await store.search("espresso", filters={"category": "nope"})
+    _, embedding = await store.search_with_embedding("espresso", filters={"category": "nope"}, query_embedding=[0.5])
+
+    assert results == []
+    assert embedding == [0.5]
+    assert store.embedding_service.calls == 0
+
+
+async def test_quantization_recall_runs_off_the_loop(make_store, monkeypatch):
+    store = make_store()
+    await store._ensure_cache_fresh()
+    store.index.set_quantization("int8")
+    threads = []
+    measure = store.index.measure_recall
+
+    def record_thread(**kwargs):
+        threads.append(threading.current_thread())
+        return measure(**kwargs)
+
+    monkeypatch.setattr(store.index, "measure_recall", record_thread)
+
+    recall = await store.measure_quantization_recall(top_k=2, sample_size=5)
+
+    assert threads and threads[0] is not threading.main_thread()
+    assert recall["queries"] == 5
+    assert recall["recall"] == 1.0
+    assert store.index.quantization == "int8"
+
+
+async def test_waits_briefly_while_another_worker_publishes(make_store, monkeypatch):
+    monkeypatch.setattr(settings, "vector_snapshot_wait_seconds", 2)
+    store = make_store()
+    await store._ensure_cache_fresh()
+    index = store.index
+    monkeypatch.setattr(store, "_build_index", lambda: None)
+    store.cache_timestamp = 0
+
+    await store._refresh_cache()
+    await store._ensure_cache_fresh()
+
+    assert store.index is index
+    assert store._dirty_ids is None
+    assert time.time() < store._retry_after <= time.time() + 2
+    assert store._refresh_task is None
@@ -0,0 +1,34 @@
+"""Tests for document listing page cursors."""
+
+import base64
+from datetime import datetime, timezone
+import pytest
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+from src.services.firebase_vector_store import FirebaseVectorStore
+
+
+@pytest.mark.parametrize("created_at", [
+    datetime(2024, 5, 1, 12, 30, 15, 123456),
+    datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+    DatetimeWithNanoseconds(2024, 5, 1, 12, 30, 15, 500, tzinfo=timezone.utc),
+])
+def test_cursor_round_trip(created_at):
+    cursor = FirebaseVectorStore._encode_cursor(created_at, "doc/with:odd=chars")
+
+    decoded = FirebaseVectorStore._decode_cursor(cursor)
+
+    assert decoded == {"created_at": created_at, "__name__": "doc/with:odd=chars"}
+    assert cursor.isascii()
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(b'{"id": "doc"}').decode(),
+    base64.urlsafe_b64encode(b'{"created_at": "yesterday", "id": "doc"}').decode(),
+    base64.urlsafe_b64encode(b'{"created_at": null, "id": "doc"}').decode(),
+    "ä",
+])
+def test_invalid_cursors(cursor):
+    with pytest.raises(ValueError):
+        FirebaseVectorStore._decode_cursor(cursor)
@@ -0,0 +1,58 @@
+"""Tests for the two-tier embedding cache."""
+
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.services.embedding_cache import EmbeddingCache, cache_key
+
+
+def test_keys_ignore_whitespace_but_not_model():
+    assert cache_key("model", "  Pizza\n margherita ") == cache_key("model", "Pizza margherita")
+    assert cache_key("model", "pizza") != cache_key("other", "pizza")
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    writer = EmbeddingCache(max_bytes=1 << 20, path=path)
+    writer.put_many("model", ["soup", "salad"], [[1.0, 2.0], [3.0, 4.0]])
+
+    reader = EmbeddingCache(max_bytes=1 << 20, path=path)
+    found = reader.get_many("model", ["salad", "bread", "soup"])
+
+    assert [None if vector is None else vector.tolist() for vector in found] == [[3.0, 4.0], None, [1.0, 2.0]]
+    reader.get_many("model", ["soup"])
+    assert reader.stats()["disk_hits"] == 2
+    assert reader.stats()["memory_hits"] == 1
+    assert reader.stats()["misses"] == 1
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = EmbeddingCache(max_bytes=2 * 4 * 4, path="")
+    vector = [0.0] * 4
+    cache.put_many("model", ["a", "b"], [vector, vector])
+    cache.get_many("model", ["a"])
+    cache.put_many("model", ["c"], [vector])
+
+    found = cache.get_many("model", ["a", "b", "c"])
+
+    assert [vector is not None for vector in found] == [True, False, True]
+    assert cache.stats()["memory_bytes"] <= cache.max_bytes
+
+
+def test_concurrent_threads(tmp_path):
+    cache = EmbeddingCache(max_bytes=64 * 16 * 4, path=str(tmp_path / "embeddings.sqlite3"))
+    texts = [f"text {number}" for number in range(200)]
+
+    def work(seed):
+        rng = np.random.default_rng(seed)
+        for _ in range(50):
+            batch = list(rng.choice(texts, 8))
+            cache.put_many("model", batch, [[float(len(text))] * 16 for text in batch])
+            for text, vector in zip(batch, cache.get_many("model", batch)):
+                assert vector is None or vector[0] == len(text)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(work, range(8)))
+
+    stats = cache.stats()
+    assert stats["memory_bytes"] <= cache.max_bytes
+    assert stats["memory_entries"] * 16 * 4 == stats["memory_bytes"]
@@ -0,0 +1,56 @@
+"""Tests for the binary embedding encoding."""
+
+import numpy as np
+import pytest
+from src.services.document_processor import DocumentProcessor
+from src.services.embedding_codec import (
+    HEADER, EmbeddingCodecError, decode_embedding, encode_embedding, is_encoded
+)
+
+
+@pytest.mark.parametrize("model", ["", "m", "text-embedding-3-small", "modèle-å"])
+def test_round_trip(model):
+    embedding = np.random.default_rng(0).normal(size=1536).astype(np.float32)
+
+    blob = encode_embedding(embedding.tolist(), model)
+    vector, decoded_model = decode_embedding(blob)
+
+    assert decoded_model == model
+    np.testing.assert_array_equal(vector, embedding)
+    assert len(blob) % 4 == 0
+    assert not vector.flags.writeable
+
+
+def test_decodes_from_memoryview():
+    blob = encode_embedding([1.0, 2.0, 3.0], "model")
+    vector, _ = decode_embedding(memoryview(blob))
+    assert vector.tolist() == [1.0, 2.0, 3.0]
+
+
+@pytest.mark.parametrize("blob", [
+    b"EMB",
+    b"XXXX" + b"\0" * 16,
+    encode_embedding([1.0, 2.0], "model")[:-1],
+    encode_embedding([1.0, 2.0], "model") + b"\0\0\0\0",
+    HEADER.pack(b"EMB1", 2, 40) + b"model",
+])
+def test_malformed_blobs(blob):
+    with pytest.raises(EmbeddingCodecError):
+        decode_embedding(blob)
+
+
+def test_rejects_non_vector():
+    with pytest.raises(EmbeddingCodecError):
+        encode_embedding([[1.0, 2.0]], "model")
+
+
+def test_stored_forms_extract_alike():
+    embedding = [0.5, -0.25, 1.0]
+    blob = encode_embedding(embedding, "model")
+
+    assert is_encoded(blob)
+    assert not is_encoded(embedding)
+    assert not is_encoded(b"JSON")
+    assert list(DocumentProcessor.extract_embedding({"embedding": blob})) == embedding
+    assert DocumentProcessor.extract_embedding({"vector": embedding}) == embedding
+    assert DocumentProcessor.extract_embedding({"text": "no embedding"}) is None
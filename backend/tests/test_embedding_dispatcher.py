@@ -0,0 +1,81 @@
+"""Tests for micro-batching embedding requests."""
+
+import asyncio
+import pytest
+from src.services import embedding_dispatcher
+from src.services.embedding_dispatcher import EmbeddingDispatcher, get_embedding_dispatcher
+from src.services.embedding_providers import HashedNgramEmbeddingProvider
+from src.services.embeddings import EmbeddingService
+
+
+class RecordingBatch:
+    def __init__(self, delay=0.0, error=None):
+        self.calls = []
+        self.delay = delay
+        self.error = error
+
+    async def __call__(self, texts):
+        self.calls.append(list(texts))
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [[float(len(text))] for text in texts]
+
+
+async def test_concurrent_calls_share_one_batch():
+    embed_batch = RecordingBatch()
+    dispatcher = EmbeddingDispatcher(embed_batch, window_ms=5, max_batch=64)
+
+    results = await asyncio.gather(*(dispatcher.embed(text) for text in ["a", "bb", "a", "ccc"]))
+
+    assert results == [[1.0], [2.0], [1.0], [3.0]]
+    assert embed_batch.calls == [["a", "bb", "ccc"]]
+    assert dispatcher.stats()["coalesced"] == 1
+
+
+async def test_full_batch_flushes_without_waiting():
+    embed_batch = RecordingBatch()
+    dispatcher = EmbeddingDispatcher(embed_batch, window_ms=10_000, max_batch=2)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(dispatcher.embed("a"), dispatcher.embed("bb")), timeout=1
+    )
+
+    assert results == [[1.0], [2.0]]
+
+
+async def test_errors_reach_every_caller():
+    dispatcher = EmbeddingDispatcher(RecordingBatch(error=RuntimeError("quota")), window_ms=1)
+
+    results = await asyncio.gather(dispatcher.embed("a"), dispatcher.embed("b"), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert dispatcher.stats()["in_flight"] == 0
+
+
+async def test_cancelled_caller_does_not_cancel_shared_result():
+    dispatcher = EmbeddingDispatcher(RecordingBatch(delay=0.05), window_ms=1)
+
+    first = asyncio.create_task(dispatcher.embed("shared"))
+    second = asyncio.create_task(dispatcher.embed("shared"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == [6.0]
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_services_share_a_process_wide_dispatcher(monkeypatch):
+    monkeypatch.setattr(embedding_dispatcher, "_dispatchers", {})
+    embed_batch = RecordingBatch()
+
+    first = get_embedding_dispatcher("model", embed_batch)
+    assert get_embedding_dispatcher("model", RecordingBatch()) is first
+    assert get_embedding_dispatcher("other", embed_batch) is not first
+
+
+def test_local_provider_skips_dispatcher():
+    service = EmbeddingService(provider=HashedNgramEmbeddingProvider(dimension=64))
+    assert service.dispatcher is None
+    assert service.cache is None
@@ -0,0 +1,58 @@
+"""Tests for the embedding providers."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+from src.services.embedding_providers import HashedNgramEmbeddingProvider, create_embedding_provider
+
+
+def test_hashed_ngrams_are_normalized_and_deterministic():
+    provider = HashedNgramEmbeddingProvider(dimension=256)
+
+    first = provider.embed("Vegetarisk lasagne med spenat")
+    second = HashedNgramEmbeddingProvider(dimension=256).embed("  vegetarisk   LASAGNE med spenat ")
+
+    assert len(first) == 256
+    assert first == second
+    assert np.linalg.norm(first) == pytest.approx(1.0, abs=1e-6)
+    assert provider.embed("") == [0.0] * 256
+
+
+def test_hashed_ngrams_match_across_processes():
+    code = (
+        "from src.services.embedding_providers import HashedNgramEmbeddingProvider;"
+        "print(HashedNgramEmbeddingProvider(dimension=64).embed('Pizza Margherita'))"
+    )
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent.parent, env={**os.environ, "PYTHONHASHSEED": seed}
+        ).stdout.strip().splitlines()[-1]
+        for seed in ("1", "2")
+    }
+    assert outputs == {str(HashedNgramEmbeddingProvider(dimension=64).embed("Pizza Margherita"))}
+
+
+def test_similar_texts_score_higher():
+    provider = HashedNgramEmbeddingProvider(dimension=512)
+    query = np.array(provider.embed("pizza margherita"))
+
+    close = query @ np.array(provider.embed("margherita pizza with basil"))
+    far = query @ np.array(provider.embed("chocolate mousse"))
+
+    assert close > far
+
+
+async def test_async_interface_matches_sync():
+    provider = HashedNgramEmbeddingProvider(dimension=32)
+    assert await provider.embed_query("soup") == provider.embed("soup")
+    assert await provider.embed_documents(["soup", "salad"]) == [provider.embed("soup"), provider.embed("salad")]
+
+
+def test_unknown_provider():
+    with pytest.raises(ValueError):
+        create_embedding_provider("word2vec")
+    assert create_embedding_provider("local").remote is False
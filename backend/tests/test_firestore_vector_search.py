@@ -0,0 +1,89 @@
+"""Tests for the native Firestore vector search backend."""
+
+from google.api_core.exceptions import FailedPrecondition, ServiceUnavailable
+from src.services.firestore_vector_search import FirestoreVectorSearch
+from fakes import FakeVectorCollection
+
+
+def make_collection():
+    return FakeVectorCollection({
+        "near": {"text": "near", "embedding": [1.0, 0.0, 0.0], "metadata": {"category": "a"}},
+        "mid": {"text": "mid", "embedding": [0.8, 0.6, 0.0], "metadata": {"category": "b"}},
+        "far": {"text": "far", "embedding": [0.0, 0.0, 1.0], "metadata": {"category": "a"}},
+    })
+
+
+class RecordingCollection(FakeVectorCollection):
+    """Remembers the limit of the last find_nearest call."""
+
+    last_limit = None
+
+    def find_nearest(self, *args, limit, **kwargs):
+        RecordingCollection.last_limit = limit
+        return super().find_nearest(*args, limit=limit, **kwargs)
+
+
+class FailingCollection(FakeVectorCollection):
+    def __init__(self, error=None):
+        super().__init__()
+        self.error = error
+
+    def select(self, field_paths):
+        return self
+
+    def find_nearest(self, *args, **kwargs):
+        raise self.error
+
+
+def test_capability_check():
+    assert FirestoreVectorSearch.is_supported(make_collection())
+    assert not FirestoreVectorSearch.is_supported(object())
+
+    backend = FirestoreVectorSearch(object(), enabled=True)
+    assert not backend.enabled
+    assert backend.search([1.0, 0.0, 0.0], 3, 0.0) is None
+    assert backend.to_storage([1.0, 2.0]) == [1.0, 2.0]
+
+
+def test_results_ordered_and_cut_at_threshold():
+    backend = FirestoreVectorSearch(make_collection(), enabled=True)
+
+    results = backend.search([1.0, 0.0, 0.0], top_k=3, threshold=0.5)
+
+    assert [result["id"] for result in results] == ["near", "mid"]
+    assert results[0]["similarity"] == 1.0
+    assert abs(results[1]["similarity"] - 0.8) < 1e-6
+
+
+def test_results_do_not_carry_embeddings():
+    backend = FirestoreVectorSearch(make_collection(), enabled=True)
+
+    result = backend.search([1.0, 0.0, 0.0], top_k=1, threshold=0.0)[0]
+
+    assert result["text"] == "near"
+    assert "embedding" not in result
+
+
+def test_filters_overfetch_then_match_metadata(monkeypatch):
+    from src.config import settings
+    monkeypatch.setattr(settings, "firestore_vector_overfetch", 4)
+    backend = FirestoreVectorSearch(RecordingCollection(make_collection().documents), enabled=True)
+
+    results = backend.search([1.0, 0.0, 0.0], top_k=2, threshold=0.0, filters={"category": "a"})
+
+    assert RecordingCollection.last_limit == 8
+    assert [result["id"] for result in results] == ["near", "far"]
+
+
+def test_failure_returns_none_and_keeps_backend():
+    backend = FirestoreVectorSearch(FailingCollection(ServiceUnavailable("down")), enabled=True)
+
+    assert backend.search([1.0, 0.0, 0.0], 3, 0.0) is None
+    assert backend.enabled
+
+
+def test_missing_index_disables_backend():
+    backend = FirestoreVectorSearch(FailingCollection(FailedPrecondition("no index")), enabled=True)
+
+    assert backend.search([1.0, 0.0, 0.0], 3, 0.0) is None
+    assert not backend.enabled
@@ -0,0 +1,97 @@
+"""Tests for batched ingestion writes."""
+
+from datetime import datetime
+from src.services.document_processor import DocumentProcessor
+from src.services.embedding_providers import HashedNgramEmbeddingProvider
+from src.services.embeddings import EmbeddingService
+from src.services.firebase_vector_store import FirebaseVectorStore
+from src.services.firestore_vector_search import FirestoreVectorSearch
+from src.services.ingestion import IngestionPipeline
+from fakes import FakeSnapshot
+
+
+class FakeReference:
+    def __init__(self, documents, document_id):
+        self.documents = documents
+        self.id = document_id
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def document(self, document_id):
+        return FakeReference(self.documents, document_id)
+
+
+class FakeBatch:
+    def __init__(self):
+        self.writes = []
+
+    def set(self, reference, data):
+        self.writes.append((reference, data))
+
+    def commit(self):
+        for reference, data in self.writes:
+            reference.documents[reference.id] = dict(data)
+
+
+class FakeDatabase:
+    def batch(self):
+        return FakeBatch()
+
+    def get_all(self, references, field_paths=None):
+        for reference in references:
+            data = reference.documents.get(reference.id)
+            if data is not None and field_paths:
+                data = {key: data[key] for key in field_paths if key in data}
+            yield FakeSnapshot(reference.id, data)
+
+
+class FakeFirebase:
+    def __init__(self):
+        self.documents = {}
+        self.db = FakeDatabase()
+
+    def get_collection(self, name):
+        return FakeCollection(self.documents)
+
+
+def make_store():
+    store = FirebaseVectorStore.__new__(FirebaseVectorStore)
+    store.firebase = FakeFirebase()
+    store.collection_name = "knowledge_base"
+    store.embedding_service = EmbeddingService(provider=HashedNgramEmbeddingProvider(dimension=16))
+    store.processor = DocumentProcessor()
+    store.native_search = FirestoreVectorSearch(object(), enabled=False)
+    return store
+
+
+async def test_content_ids_make_reingestion_idempotent():
+    store = make_store()
+    pipeline = IngestionPipeline(store, batch_size=2, max_retries=0)
+    documents = [{"text": f"Dish {number}"} for number in range(3)]
+
+    first = await pipeline.ingest(documents)
+    second = await pipeline.ingest(documents)
+
+    assert first.document_ids == second.document_ids
+    assert first.succeeded == 3 and first.batches == 2
+    assert len(store.firebase.documents) == 3
+
+
+async def test_overwrite_keeps_created_at():
+    store = make_store()
+    pipeline = IngestionPipeline(store, max_retries=0)
+    original = datetime(2024, 1, 1)
+    store.firebase.documents["doc-1"] = {"text": "old", "created_at": original}
+
+    report = await pipeline.ingest([
+        {"text": "new", "document_id": "doc-1"},
+        {"text": "fresh", "document_id": "doc-2"}
+    ])
+
+    assert report.succeeded == 2
+    assert store.firebase.documents["doc-1"]["text"] == "new"
+    assert store.firebase.documents["doc-1"]["created_at"] == original
+    assert store.firebase.documents["doc-2"]["created_at"] > original
@@ -0,0 +1,124 @@
+"""Tests for the journaled ingestion job queue."""
+
+import asyncio
+import json
+import threading
+import pytest
+from src.services import ingestion_jobs
+from src.services.ingestion_jobs import IngestionJobQueue
+
+
+class StubVectorStore:
+    def __init__(self):
+        self.added = []
+        self.release = asyncio.Event()
+
+    async def add_document(self, text, metadata=None, document_id=None):
+        await self.release.wait()
+        self.added.append(document_id)
+        return document_id
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = StubVectorStore()
+    monkeypatch.setattr(ingestion_jobs, "get_cached_vector_store", lambda: store)
+    return store
+
+
+async def wait_for_status(queue, job_id, status):
+    for _ in range(200):
+        if (await queue.get(job_id))["status"] == status:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}")
+
+
+async def test_submit_requires_running_queue(tmp_path):
+    queue = IngestionJobQueue(str(tmp_path), workers=1)
+    with pytest.raises(RuntimeError):
+        await queue.submit("create", {"text": "hello"})
+
+
+async def test_submit_journals_before_running(tmp_path, store):
+    queue = IngestionJobQueue(str(tmp_path), workers=1)
+    await queue.start()
+    try:
+        job = await queue.submit("create", {"text": "hello"})
+
+        records = [json.loads(line) for line in queue._journal.read_text().splitlines()]
+        assert records[0]["job_id"] == job["job_id"]
+        assert records[0]["status"] == "queued"
+        assert job["document_id"]
+
+        store.release.set()
+        await wait_for_status(queue, job["job_id"], "succeeded")
+        assert store.added == [job["document_id"]]
+    finally:
+        await queue.stop()
+
+
+async def test_unfinished_jobs_replay_after_restart(tmp_path, store):
+    queue = IngestionJobQueue(str(tmp_path), workers=1)
+    await queue.start()
+    job = await queue.submit("create", {"text": "hello", "document_id": "doc-1"})
+    await wait_for_status(queue, job["job_id"], "running")
+    await queue.stop()
+    assert store.added == []
+
+    # A torn final line from a crash is skipped on replay
+    with open(queue._journal, "a", encoding="utf-8") as journal:
+        journal.write('{"job_id": "torn"')
+
+    restarted = IngestionJobQueue(str(tmp_path), workers=1)
+    store.release.set()
+    await restarted.start()
+    try:
+        await wait_for_status(restarted, job["job_id"], "succeeded")
+        assert store.added == ["doc-1"]
+        assert "torn" not in restarted.jobs
+    finally:
+        await restarted.stop()
+
+
+async def test_compaction_drops_expired_results_in_a_thread(tmp_path, store, monkeypatch):
+    queue = IngestionJobQueue(str(tmp_path), workers=1)
+    await queue.start()
+    try:
+        store.release.set()
+        old = await queue.submit("create", {"text": "old"})
+        await wait_for_status(queue, old["job_id"], "succeeded")
+        fresh = await queue.submit("create", {"text": "fresh"})
+        await wait_for_status(queue, fresh["job_id"], "succeeded")
+        old["updated_at"] = 0.0
+
+        threads = []
+        compact = queue._compact
+        monkeypatch.setattr(queue, "_compact", lambda: threads.append(threading.current_thread()) or compact())
+        await queue._compact_journal()
+
+        assert threads and threads[0] is not threading.main_thread()
+        assert set(queue.jobs) == {fresh["job_id"]}
+        records = [json.loads(line) for line in queue._journal.read_text().splitlines()]
+        assert [record["job_id"] for record in records] == [fresh["job_id"]]
+        assert queue._journal_records == 1
+    finally:
+        await queue.stop()
+
+
+async def test_get_reads_other_journals(tmp_path, store):
+    first = IngestionJobQueue(str(tmp_path), workers=1)
+    second = IngestionJobQueue(str(tmp_path), workers=1)
+    await first.start()
+    await second.start()
+    try:
+        job = await first.submit("create", {"text": "hello"})
+
+        found = await second.get(job["job_id"])
+
+        assert found["job_id"] == job["job_id"]
+        assert job["job_id"] not in second.jobs
+        assert await second.get("missing") is None
+    finally:
+        await first.stop()
+        await second.stop()
@@ -0,0 +1,90 @@
+"""Tests for the versioned menu context cache."""
+
+import time
+from src.services.menu_context import MenuContextCache, menu_version
+
+
+class FakeDoc:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeMenuService:
+    """Serves a restaurant marker and dishes, counting dish reads."""
+
+    def __init__(self, dishes, marker="v1"):
+        self.dishes = dishes
+        self.marker = marker
+        self.dish_reads = 0
+
+    def restaurant_document(self):
+        service = self
+
+        class Ref:
+            def get(self, field_paths=None):
+                return FakeDoc("main", {"updatedAt": service.marker})
+        return Ref()
+
+    def dishes_collection(self):
+        service = self
+
+        class Collection:
+            def stream(self):
+                service.dish_reads += 1
+                return [FakeDoc(dish["id"], dish) for dish in service.dishes]
+        return Collection()
+
+
+def make_dish(dish_id, name, price=100):
+    return {
+        "id": dish_id, "name": name, "priceSek": price, "description": "Tasty",
+        "category": "Mains", "allergens": ["gluten"], "tags": ["popular"]
+    }
+
+
+def test_version_ignores_read_order():
+    dishes = [make_dish("a", "Pasta"), make_dish("b", "Pizza")]
+    assert menu_version(dishes) == menu_version(list(reversed(dishes)))
+
+
+async def test_prompt_per_language():
+    cache = MenuContextCache(FakeMenuService([make_dish("a", "Pasta")]), ttl=60, sync_mode="ttl")
+
+    assert "Allergens: gluten" in await cache.get_prompt("en")
+    assert "Allergener: gluten" in await cache.get_prompt("sv")
+    assert "Allergens" in await cache.get_prompt("de")
+
+
+def test_unchanged_marker_skips_dish_read_until_full_refresh():
+    service = FakeMenuService([make_dish("a", "Pasta")])
+    cache = MenuContextCache(service, ttl=0, sync_mode="ttl", full_refresh=900)
+
+    cache._refresh()
+    cache._refresh()
+    assert service.dish_reads == 1
+
+    # A dish edited without touching the marker is picked up eventually
+    service.dishes = [make_dish("a", "Pasta", price=120)]
+    cache.read_at = time.time() - 901
+    version = cache.version
+    cache._refresh()
+    assert service.dish_reads == 2
+    assert cache.version != version
+
+
+def test_changed_marker_rereads_dishes():
+    service = FakeMenuService([make_dish("a", "Pasta")])
+    cache = MenuContextCache(service, ttl=0, sync_mode="ttl", full_refresh=900)
+    cache._refresh()
+
+    service.marker = "v2"
+    service.dishes.append(make_dish("b", "Pizza"))
+    cache._refresh()
+
+    assert service.dish_reads == 2
+    assert cache.snapshot.item_count == 2
@@ -0,0 +1,131 @@
+"""Tests for local query routing."""
+
+import numpy as np
+import pytest
+from src.services.embedding_providers import HashedNgramEmbeddingProvider
+from src.services.embeddings import EmbeddingService
+from src.services.query_router import QueryRouter
+
+EXAMPLES = {
+    "retrieve": ["what is your work experience", "where do you live", "where did you study"],
+    "skip": ["what is the capital of france", "explain neural networks", "what is twelve times fifteen"],
+}
+
+
+class StubAnalyzer:
+    def __init__(self, answer=True):
+        self.answer = answer
+        self.queries = []
+
+    async def requires_retrieval(self, query):
+        self.queries.append(query)
+        return self.answer, "llm decided"
+
+
+class CountingService(EmbeddingService):
+    def __init__(self):
+        super().__init__(provider=HashedNgramEmbeddingProvider(dimension=512))
+        self.batches = 0
+
+    async def embed_texts(self, texts):
+        self.batches += 1
+        return await super().embed_texts(texts)
+
+
+def make_router(threshold=0.8, answer=True):
+    return QueryRouter(StubAnalyzer(answer), CountingService(), threshold=threshold, examples=EXAMPLES)
+
+
+@pytest.mark.parametrize("query,should_retrieve", [
+    ("Hej!", False),
+    ("hello", False),
+    ("Thanks!", False),
+    ("How does this AI work?", False),
+    ("What is Peter's experience?", True),
+    ("Berätta om dina projekt", True),
+    ("Do you have a CV?", True),
+])
+def test_rules(query, should_retrieve):
+    decision = make_router().match_rules(query)
+    assert decision is not None
+    assert decision.should_retrieve is should_retrieve
+    assert decision.source == "rule"
+
+
+def test_rules_leave_open_questions_to_the_model():
+    assert make_router().match_rules("What is the capital of Norway?") is None
+
+
+async def test_rule_decisions_skip_embedding_and_llm():
+    router = make_router()
+
+    decision = await router.route("hello")
+
+    assert decision.query_embedding is None
+    assert router.embedding_service.batches == 0
+    assert router.analyzer.queries == []
+
+
+async def test_centroids_decide_confident_queries():
+    router = make_router(threshold=0.6)
+
+    retrieve = await router.route("where did you study at university")
+    skip = await router.route("what is the capital of sweden")
+
+    assert retrieve.source == "centroid" and retrieve.should_retrieve
+    assert skip.source == "centroid" and not skip.should_retrieve
+    assert len(retrieve.query_embedding) == 512
+    assert router.analyzer.queries == []
+    # Example embeddings are computed once for both labels
+    assert router.embedding_service.batches == 2
+
+
+async def test_unsure_queries_go_to_the_llm_keeping_the_embedding():
+    router = make_router(threshold=1.01, answer=False)
+
+    decision = await router.route("where did you study at university")
+
+    assert decision.source == "llm"
+    assert not decision.should_retrieve
+    assert router.analyzer.queries == ["where did you study at university"]
+    assert decision.query_embedding is not None
+
+
+async def test_given_embed_function_replaces_the_service():
+    router = make_router(threshold=0.6)
+    embedded = []
+
+    async def embed(query):
+        embedded.append(query)
+        return await router.embedding_service.embed_text(query)
+
+    decision = await router.route("where did you study at university", embed)
+
+    assert embedded == ["where did you study at university"]
+    assert decision.source == "centroid" and decision.should_retrieve
+
+
+def test_confidence_grows_with_margin():
+    router = make_router()
+    centroids = np.eye(2, dtype=np.float32)
+
+    close = router.classify(centroids, [1.0, 0.9])
+    clear = router.classify(centroids, [1.0, 0.1])
+    skip = router.classify(centroids, [0.1, 1.0])
+
+    assert close.should_retrieve and clear.should_retrieve and not skip.should_retrieve
+    assert 0.5 <= close.confidence < clear.confidence <= 1.0
+    assert skip.confidence == pytest.approx(clear.confidence)
+
+
+async def test_embedding_failure_falls_back_to_the_llm():
+    router = make_router()
+
+    async def unavailable(texts):
+        raise RuntimeError("provider down")
+    router.embedding_service.embed_texts = unavailable
+
+    decision = await router.route("where did you study at university")
+
+    assert decision.source == "llm"
+    assert router.analyzer.queries == ["where did you study at university"]
@@ -0,0 +1,27 @@
+"""Tests for request validation of search filters."""
+
+import pytest
+from pydantic import ValidationError
+from src.models.requests import BatchSearchRequest, SearchRequest
+
+
+@pytest.mark.parametrize("filters", [
+    {"category": "menu"},
+    {"category": ["menu", "info"], "price": 12, "vegan": True},
+    {"rating": 4.5, "tags": [1, "two", None]},
+])
+def test_scalar_filters_are_accepted(filters):
+    assert SearchRequest(query="pizza", filters=filters).filters == filters
+    assert BatchSearchRequest(queries=["pizza"], filters=filters).filters == filters
+
+
+@pytest.mark.parametrize("filters", [
+    {"category": {"nested": "menu"}},
+    {"tags": [["menu"], ["info"]]},
+    {"tags": [{"a": 1}]},
+])
+def test_unhashable_filters_are_rejected(filters):
+    with pytest.raises(ValidationError):
+        SearchRequest(query="pizza", filters=filters)
+    with pytest.raises(ValidationError):
+        BatchSearchRequest(queries=["pizza"], filters=filters)
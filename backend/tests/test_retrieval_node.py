@@ -0,0 +1,48 @@
+"""Tests for query embedding reuse in the retrieval node."""
+
+from src.core.nodes import RetrievalNode
+
+
+class StubVectorStore:
+    """Records the embedding it was given and answers like the lexical shortcut."""
+
+    def __init__(self, computed=None):
+        self.computed = computed
+        self.received = "unset"
+
+    async def search_with_embedding(self, query, top_k=None, threshold=None, filters=None,
+                                    mode=None, query_embedding=None, embed=None):
+        self.received = query_embedding
+        return [{"id": "dish", "text": query, "similarity": 1.0}], query_embedding or self.computed
+
+
+def make_state(query_embedding=None):
+    return {"query": "Margherita", "messages": [], "query_embedding": query_embedding}
+
+
+async def test_does_not_embed_when_state_has_none():
+    store = StubVectorStore()
+
+    update = await RetrievalNode(store).process(make_state())
+
+    assert store.received is None
+    assert update["query_embedding"] is None
+    assert update["retrieval_complete"]
+    assert len(update["retrieved_context"]) == 1
+
+
+async def test_reuses_router_embedding():
+    store = StubVectorStore()
+
+    update = await RetrievalNode(store).process(make_state([0.1, 0.2]))
+
+    assert store.received == [0.1, 0.2]
+    assert update["query_embedding"] == [0.1, 0.2]
+
+
+async def test_records_embedding_computed_by_store():
+    store = StubVectorStore(computed=[0.3, 0.4])
+
+    update = await RetrievalNode(store).process(make_state())
+
+    assert update["query_embedding"] == [0.3, 0.4]
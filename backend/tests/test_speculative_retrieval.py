@@ -0,0 +1,121 @@
+"""Tests for retrieval running alongside query analysis."""
+
+import asyncio
+from src.core.nodes import Nodes, RetrievalNode
+
+
+class StubAnalysisNode:
+    def __init__(self, should_retrieve, delay=0.0, events=None):
+        self.should_retrieve = should_retrieve
+        self.delay = delay
+        self.events = events if events is not None else []
+        self.embedding = None
+
+    async def process(self, state, embed=None):
+        self.events.append("analysis_started")
+        if embed is not None:
+            self.embedding = await embed(state["query"])
+        await asyncio.sleep(self.delay)
+        self.events.append("analysis_finished")
+        return {
+            "should_retrieve": self.should_retrieve,
+            "query_embedding": [0.5, 0.5] if self.should_retrieve else None,
+            "messages": state["messages"] + [{"role": "system", "content": "Query analysis: stub"}]
+        }
+
+
+class CountingEmbeddingService:
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = 0
+
+    async def embed_text(self, text):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return [float(len(text)), 1.0]
+
+
+class SlowVectorStore:
+    def __init__(self, delay, events=None):
+        self.delay = delay
+        self.events = events if events is not None else []
+        self.embedding_service = CountingEmbeddingService()
+        self.completed = False
+        self.embedding = None
+
+    async def search_with_embedding(self, query, top_k=None, threshold=None, filters=None,
+                                    mode=None, query_embedding=None, embed=None):
+        self.events.append("retrieval_started")
+        if embed is not None:
+            self.embedding = await embed(query)
+        await asyncio.sleep(self.delay)
+        self.completed = True
+        self.events.append("retrieval_finished")
+        return [{"id": "doc", "text": "context", "similarity": 0.9}], [0.1, 0.2]
+
+
+def make_nodes(should_retrieve, analysis_delay, retrieval_delay):
+    events = []
+    nodes = Nodes.__new__(Nodes)
+    nodes._analysis_node = StubAnalysisNode(should_retrieve, analysis_delay, events)
+    nodes.vector_store = SlowVectorStore(retrieval_delay, events)
+    nodes._retrieval_node = RetrievalNode(nodes.vector_store)
+    nodes.speculation_stats = {
+        "speculated": 0, "used": 0, "discarded": 0, "cancelled_in_flight": 0, "wasted_ms": 0.0
+    }
+    return nodes
+
+
+def make_state():
+    return {"query": "What did you study?", "messages": [], "query_embedding": None}
+
+
+async def test_keeps_retrieval_when_analysis_wants_it():
+    nodes = make_nodes(True, analysis_delay=0.05, retrieval_delay=0.05)
+
+    update = await nodes.analyze_query_speculative(make_state())
+
+    # Both started before either finished, so they overlapped
+    events = nodes.vector_store.events
+    assert set(events[:2]) == {"analysis_started", "retrieval_started"}
+    assert update["should_retrieve"] and update["retrieval_complete"]
+    assert update["retrieved_context"][0]["id"] == "doc"
+    assert update["query_embedding"] == [0.5, 0.5]
+    assert [message["content"] for message in update["messages"]] == [
+        "Query analysis: stub",
+        "Retrieved 1 relevant documents from knowledge base"
+    ]
+    assert nodes.speculation_stats["used"] == 1
+
+
+async def test_router_and_retrieval_share_one_embedding():
+    nodes = make_nodes(True, analysis_delay=0.0, retrieval_delay=0.0)
+
+    await nodes.analyze_query_speculative(make_state())
+
+    assert nodes.vector_store.embedding_service.calls == 1
+    assert nodes._analysis_node.embedding == nodes.vector_store.embedding == [19.0, 1.0]
+
+
+async def test_cancels_retrieval_still_in_flight():
+    nodes = make_nodes(False, analysis_delay=0.0, retrieval_delay=1.0)
+
+    update = await asyncio.wait_for(nodes.analyze_query_speculative(make_state()), timeout=0.5)
+
+    assert not update["should_retrieve"]
+    assert "retrieved_context" not in update
+    assert not nodes.vector_store.completed
+    assert "retrieval_finished" not in nodes.vector_store.events
+    assert nodes.speculation_stats["discarded"] == 1
+    assert nodes.speculation_stats["cancelled_in_flight"] == 1
+
+
+async def test_discards_finished_retrieval():
+    nodes = make_nodes(False, analysis_delay=0.05, retrieval_delay=0.0)
+
+    update = await nodes.analyze_query_speculative(make_state())
+
+    assert "retrieved_context" not in update
+    assert nodes.vector_store.completed
+    assert nodes.speculation_stats["cancelled_in_flight"] == 0
+    assert nodes.speculation_stats["wasted_ms"] > 0
@@ -0,0 +1,264 @@
+"""Tests for the resident vector index."""
+
+import numpy as np
+import pytest
+from src.services.embedding_providers import HashedNgramEmbeddingProvider
+from src.services.embeddings import EmbeddingService
+from src.services.vector_index import VectorIndex
+
+CATEGORIES = ("menu", "info", "contact")
+
+
+def random_documents(count=200, dimension=16, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "id": f"doc-{row}",
+            "text": f"document {row} about {CATEGORIES[row % 3]}",
+            "embedding": rng.normal(size=dimension).astype(np.float32),
+            "metadata": {"category": CATEGORIES[row % 3], "tags": ["even" if row % 2 == 0 else "odd"]}
+        }
+        for row in range(count)
+    ]
+
+
+def loop_search(documents, query, top_k, threshold):
+    """The per-document calculate_similarity loop the index replaced."""
+    service = EmbeddingService(provider=HashedNgramEmbeddingProvider(dimension=8))
+    scored = []
+    for document in documents:
+        similarity = service.calculate_similarity(query, document["embedding"])
+        if similarity >= threshold:
+            scored.append((document["id"], similarity))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored[:top_k]
+
+
+def ranked_ids(index, results):
+    return [(index.ids[row], similarity) for row, similarity in results]
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.2, 0.5])
+def test_search_matches_similarity_loop(threshold):
+    documents = random_documents()
+    index = VectorIndex.from_documents(documents)
+    query = np.random.default_rng(1).normal(size=16)
+
+    expected = loop_search(documents, query, 10, threshold)
+    actual = ranked_ids(index, index.search(query, 10, threshold))
+
+    assert [doc_id for doc_id, _ in actual] == [doc_id for doc_id, _ in expected]
+    np.testing.assert_allclose(
+        [similarity for _, similarity in actual], [similarity for _, similarity in expected], atol=1e-5
+    )
+
+
+def test_ties_keep_load_order():
+    documents = [
+        {"id": f"doc-{row}", "text": "", "embedding": [1.0, 0.0] if row % 2 else [0.0, 1.0]}
+        for row in range(10)
+    ]
+    index = VectorIndex.from_documents(documents)
+
+    results = ranked_ids(index, index.search([1.0, 0.0], 3, 0.0))
+
+    assert [doc_id for doc_id, _ in results] == ["doc-1", "doc-3", "doc-5"]
+    assert [doc_id for doc_id, _ in results] == [doc_id for doc_id, _ in loop_search(documents, [1.0, 0.0], 3, 0.0)]
+
+
+def test_zero_vectors_score_nothing():
+    documents = [
+        {"id": "zero", "text": "", "embedding": [0.0, 0.0, 0.0]},
+        {"id": "unit", "text": "", "embedding": [0.0, 1.0, 0.0]},
+    ]
+    index = VectorIndex.from_documents(documents)
+
+    assert index.search([0.0, 0.0, 0.0], 5, 0.0) == []
+    assert ranked_ids(index, index.search([0.0, 1.0, 0.0], 5, 0.0)) == [("unit", 1.0), ("zero", 0.0)]
+    assert ranked_ids(index, index.search([0.0, 1.0, 0.0], 5, 0.1)) == [("unit", 1.0)]
+
+
+def test_dimension_mismatch():
+    index = VectorIndex.from_documents(random_documents(count=3))
+
+    with pytest.raises(ValueError):
+        index.search([1.0, 0.0], 3, 0.0)
+    assert not index.upsert({"id": "short", "text": "", "embedding": [1.0, 0.0]})
+    assert "short" not in index
+
+
+def test_search_many_matches_search():
+    index = VectorIndex.from_documents(random_documents())
+    queries = np.random.default_rng(2).normal(size=(5, 16))
+    queries[3] = 0.0
+    rows = index.filter_rows({"category": "menu"})
+
+    for subset in (None, rows):
+        batched = index.search_many(queries, 7, 0.1, rows=subset)
+        single = [index.search(query, 7, 0.1, rows=subset) for query in queries]
+        assert [[row for row, _ in result] for result in batched] == [[row for row, _ in result] for result in single]
+    assert batched[3] == []
+
+
+def assert_consistent(index, documents):
+    """Rows, postings and BM25 agree with a fresh build of the same documents."""
+    fresh = VectorIndex.from_documents(documents)
+    assert sorted(index.ids) == sorted(fresh.ids)
+    for doc_id in fresh.ids:
+        row = index.row_of(doc_id)
+        assert index.ids[row] == doc_id
+        np.testing.assert_allclose(index.matrix[row], fresh.matrix[fresh.row_of(doc_id)], atol=1e-6)
+
+    for filters in ({"category": "menu"}, {"tags": "even"}, {"category": ["info", "contact"], "tags": "odd"}):
+        assert {index.ids[row] for row in index.filter_rows(filters)} == {
+            fresh.ids[row] for row in fresh.filter_rows(filters)
+        }
+
+    query = "document about menu 7"
+    assert dict(index.lexical.search(query, 50)) == pytest.approx(dict(fresh.lexical.search(query, 50)))
+
+
+def test_upsert_and_swap_remove_stay_consistent():
+    documents = random_documents(count=30)
+    index = VectorIndex.from_documents(documents)
+    # Build BM25 first so it has to follow the writes below
+    index._ensure_lexical()
+
+    removed = {"doc-0", "doc-7", "doc-29", "doc-15"}
+    for doc_id in removed:
+        assert index.remove(doc_id)
+    assert not index.remove("doc-0")
+
+    changed = dict(documents[3], text="document 3 moved to menu", metadata={"category": "menu", "tags": ["odd"]})
+    index.upsert(changed)
+    added = random_documents(count=32, seed=5)[30:]
+    for document in added:
+        index.upsert(document)
+
+    expected = [
+        changed if document["id"] == "doc-3" else document
+        for document in documents if document["id"] not in removed
+    ] + added
+    assert len(index) == len(expected)
+    assert_consistent(index, expected)
+
+
+def test_memory_mapped_rows_are_never_copied():
+    index = VectorIndex.from_documents(random_documents(count=5))
+    matrix = np.array(index.matrix)
+    matrix.flags.writeable = False
+    shared = VectorIndex.from_arrays(matrix, index.ids, index.texts, index.metadata, index.created_at, index.updated_at)
+
+    shared.remove("doc-0")
+    shared.upsert(random_documents(count=7, seed=3)[6])
+
+    assert shared.is_memory_mapped
+    assert shared._buffer is matrix
+    assert shared.overlay_rows == 2
+    assert len(shared) == 5
+    assert shared.memory_bytes() < 2 * matrix.nbytes + 16 * 16 * 4
+
+
+@pytest.mark.parametrize("mode", ["none", "int8"])
+def test_overlay_writes_match_heap_index(mode):
+    documents = random_documents(count=60)
+    heap = VectorIndex.from_documents(documents)
+    matrix = np.array(heap.matrix)
+    matrix.flags.writeable = False
+    shared = VectorIndex.from_arrays(matrix, heap.ids, heap.texts, heap.metadata, heap.created_at, heap.updated_at)
+    for index in (heap, shared):
+        index.set_quantization(mode)
+
+    rng = np.random.default_rng(8)
+    added = random_documents(count=90, seed=6)[60:]
+    for step, document in enumerate(added):
+        victim = f"doc-{rng.integers(60)}"
+        changed = dict(documents[rng.integers(60)], embedding=rng.normal(size=16))
+        for index in (heap, shared):
+            index.upsert(document)
+            index.remove(victim)
+            index.upsert(changed)
+            if step % 10 == 0:
+                index.remove(document["id"])
+
+    assert shared.is_memory_mapped
+    assert shared.ids == heap.ids
+    np.testing.assert_allclose(shared.matrix, heap.matrix, atol=1e-6)
+
+    queries = rng.normal(size=(4, 16))
+    rows = heap.filter_rows({"category": "menu"})
+    for subset in (None, rows):
+        assert shared.search_many(queries, 5, 0.0, rows=subset) == heap.search_many(queries, 5, 0.0, rows=subset)
+        for query in queries:
+            assert shared.search(query, 5, 0.0, rows=subset) == heap.search(query, 5, 0.0, rows=subset)
+    some_rows = [len(heap) - 1, 3, 0]
+    np.testing.assert_allclose(shared.score_rows(queries[0], some_rows), heap.score_rows(queries[0], some_rows), atol=1e-6)
+
+
+@pytest.mark.parametrize("mode", ["float16", "int8"])
+def test_quantized_search_reranks_exactly(mode):
+    documents = random_documents(count=500, dimension=32)
+    exact = VectorIndex.from_documents(documents)
+    quantized = VectorIndex.from_documents(documents)
+    quantized.set_quantization(mode, rerank_factor=4)
+    queries = np.random.default_rng(3).normal(size=(20, 32))
+
+    recall = []
+    for query in queries:
+        expected = exact.search(query, 10, 0.0)
+        actual = quantized.search(query, 10, 0.0)
+        # Survivors are re-scored against the float32 rows
+        assert all(abs(score - exact.score_rows(query, [row])[0]) < 1e-5 for row, score in actual)
+        recall.append(len({row for row, _ in expected} & {row for row, _ in actual}) / 10)
+
+    assert np.mean(recall) >= 0.95
+    assert quantized.quantized_bytes() < exact.memory_bytes()
+    assert quantized.measure_recall(top_k=10, sample_size=20)["recall"] >= 0.95
+
+
+def test_quantized_codes_follow_writes():
+    index = VectorIndex.from_documents(random_documents(count=50))
+    index.set_quantization("int8")
+    target = np.random.default_rng(9).normal(size=16)
+
+    index.search(target, 1, 0.0)
+    index.upsert({"id": "target", "text": "", "embedding": target})
+
+    assert index.ids[index.search(target, 1, 0.0)[0][0]] == "target"
+
+
+@pytest.mark.parametrize("mode", ["float16", "int8"])
+def test_quantized_codes_are_patched_per_row(mode):
+    documents = random_documents(count=40)
+    index = VectorIndex.from_documents(documents)
+    index.set_quantization(mode)
+    index.search(documents[0]["embedding"], 1, 0.0)
+    codes = index._codes
+    rng = np.random.default_rng(4)
+
+    index.upsert({"id": "doc-3", "text": "", "embedding": rng.normal(size=16)})
+    index.remove("doc-5")
+    for row in range(40, 60):
+        index.upsert({"id": f"new-{row}", "text": "", "embedding": rng.normal(size=16)})
+    index.remove("new-59")
+
+    count = len(index)
+    fresh = VectorIndex.from_arrays(np.array(index.matrix), index.ids, [""] * count, [{}] * count,
+                                    [None] * count, [None] * count)
+    fresh.set_quantization(mode)
+    expected_codes, expected_scales = fresh._quantized()
+    actual_codes, actual_scales = index._quantized()
+
+    assert index._codes is not codes
+    np.testing.assert_array_equal(actual_codes, expected_codes)
+    if mode == "int8":
+        np.testing.assert_allclose(actual_scales, expected_scales)
+    rows = index.filter_rows({"category": "menu"})
+    np.testing.assert_allclose(
+        index._coarse_scores(index.matrix[0], rows), fresh._coarse_scores(index.matrix[0], None)[rows], atol=1e-6
+    )
+
+
+def test_unknown_quantization_mode():
+    with pytest.raises(ValueError):
+        VectorIndex().set_quantization("int4")
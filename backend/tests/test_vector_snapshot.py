@@ -0,0 +1,73 @@
+"""Tests for publishing and loading shared vector index snapshots."""
+
+import errno
+import numpy as np
+import pytest
+from src.services import vector_snapshot
+from src.services.vector_index import VectorIndex
+from src.services.vector_snapshot import VectorSnapshotStore
+
+
+def make_index(count=4):
+    return VectorIndex.from_documents([
+        {
+            "id": f"doc-{row}",
+            "text": f"text {row}",
+            "embedding": np.eye(4, dtype=np.float32)[row % 4] + 0.1,
+            "metadata": {"category": "menu" if row % 2 else "info"}
+        }
+        for row in range(count)
+    ])
+
+
+def test_publish_and_load_round_trip(tmp_path):
+    store = VectorSnapshotStore(str(tmp_path))
+    index = make_index()
+
+    version = store.publish(index)
+    loaded_version, loaded = store.load()
+
+    assert loaded_version == version == store.current_version()
+    assert loaded.is_memory_mapped
+    assert loaded.ids == index.ids
+    assert loaded.texts == index.texts
+    np.testing.assert_array_equal(loaded.matrix, index.matrix)
+    assert loaded.filter_rows({"category": "menu"}).tolist() == [1, 3]
+
+
+def test_loaded_index_writes_to_overlay(tmp_path):
+    store = VectorSnapshotStore(str(tmp_path))
+    store.publish(make_index())
+    _, loaded = store.load()
+
+    loaded.upsert({"id": "doc-new", "text": "", "embedding": [1.0, 0.0, 0.0, 0.0]})
+
+    assert loaded.is_memory_mapped
+    assert len(loaded) == 5
+    assert loaded.ids[loaded.search([1.0, 0.0, 0.0, 0.0], 1, 0.0)[0][0]] == "doc-new"
+    assert len(store.load()[1]) == 4
+
+
+def test_prune_keeps_newest_versions(tmp_path, monkeypatch):
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(vector_snapshot.time, "time", lambda: next(clock))
+    store = VectorSnapshotStore(str(tmp_path), keep_versions=2)
+
+    versions = [store.publish(make_index()) for _ in range(4)]
+
+    remaining = sorted(p.name for p in tmp_path.iterdir() if p.is_dir())
+    assert remaining == versions[-2:]
+
+
+def test_failed_publish_leaves_no_staging(tmp_path, monkeypatch):
+    store = VectorSnapshotStore(str(tmp_path))
+
+    def full_disk(*args, **kwargs):
+        raise OSError(errno.ENOSPC, "No space left on device")
+    monkeypatch.setattr(vector_snapshot.np, "save", full_disk)
+
+    with pytest.raises(OSError):
+        store.publish(make_index())
+
+    assert store.current_version() is None
+    assert [p.name for p in tmp_path.iterdir()] == []